@@ -0,0 +1,110 @@
+"""
+Password hashing on a dedicated, bounded thread pool.
+
+bcrypt costs hundreds of milliseconds of CPU per call. Running it on the
+event loop stalls every other request, and running it on the shared
+threadpool lets a login burst starve ordinary sync routes. Hashes run on
+PASSWORD_HASH_WORKERS threads instead (bcrypt releases the GIL), with at
+most PASSWORD_HASH_QUEUE_LIMIT more calls waiting. Past that, callers get a
+503 straight away instead of queueing behind the burst.
+
+Bulk imports hash on their own PASSWORD_BULK_HASH_WORKERS threads, outside
+that limit, so an import neither holds the login workers nor fails halfway
+when a login burst fills the queue.
+
+BCRYPT_ROUNDS sets the cost of new hashes. Hashes made with another cost are
+upgraded transparently the next time their owner logs in.
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+load_dotenv()
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+HASH_QUEUE_LIMIT = int(os.getenv("PASSWORD_HASH_QUEUE_LIMIT", "32"))
+BULK_HASH_WORKERS = int(os.getenv("PASSWORD_BULK_HASH_WORKERS", "1"))
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS
+)
+
+
+class PasswordHasher:
+    """Runs CryptContext calls on a size-limited pool with a bounded backlog."""
+
+    def __init__(
+        self,
+        context: CryptContext = pwd_context,
+        workers: int = HASH_WORKERS,
+        queue_limit: int = HASH_QUEUE_LIMIT,
+        bulk_workers: int = BULK_HASH_WORKERS,
+    ):
+        self.context = context
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hash"
+        )
+        self._bulk_executor = ThreadPoolExecutor(
+            max_workers=bulk_workers, thread_name_prefix="password-import"
+        )
+        # One slot per running or waiting call
+        self._slots = threading.BoundedSemaphore(workers + queue_limit)
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            raise HTTPException(
+                status_code=503,
+                detail="Too many sign-in attempts in progress, please retry",
+                headers={"Retry-After": "1"},
+            )
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    async def verify_and_update(
+        self, password: str, password_hash: str
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Check ``password`` and return (valid, new_hash). new_hash is set when
+        the stored hash uses an outdated cost and should be replaced.
+        """
+        return await asyncio.wrap_future(
+            self._submit(self._verify_and_update, password, password_hash)
+        )
+
+    def _verify_and_update(self, password: str, password_hash: str):
+        try:
+            return self.context.verify_and_update(password, password_hash)
+        except ValueError:
+            # Not a hash this context recognises
+            return False, None
+
+    async def hash(self, password: str) -> str:
+        return await asyncio.wrap_future(self._submit(self.context.hash, password))
+
+    def hash_sync(self, password: str) -> str:
+        """hash() for sync routes, which already run off the event loop."""
+        return self._submit(self.context.hash, password).result()
+
+    def hash_many(self, passwords: List[str]) -> List[str]:
+        """Hash a batch for bulk imports on the import pool, in order."""
+        return list(self._bulk_executor.map(self.context.hash, passwords))
+
+    def is_hash(self, value: str) -> bool:
+        """Whether ``value`` is a hash this context can verify."""
+        return self.context.identify(value) is not None
+
+
+password_hasher = PasswordHasher()
@@ -2,20 +2,61 @@ import os
 
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
+from sqlalchemy.engine import FrozenResult, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from starlette.concurrency import run_in_threadpool
+
+from app.services import pool_metrics, query_stats
 
 load_dotenv()
-# import logging
-# logging.basicConfig()
-# logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
+# Per-request statement counts and timings are reported by
+# app.services.query_stats; set the "sqlalchemy.engine" logger to INFO to
+# see every statement.
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+# Pool size, overflow, recycle, timeout and pre-ping come from DB_POOL_*
+# settings; see app/services/pool_metrics.py
+engine = create_engine(DATABASE_URL, **pool_metrics.engine_options())
+pool_metrics.configure_engine(engine)
+query_stats.install(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Feature flag: DB_ASYNC=true serves get_async_db routes from an async engine
+# (aiomysql / asyncpg / aiosqlite); otherwise they share the sync engine
+# through a thread pool. Both stacks run the same route code.
+DB_ASYNC = os.getenv("DB_ASYNC", "false").lower() == "true"
+
+_ASYNC_DRIVERS = {
+    "mysql": "mysql+aiomysql",
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    """Swap the sync DBAPI driver in ``url`` for its asyncio counterpart."""
+    parsed = make_url(url)
+    return parsed.set(drivername=_ASYNC_DRIVERS[parsed.get_backend_name()]).render_as_string(
+        hide_password=False
+    )
+
+
+if DB_ASYNC:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(
+        os.getenv("ASYNC_DATABASE_URL") or async_database_url(DATABASE_URL),
+        **pool_metrics.engine_options(is_async=True),
+    )
+    pool_metrics.configure_engine(async_engine.sync_engine)
+    query_stats.install(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+
 
 def get_db():
     db = SessionLocal()
@@ -23,3 +64,73 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+class ThreadedSession:
+    """
+    The subset of the AsyncSession API used by the routes, backed by a sync
+    Session whose blocking calls run in the thread pool.
+    """
+
+    def __init__(self, session):
+        self.sync_session = session
+
+    def get_bind(self):
+        return self.sync_session.get_bind()
+
+    def add(self, instance):
+        self.sync_session.add(instance)
+
+    def add_all(self, instances):
+        self.sync_session.add_all(instances)
+
+    async def execute(self, statement, *args, **kwargs):
+        def run():
+            result = self.sync_session.execute(statement, *args, **kwargs)
+            # Buffer rows in the worker thread so reading them never blocks
+            if not getattr(result, "returns_rows", True):
+                return result
+            try:
+                return result.freeze()
+            except NotImplementedError:
+                # ORM bulk INSERT/UPDATE without RETURNING has no rows
+                return result
+
+        result = await run_in_threadpool(run)
+        return result() if isinstance(result, FrozenResult) else result
+
+    async def scalar(self, statement, *args, **kwargs):
+        return await run_in_threadpool(self.sync_session.scalar, statement, *args, **kwargs)
+
+    async def scalars(self, statement, *args, **kwargs):
+        return (await self.execute(statement, *args, **kwargs)).scalars()
+
+    async def get(self, entity, ident):
+        return await run_in_threadpool(self.sync_session.get, entity, ident)
+
+    async def delete(self, instance):
+        await run_in_threadpool(self.sync_session.delete, instance)
+
+    async def flush(self):
+        await run_in_threadpool(self.sync_session.flush)
+
+    async def commit(self):
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self):
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def refresh(self, instance):
+        await run_in_threadpool(self.sync_session.refresh, instance)
+
+
+async def get_async_db():
+    if DB_ASYNC:
+        async with AsyncSessionLocal() as db:
+            yield db
+    else:
+        db = SessionLocal()
+        try:
+            yield ThreadedSession(db)
+        finally:
+            db.close()
@@ -2,8 +2,10 @@ from fastapi import FastAPI
 from app.routes import email  # Add this import
 from fastapi.middleware.cors import CORSMiddleware
 from app.auth.auth_middleware import AuthMiddleware
+from app.services.query_stats import QueryStatsMiddleware
 from app.routes import (
     customerreviews,
+    metrics,
     operatinghours,
     photos,
     reservation,
@@ -28,6 +30,7 @@ app.add_middleware(
     max_age=3600,
 )
 app.add_middleware(AuthMiddleware)
+app.add_middleware(QueryStatsMiddleware)
 
 app.include_router(user.router, prefix="/api", tags=["Users"])
 app.include_router(restaurant.router, prefix="/api", tags=["Restaurants"])
@@ -38,6 +41,7 @@ app.include_router(customerreviews.router, prefix="/api", tags=["Customer Review
 app.include_router(reservation.router, prefix="/api", tags=["Reservations"])
 app.include_router(photos.router, prefix="/api", tags=["Photos"])
 app.include_router(email.router, prefix="/api", tags=["email"])
+app.include_router(metrics.router, prefix="/api", tags=["Metrics"])
 
 if __name__ == "__main__":
     import uvicorn
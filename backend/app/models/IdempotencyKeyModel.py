@@ -0,0 +1,25 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Index, Integer, LargeBinary, String
+
+from app.database import Base
+
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        # Keys are scoped to the user who sent them
+        Index("uq_idempotency_keys_user_key", "user_id", "idempotency_key", unique=True),
+        # The purge job deletes by expiry
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+
+    key_id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, nullable=False)
+    idempotency_key = Column(String(64), nullable=False)
+    # SHA-256 of the request payload, to catch a key reused for another request
+    request_hash = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=False)
+    response_body = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
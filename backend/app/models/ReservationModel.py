@@ -1,7 +1,16 @@
 import enum
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -15,6 +24,15 @@ class ReservationStatus(enum.Enum):
 
 class Reservation(Base):
     __tablename__ = "reservations"
+    __table_args__ = (
+        # Table inventory lookups: "what is booked on table X around time t"
+        Index("ix_reservations_table_time", "table_id", "reservation_time"),
+        # A customer's reservations by time (GET /reservations)
+        Index("ix_reservations_customer_time", "customer_id", "reservation_time"),
+        # A restaurant's reservations by time, paged on (time, id)
+        # (GET /manager/restaurants/{id}/reservations)
+        Index("ix_reservations_restaurant_time", "restaurant_id", "reservation_time"),
+    )
 
     reservation_id = Column(Integer, primary_key=True, index=True)
     customer_id = Column(Integer, ForeignKey("customers.customer_id"), nullable=False)
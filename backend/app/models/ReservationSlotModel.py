@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -7,6 +7,16 @@ from app.database import Base
 
 class ReservationSlot(Base):
     __tablename__ = "reservation_slots"
+    __table_args__ = (
+        # One slot per restaurant and time; also the access path for
+        # per-restaurant availability range scans
+        Index(
+            "uq_reservation_slots_restaurant_time",
+            "restaurant_id",
+            "slot_time",
+            unique=True,
+        ),
+    )
 
     slot_id = Column(Integer, primary_key=True, index=True)
     restaurant_id = Column(
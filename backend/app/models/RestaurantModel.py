@@ -7,11 +7,15 @@ from sqlalchemy import (
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     JSON,
+    func,
+    literal_column,
 )
+from sqlalchemy.dialects.postgresql import to_tsvector
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -37,8 +41,43 @@ class CuisineType(enum.Enum):
     OTHER = "other"
 
 
+# Columns behind the full-text search indexes (see app/services/search_index.py)
+LOCATION_SEARCH_COLUMNS = ("address_line1", "address_line2", "city", "state", "zip_code")
+TEXT_SEARCH_COLUMNS = ("name", "description") + LOCATION_SEARCH_COLUMNS
+
+
+def search_document(*columns):
+    """
+    PostgreSQL tsvector over ``columns``. The GIN indexes below and the
+    search queries must build the identical expression for the planner to
+    use the index, so both go through here.
+    """
+    text = None
+    for column in columns:
+        part = func.coalesce(column, literal_column("''", String))
+        text = part if text is None else text + literal_column("' '", String) + part
+    return to_tsvector(literal_column("'simple'"), text)
+
+
+def _search_indexes(name, columns):
+    # MySQL FULLTEXT for MATCH ... AGAINST, PostgreSQL GIN over the tsvector;
+    # other databases use the in-process index instead
+    return (
+        Index(name, *columns, mysql_prefix="FULLTEXT").ddl_if(dialect="mysql"),
+        Index(
+            name,
+            search_document(*(literal_column(c, String) for c in columns)),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+    )
+
+
 class Restaurant(Base):
     __tablename__ = "restaurants"
+    __table_args__ = (
+        *_search_indexes("ix_restaurants_location_search", LOCATION_SEARCH_COLUMNS),
+        *_search_indexes("ix_restaurants_text_search", TEXT_SEARCH_COLUMNS),
+    )
 
     restaurant_id = Column(Integer, primary_key=True, index=True)
     manager_id = Column(
@@ -51,11 +90,24 @@ class Restaurant(Base):
     city = Column(String(50), nullable=False, index=True)
     state = Column(String(50), nullable=False, index=True)
     zip_code = Column(String(20), nullable=False, index=True)
+    # Filled in by app/services/geocoding.py; geohash is the proximity
+    # search bucket (see app/services/geo.py)
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    geohash = Column(String(12), nullable=True, index=True)
     phone_number = Column(String(20), nullable=False)
     email = Column(String(100), nullable=False)
     cuisine_type = Column(Enum(CuisineType), nullable=False, index=True)
     cost_rating = Column(Integer, nullable=False)  # 1-5
-    avg_rating = Column(Float, default=0.0)
+    avg_rating = Column(Float, default=0.0)  # rating_sum / review_count
+    # Review aggregates, kept in step by app/services/review_aggregates.py
+    review_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_sum = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_1_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_2_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_3_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_4_count = Column(Integer, nullable=False, default=0, server_default="0")
+    rating_5_count = Column(Integer, nullable=False, default=0, server_default="0")
     is_approved = Column(Boolean, default=False)
     approved_at = Column(DateTime, nullable=True)
     availability = Column(JSON, nullable=True, default=list)  # Store available time slots
@@ -70,4 +122,9 @@ class Restaurant(Base):
     tables = relationship("Table", back_populates="restaurant")
     reservation_slots = relationship("ReservationSlot", back_populates="restaurant")
     reservations = relationship("Reservation", back_populates="restaurant")
-    reviews = relationship("Review", back_populates="restaurant")
\ No newline at end of file
+    reviews = relationship("Review", back_populates="restaurant")
+
+    @property
+    def rating_histogram(self):
+        """Number of reviews per star rating, keyed 1-5."""
+        return {star: getattr(self, f"rating_{star}_count") or 0 for star in range(1, 6)}
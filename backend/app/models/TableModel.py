@@ -13,6 +13,8 @@ class Table(Base):
     )
     capacity = Column(Integer, nullable=False)
     table_number = Column(String(20), nullable=False)
+    # Whether the table is in service. Bookings never touch this flag; time
+    # availability comes from reservations (see app.services.table_inventory).
     is_active = Column(Boolean, default=True)
 
     # Relationships
@@ -0,0 +1,91 @@
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, List, Optional, Sequence
+
+from fastapi import HTTPException, Query
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.orm import Query as SAQuery
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+@dataclass
+class PageParams:
+    cursor: Optional[str]
+    limit: int
+
+
+def page_params(
+    cursor: Optional[str] = Query(
+        None, description="Cursor returned as next_cursor by the previous page"
+    ),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+) -> PageParams:
+    """Dependency for keyset-paginated list routes."""
+    return PageParams(cursor=cursor, limit=limit)
+
+
+def _encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps(
+        [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str, keys: Sequence[Any]) -> List[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if not isinstance(values, list) or len(values) != len(keys):
+            raise ValueError("cursor does not match the ordering")
+        return [
+            datetime.fromisoformat(v) if key.type.python_type is datetime else v
+            for key, v in zip(keys, values)
+        ]
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _after(keys: Sequence[Any], values: Sequence[Any]):
+    # (k1, k2, ...) > (v1, v2, ...) spelled out, since row-value comparison
+    # is not supported everywhere
+    clauses = []
+    for i, key in enumerate(keys):
+        equal_prefix = [keys[j] == values[j] for j in range(i)]
+        clauses.append(and_(*equal_prefix, key > values[i]))
+    return or_(*clauses)
+
+
+def _page(rows: List[Any], params: PageParams, keys: Sequence[Any]) -> dict:
+    next_cursor = None
+    if len(rows) > params.limit:
+        rows = rows[: params.limit]
+        last = rows[-1]
+        next_cursor = _encode_cursor([getattr(last, key.key) for key in keys])
+    return {"items": rows, "next_cursor": next_cursor}
+
+
+def paginate(query: SAQuery, params: PageParams, keys: Sequence[Any]) -> dict:
+    """
+    Return one page of ``query`` ordered by ``keys``.
+
+    ``keys`` must end with a unique column (usually the primary key) so the
+    ordering is total and no row is skipped or repeated between pages. The
+    result matches the Page schema.
+    """
+    if params.cursor:
+        query = query.filter(_after(keys, _decode_cursor(params.cursor, keys)))
+    rows = query.order_by(*keys).limit(params.limit + 1).all()
+    return _page(rows, params, keys)
+
+
+async def paginate_async(db, statement: Select, params: PageParams, keys: Sequence[Any]) -> dict:
+    """paginate() for a select() statement run on an async session."""
+    if params.cursor:
+        statement = statement.where(_after(keys, _decode_cursor(params.cursor, keys)))
+    rows = (
+        await db.scalars(statement.order_by(*keys).limit(params.limit + 1))
+    ).all()
+    return _page(list(rows), params, keys)
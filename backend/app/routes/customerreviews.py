@@ -1,9 +1,9 @@
-from typing import List
-
 from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_async_db
+from app.pagination import PageParams, page_params, paginate_async
 from app.models.CustomerModel import Customer
 from app.models.CustomerReviewModel import Review
 from app.models.RestaurantModel import Restaurant
@@ -13,6 +13,8 @@ from app.schemas.CustomerReviewSchema import (
     ReviewResponse,
     ReviewUpdate,
 )
+from app.schemas.PaginationSchema import Page
+from app.services import restaurant_cache, review_aggregates
 
 router = APIRouter()
 
@@ -22,7 +24,7 @@ async def add_restaurant_review(
     restaurant_id: int,
     review_data: ReviewBase,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     # Check that the user has a customer role.
     user = request.state.user
@@ -30,25 +32,21 @@ async def add_restaurant_review(
         raise HTTPException(status_code=403, detail="Not authorized to create reviews")
 
     # Retrieve the customer record based on the authenticated user's id.
-    customer = db.query(Customer).filter(Customer.user_id == user["user_id"]).first()
+    customer = await db.scalar(select(Customer).where(Customer.user_id == user["user_id"]))
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
 
     # Verify the restaurant exists.
-    restaurant = (
-        db.query(Restaurant).filter(Restaurant.restaurant_id == restaurant_id).first()
-    )
+    restaurant = await db.get(Restaurant, restaurant_id)
     if not restaurant:
         raise HTTPException(status_code=404, detail="Restaurant not found")
 
     # Check if the customer already has a review for this restaurant.
-    existing_review = (
-        db.query(Review)
-        .filter(
+    existing_review = await db.scalar(
+        select(Review).where(
             Review.restaurant_id == restaurant_id,
             Review.customer_id == customer.customer_id,
         )
-        .first()
     )
     if existing_review:
         raise HTTPException(
@@ -63,39 +61,38 @@ async def add_restaurant_review(
         comment=review_data.comment,
     )
 
+    # Store the review and fold it into the restaurant's aggregates together.
     db.add(new_review)
-    db.commit()
-    db.refresh(new_review)
-
-    # Calculate new average rating
-    all_reviews = db.query(Review).filter(Review.restaurant_id == restaurant_id).all()
-    total_rating = sum(review.rating for review in all_reviews)
-    avg_rating = total_rating / len(all_reviews)
-
-    # Update restaurant's average rating
-    restaurant.avg_rating = avg_rating
-    db.commit()
-    db.refresh(restaurant)  # Refresh the restaurant object
+    await db.execute(review_aggregates.adjust(restaurant_id, added=new_review.rating))
+    await db.commit()
+    restaurant_cache.detail_cache.invalidate(restaurant_id)
+    await db.refresh(new_review)
 
     return new_review
 
 
 @router.get(
     "/restaurants/{restaurant_id}/reviews",
-    response_model=List[ReviewResponse],
+    response_model=Page[ReviewResponse],
     tags=["Reviews"],
 )
-async def get_restaurant_reviews(restaurant_id: int, db: Session = Depends(get_db)):
+async def get_restaurant_reviews(
+    restaurant_id: int,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_async_db),
+):
     # Verify that the restaurant exists.
-    restaurant = (
-        db.query(Restaurant).filter(Restaurant.restaurant_id == restaurant_id).first()
-    )
+    restaurant = await db.get(Restaurant, restaurant_id)
     if not restaurant:
         raise HTTPException(status_code=404, detail="Restaurant not found")
 
-    # Retrieve all reviews for the given restaurant.
-    reviews = db.query(Review).filter(Review.restaurant_id == restaurant_id).all()
-    return reviews
+    # Retrieve one page of reviews for the given restaurant.
+    return await paginate_async(
+        db,
+        select(Review).where(Review.restaurant_id == restaurant_id),
+        page,
+        [Review.review_id],
+    )
 
 
 # PUT /api/restaurants/reviews/{review_id} - Update a review.
@@ -106,7 +103,7 @@ async def update_review(
     review_id: int,
     review_update: ReviewUpdate,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     # Check that the user is a customer.
     user = request.state.user
@@ -114,12 +111,12 @@ async def update_review(
         raise HTTPException(status_code=403, detail="Not authorized to update reviews")
 
     # Retrieve the review by review_id.
-    review = db.query(Review).filter(Review.review_id == review_id).first()
+    review = await db.get(Review, review_id)
     if not review:
         raise HTTPException(status_code=404, detail="Review not found")
 
     # Retrieve the customer record for the authenticated user.
-    customer = db.query(Customer).filter(Customer.user_id == user["user_id"]).first()
+    customer = await db.scalar(select(Customer).where(Customer.user_id == user["user_id"]))
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
 
@@ -130,24 +127,23 @@ async def update_review(
         )
 
     # Update review fields if provided in the payload.
+    old_rating = review.rating
     if review_update.rating is not None:
         review.rating = review_update.rating
     if review_update.comment is not None:
         review.comment = review_update.comment
 
-    db.commit()
-    db.refresh(review)
-
-    # Calculate new average rating after update
-    all_reviews = db.query(Review).filter(Review.restaurant_id == review.restaurant_id).all()
-    total_rating = sum(review.rating for review in all_reviews)
-    avg_rating = total_rating / len(all_reviews)
+    # Move the review between rating buckets if its rating changed.
+    if review.rating != old_rating:
+        await db.execute(
+            review_aggregates.adjust(
+                review.restaurant_id, added=review.rating, removed=old_rating
+            )
+        )
 
-    # Update restaurant's average rating
-    restaurant = db.query(Restaurant).filter(Restaurant.restaurant_id == review.restaurant_id).first()
-    restaurant.avg_rating = avg_rating
-    db.commit()
-    db.refresh(restaurant)  # Refresh the restaurant object
+    await db.commit()
+    await db.refresh(review)
+    restaurant_cache.detail_cache.invalidate(review.restaurant_id)
 
     return review
 
@@ -155,7 +151,7 @@ async def update_review(
 # DELETE /api/restaurants/reviews/{review_id} - Delete a review.
 @router.delete("/restaurants/reviews/{review_id}")
 async def delete_review(
-    review_id: int, request: Request, db: Session = Depends(get_db)
+    review_id: int, request: Request, db: AsyncSession = Depends(get_async_db)
 ):
     # Check that the user is a customer.
     user = request.state.user
@@ -163,12 +159,12 @@ async def delete_review(
         raise HTTPException(status_code=403, detail="Not authorized to delete reviews")
 
     # Retrieve the review by review_id.
-    review = db.query(Review).filter(Review.review_id == review_id).first()
+    review = await db.get(Review, review_id)
     if not review:
         raise HTTPException(status_code=404, detail="Review not found")
 
     # Retrieve the customer record for the authenticated user.
-    customer = db.query(Customer).filter(Customer.user_id == user["user_id"]).first()
+    customer = await db.scalar(select(Customer).where(Customer.user_id == user["user_id"]))
     if not customer:
         raise HTTPException(status_code=404, detail="Customer not found")
 
@@ -178,6 +174,9 @@ async def delete_review(
             status_code=403, detail="Not authorized to delete this review"
         )
 
-    db.delete(review)
-    db.commit()
+    restaurant_id = review.restaurant_id
+    await db.delete(review)
+    await db.execute(review_aggregates.adjust(restaurant_id, removed=review.rating))
+    await db.commit()
+    restaurant_cache.detail_cache.invalidate(restaurant_id)
     return {"detail": "Review deleted successfully"}
@@ -12,6 +12,16 @@ load_dotenv()
 
 router = APIRouter()
 
+def build_email_message(to_email: str, subject: str, body: str) -> MIMEMultipart:
+    """Build an HTML email from the configured sender"""
+    msg = MIMEMultipart()
+    msg['From'] = os.getenv("FROM_EMAIL")
+    msg['To'] = to_email
+    msg['Subject'] = subject
+    msg.attach(MIMEText(body, 'html'))
+    return msg
+
+
 def send_email_notification(to_email: str, subject: str, body: str):
     """Send email notification using SMTP"""
     try:
@@ -20,16 +30,9 @@ def send_email_notification(to_email: str, subject: str, body: str):
         smtp_port = int(os.getenv("SMTP_PORT", "587"))
         smtp_username = os.getenv("SMTP_USERNAME")
         smtp_password = os.getenv("SMTP_PASSWORD")
-        from_email = os.getenv("FROM_EMAIL")
 
         # Create message
-        msg = MIMEMultipart()
-        msg['From'] = from_email
-        msg['To'] = to_email
-        msg['Subject'] = subject
-
-        # Add body
-        msg.attach(MIMEText(body, 'html'))
+        msg = build_email_message(to_email, subject, body)
 
         # Send email
         with smtplib.SMTP(smtp_server, smtp_port) as server:
@@ -43,7 +46,7 @@ def send_email_notification(to_email: str, subject: str, body: str):
         return False
 
 @router.post("/send-booking-confirmation/{reservation_id}")
-async def send_booking_confirmation(
+def send_booking_confirmation(
     reservation_id: int,
     db: Session = Depends(get_db)
 ):
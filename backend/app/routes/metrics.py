@@ -0,0 +1,29 @@
+from fastapi import APIRouter, HTTPException, Request
+
+from app import database
+from app.services import pool_metrics, restaurant_cache
+
+router = APIRouter()
+
+
+@router.get("/admin/metrics/db-pool")
+def get_db_pool_metrics(request: Request):
+    """Connection pool occupancy and checkout wait times for this instance."""
+    user = request.state.user
+    if user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    pools = {"sync": pool_metrics.snapshot(database.engine.pool)}
+    if database.DB_ASYNC:
+        pools["async"] = pool_metrics.snapshot(database.async_engine.sync_engine.pool)
+    return pools
+
+
+@router.get("/admin/metrics/cache")
+def get_cache_metrics(request: Request):
+    """Hit/miss counters for the restaurant detail cache on this instance."""
+    user = request.state.user
+    if user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    return {"restaurant_detail": restaurant_cache.detail_cache.stats()}
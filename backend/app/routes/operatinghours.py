@@ -2,13 +2,15 @@ from datetime import time
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException, Path, Request, logger
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_async_db
 from app.models import RestaurantModel
 from app.models.OperatingHoursModel import OperatingHours
 from app.schemas import RestaurantSchema
 from app.schemas.OperatingHoursSchema import OperatingHoursCreate, OperatingHoursBulkCreate
+from app.services import restaurant_cache
 
 # Define the router
 router = APIRouter()
@@ -29,7 +31,7 @@ async def create_operating_hours(
     restaurant_id: int,
     operating_hours: OperatingHoursBulkCreate,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     # Verify that the user is authorized to perform this action.
     user = request.state.user
@@ -39,24 +41,18 @@ async def create_operating_hours(
         )
 
     # Verify that the restaurant exists.
-    restaurant = (
-        db.query(RestaurantModel.Restaurant)
-        .filter(RestaurantModel.Restaurant.restaurant_id == restaurant_id)
-        .first()
-    )
+    restaurant = await db.get(RestaurantModel.Restaurant, restaurant_id)
     if not restaurant:
         raise HTTPException(status_code=404, detail="Restaurant not found")
 
     created_hours = []
     for hours in operating_hours.operating_hours:
         # Check for existing hours for the same day
-        existing_hours = (
-            db.query(OperatingHours)
-            .filter(
+        existing_hours = await db.scalar(
+            select(OperatingHours).where(
                 OperatingHours.restaurant_id == restaurant_id,
                 OperatingHours.day_of_week == hours.day_of_week,
             )
-            .first()
         )
 
         # Check if the new operating hours conflict with existing ones for the same day of the week.
@@ -82,11 +78,12 @@ async def create_operating_hours(
         db.add(new_operating_hours)
         created_hours.append(new_operating_hours)
 
-    db.commit()
-    
+    await db.commit()
+    restaurant_cache.detail_cache.invalidate(restaurant_id)
+
     # Refresh all created records
     for hours in created_hours:
-        db.refresh(hours)
+        await db.refresh(hours)
 
     if not created_hours:
         raise HTTPException(status_code=400, detail="Failed to create operating hours")
@@ -99,7 +96,7 @@ async def create_operating_hours(
     response_model=List[RestaurantSchema.OperatingHoursResponse],
 )
 async def get_operating_hours(
-    restaurant_id: int, request: Request, db: Session = Depends(get_db)
+    restaurant_id: int, request: Request, db: AsyncSession = Depends(get_async_db)
 ):
     # Verify that the user is authorized to perform this action.
     user = request.state.user
@@ -109,20 +106,16 @@ async def get_operating_hours(
         )
 
     # Verify that the restaurant exists.
-    restaurant = (
-        db.query(RestaurantModel.Restaurant)
-        .filter(RestaurantModel.Restaurant.restaurant_id == restaurant_id)
-        .first()
-    )
+    restaurant = await db.get(RestaurantModel.Restaurant, restaurant_id)
     if not restaurant:
         raise HTTPException(status_code=404, detail="Restaurant not found")
 
     # Fetch operating hours for the given restaurant ID
     operating_hours = (
-        db.query(OperatingHours)
-        .filter(OperatingHours.restaurant_id == restaurant_id)
-        .all()
-    )
+        await db.scalars(
+            select(OperatingHours).where(OperatingHours.restaurant_id == restaurant_id)
+        )
+    ).all()
     if not operating_hours:
         raise HTTPException(
             status_code=404, detail="No operating hours found for this restaurant"
@@ -139,7 +132,7 @@ async def update_operating_hours(
     restaurant_id: int,
     operating_hours: OperatingHoursBulkCreate,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     # Verify that the user is authorized to perform this action.
     user = request.state.user
@@ -149,24 +142,18 @@ async def update_operating_hours(
         )
 
     # Verify that the restaurant exists.
-    restaurant = (
-        db.query(RestaurantModel.Restaurant)
-        .filter(RestaurantModel.Restaurant.restaurant_id == restaurant_id)
-        .first()
-    )
+    restaurant = await db.get(RestaurantModel.Restaurant, restaurant_id)
     if not restaurant:
         raise HTTPException(status_code=404, detail="Restaurant not found")
 
     updated_hours = []
     for hours in operating_hours.operating_hours:
         # Check for existing hours for the same day
-        existing_hours = (
-            db.query(OperatingHours)
-            .filter(
+        existing_hours = await db.scalar(
+            select(OperatingHours).where(
                 OperatingHours.restaurant_id == restaurant_id,
                 OperatingHours.day_of_week == hours.day_of_week,
             )
-            .first()
         )
 
         if existing_hours:
@@ -185,11 +172,12 @@ async def update_operating_hours(
             db.add(new_operating_hours)
             updated_hours.append(new_operating_hours)
 
-    db.commit()
-    
+    await db.commit()
+    restaurant_cache.detail_cache.invalidate(restaurant_id)
+
     # Refresh all updated records
     for hours in updated_hours:
-        db.refresh(hours)
+        await db.refresh(hours)
 
     if not updated_hours:
         raise HTTPException(status_code=400, detail="Failed to update operating hours")
@@ -201,7 +189,10 @@ async def update_operating_hours(
     "/manager/restaurants/{restaurant_id}/hours/{hours_id}", response_model=dict
 )
 async def delete_operating_hours(
-    restaurant_id: int, hours_id: int, request: Request, db: Session = Depends(get_db)
+    restaurant_id: int,
+    hours_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
 ):
     # Verify that the user is authorized to perform this action.
     user = request.state.user
@@ -211,27 +202,22 @@ async def delete_operating_hours(
         )
 
     # Verify that the restaurant exists.
-    restaurant = (
-        db.query(RestaurantModel.Restaurant)
-        .filter(RestaurantModel.Restaurant.restaurant_id == restaurant_id)
-        .first()
-    )
+    restaurant = await db.get(RestaurantModel.Restaurant, restaurant_id)
     if not restaurant:
         raise HTTPException(status_code=404, detail="Restaurant not found")
 
     # Fetch the existing operating hours record
-    operating_hours = (
-        db.query(OperatingHours)
-        .filter(
+    operating_hours = await db.scalar(
+        select(OperatingHours).where(
             OperatingHours.hours_id == hours_id,
             OperatingHours.restaurant_id == restaurant_id,
         )
-        .first()
     )
     if not operating_hours:
         raise HTTPException(status_code=404, detail="Operating hours not found")
 
     # Delete the record
-    db.delete(operating_hours)
-    db.commit()
+    await db.delete(operating_hours)
+    await db.commit()
+    restaurant_cache.detail_cache.invalidate(restaurant_id)
     return {"message": "Operating hours deleted successfully"}
@@ -2,10 +2,12 @@
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from typing import List
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import database
 from app.models import RestaurantModel, RestaurantManagerModel, PhotoModel
+from app.services import restaurant_cache
 from app.schemas.PhotoSchema import (
     RestaurantPhotoCreate,
     RestaurantPhotoUpdate,
@@ -15,8 +17,8 @@ from app.schemas.PhotoSchema import (
 router = APIRouter()
 
 
-def _verify_manager_and_restaurant(
-    restaurant_id: int, user: dict, db: Session
+async def _verify_manager_and_restaurant(
+    restaurant_id: int, user: dict, db: AsyncSession
 ) -> RestaurantModel.Restaurant:
     # Role check
     if user.get("role") != "restaurant_manager":
@@ -26,10 +28,10 @@ def _verify_manager_and_restaurant(
         )
 
     # Find manager record
-    manager = (
-        db.query(RestaurantManagerModel.RestaurantManager)
-        .filter(RestaurantManagerModel.RestaurantManager.user_id == user.get("user_id"))
-        .first()
+    manager = await db.scalar(
+        select(RestaurantManagerModel.RestaurantManager).where(
+            RestaurantManagerModel.RestaurantManager.user_id == user.get("user_id")
+        )
     )
     if not manager:
         raise HTTPException(
@@ -38,13 +40,11 @@ def _verify_manager_and_restaurant(
         )
 
     # Ensure restaurant belongs to this manager
-    restaurant = (
-        db.query(RestaurantModel.Restaurant)
-        .filter_by(
+    restaurant = await db.scalar(
+        select(RestaurantModel.Restaurant).filter_by(
             restaurant_id=restaurant_id,
             manager_id=manager.manager_id,
         )
-        .first()
     )
     if not restaurant:
         raise HTTPException(
@@ -61,17 +61,18 @@ def _verify_manager_and_restaurant(
 async def list_photos(
     restaurant_id: int,
     request: Request,
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
 ):
     user = request.state.user
-    _verify_manager_and_restaurant(restaurant_id, user, db)
+    await _verify_manager_and_restaurant(restaurant_id, user, db)
 
     photos = (
-        db.query(PhotoModel.RestaurantPhoto)
-        .filter_by(restaurant_id=restaurant_id)
-        .order_by(PhotoModel.RestaurantPhoto.display_order)
-        .all()
-    )
+        await db.scalars(
+            select(PhotoModel.RestaurantPhoto)
+            .filter_by(restaurant_id=restaurant_id)
+            .order_by(PhotoModel.RestaurantPhoto.display_order)
+        )
+    ).all()
     return photos
 
 
@@ -84,18 +85,19 @@ async def create_photo(
     restaurant_id: int,
     photo_in: RestaurantPhotoCreate,
     request: Request,
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
 ):
     user = request.state.user
-    _verify_manager_and_restaurant(restaurant_id, user, db)
+    await _verify_manager_and_restaurant(restaurant_id, user, db)
 
     db_photo = PhotoModel.RestaurantPhoto(
         restaurant_id=restaurant_id,
         **photo_in.dict(),
     )
     db.add(db_photo)
-    db.commit()
-    db.refresh(db_photo)
+    await db.commit()
+    restaurant_cache.detail_cache.invalidate(restaurant_id)
+    await db.refresh(db_photo)
     return db_photo
 
 
@@ -108,15 +110,15 @@ async def update_photo(
     photo_id: int,
     photo_upd: RestaurantPhotoUpdate,
     request: Request,
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
 ):
     user = request.state.user
-    _verify_manager_and_restaurant(restaurant_id, user, db)
+    await _verify_manager_and_restaurant(restaurant_id, user, db)
 
-    photo = (
-        db.query(PhotoModel.RestaurantPhoto)
-        .filter_by(photo_id=photo_id, restaurant_id=restaurant_id)
-        .first()
+    photo = await db.scalar(
+        select(PhotoModel.RestaurantPhoto).filter_by(
+            photo_id=photo_id, restaurant_id=restaurant_id
+        )
     )
     if not photo:
         raise HTTPException(
@@ -129,8 +131,9 @@ async def update_photo(
     for field, value in update_data.items():
         setattr(photo, field, value)
 
-    db.commit()
-    db.refresh(photo)
+    await db.commit()
+    restaurant_cache.detail_cache.invalidate(restaurant_id)
+    await db.refresh(photo)
     return photo
 
 
@@ -142,15 +145,15 @@ async def delete_photo(
     restaurant_id: int,
     photo_id: int,
     request: Request,
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
 ):
     user = request.state.user
-    _verify_manager_and_restaurant(restaurant_id, user, db)
+    await _verify_manager_and_restaurant(restaurant_id, user, db)
 
-    photo = (
-        db.query(PhotoModel.RestaurantPhoto)
-        .filter_by(photo_id=photo_id, restaurant_id=restaurant_id)
-        .first()
+    photo = await db.scalar(
+        select(PhotoModel.RestaurantPhoto).filter_by(
+            photo_id=photo_id, restaurant_id=restaurant_id
+        )
     )
     if not photo:
         raise HTTPException(
@@ -158,6 +161,7 @@ async def delete_photo(
             detail="Photo not found",
         )
 
-    db.delete(photo)
-    db.commit()
+    await db.delete(photo)
+    await db.commit()
+    restaurant_cache.detail_cache.invalidate(restaurant_id)
     # 204 No Content
@@ -1,14 +1,21 @@
-import random
-import string
-from datetime import datetime
-from typing import Any, Dict, List
-from app.routes.email import send_email_notification  # Import your email function
-
-
-from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from datetime import date, datetime, time, timedelta
+from typing import Any, Dict, List, Optional
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from app import database
+from app.pagination import PageParams, page_params, paginate
 from app.models import (
     CustomerModel,
     ReservationModel,
@@ -18,20 +25,35 @@ from app.models import (
 )
 from app.models.ReservationSlotModel import ReservationSlot
 from app.models.RestaurantModel import Restaurant
-from app.schemas import ReservationSchema
-from app.schemas.ReservationSlotSchema import ReservationSlotResponse
+from app.schemas import ReservationSchema, TableSchema
+from app.schemas.PaginationSchema import Page
+from app.schemas.ReservationSlotSchema import (
+    AvailabilityMatrixResponse,
+    ReservationSlotResponse,
+)
+from app.services import (
+    confirmation_codes,
+    email_outbox,
+    idempotency,
+    slot_counter,
+    table_inventory,
+)
 
 router = APIRouter()
 
+# Longest date range served by the availability matrix
+MAX_MATRIX_DAYS = 31
+
 
 @router.post(
     "/reservations",
     response_model=ReservationSchema.ReservationResponse,
     status_code=201,
 )
-async def book_table(
+def book_table(
     reservation: ReservationSchema.ReservationCreate,
     request: Request,
+    idempotency_key: Optional[str] = Header(None),
     db: Session = Depends(database.get_db),
 ):
     # Verify that the current user is a customer
@@ -41,6 +63,15 @@ async def book_table(
             status_code=403, detail="Not authorized to book reservations"
         )
 
+    # 0) A retried request gets the original response back
+    if idempotency_key is not None:
+        digest = idempotency.request_hash(reservation)
+        replayed = idempotency.store.replay(
+            db, user["user_id"], idempotency_key, digest
+        )
+        if replayed is not None:
+            return replayed
+
     # 1) Find the Customer record
     customer = (
         db.query(CustomerModel.Customer)
@@ -50,29 +81,55 @@ async def book_table(
     if not customer:
         raise HTTPException(404, "Customer record not found")
 
-    # 2) Verify the Table is valid and active
+    # 2) Verify the Table is valid and in service. The row lock serializes
+    #    concurrent bookings of the same table until we commit.
     table = (
         db.query(TableModel.Table)
         .filter(
             TableModel.Table.table_id == reservation.table_id,
             TableModel.Table.restaurant_id == reservation.restaurant_id,
         )
+        .with_for_update()
         .first()
     )
+    # 2b) A request with the same key may have booked while we waited for
+    #     the lock; replay it rather than report the table as taken. A plain
+    #     read: if it misses the winner, the unique key index still turns
+    #     our save into a replay below.
+    if idempotency_key is not None:
+        replayed = idempotency.store.replay(
+            db, user["user_id"], idempotency_key, digest
+        )
+        if replayed is not None:
+            return replayed
     if not table or not table.is_active:
         raise HTTPException(404, "Table not available for reservations")
-
-    # If the table is found, deactivate it to prevent double booking
-    table.is_active = False
-    db.add(table)
-
-
-    # 5) Generate a confirmation code
-    confirmation_code = "".join(
-        random.choices(string.ascii_uppercase + string.digits, k=10)
+    if table.capacity < reservation.party_size:
+        raise HTTPException(400, "Table cannot seat this party size")
+
+    # 3) Make sure nothing else holds the table during this turn
+    inventory = table_inventory.load_inventory(
+        db,
+        reservation.restaurant_id,
+        reservation.reservation_time,
+        reservation.reservation_time,
+        table_ids=[table.table_id],
     )
-
-    # Create the reservation record
+    if not inventory.is_free(table.table_id, reservation.reservation_time):
+        raise HTTPException(409, "Table is already booked at this time")
+
+    # 3b) Claim a table from the slot counter. Times without a slot are
+    #     bookable on table inventory alone; a slot that is closed or full
+    #     turns the booking away.
+    if not slot_counter.take(
+        db, reservation.restaurant_id, reservation.reservation_time
+    ) and slot_counter.slot_exists(
+        db, reservation.restaurant_id, reservation.reservation_time
+    ):
+        raise HTTPException(409, "No available tables at this time slot")
+
+    # 4) Create the reservation record. The confirmation code is derived
+    #    from the new id, so it cannot collide with an existing code.
     new_reservation = ReservationModel.Reservation(
         customer_id=customer.customer_id,
         restaurant_id=reservation.restaurant_id,
@@ -80,34 +137,25 @@ async def book_table(
         reservation_time=reservation.reservation_time,
         party_size=reservation.party_size,
         special_requests=reservation.special_requests,
-        confirmation_code=confirmation_code,
+        confirmation_code=confirmation_codes.placeholder(),
     )
     db.add(new_reservation)
+    db.flush()
+    new_reservation.confirmation_code = confirmation_codes.encode(
+        new_reservation.reservation_id
+    )
 
-    db.commit()
-    db.refresh(new_reservation)
-
-    # Get restaurant name for the response
+    # Get restaurant details for the response and the confirmation email
     restaurant = (
         db.query(RestaurantModel.Restaurant)
         .filter(RestaurantModel.Restaurant.restaurant_id == reservation.restaurant_id)
         .first()
     )
-    
-    # Create response with restaurant name
-    response_dict = {
-        **new_reservation.__dict__,
-        "restaurant_name": restaurant.name if restaurant else None
-    }
 
-       # --- EMAIL NOTIFICATION LOGIC STARTS HERE ---
-    # Get user info (email, name)
-    user_obj = (
-        db.query(CustomerModel.Customer)
-        .filter(CustomerModel.Customer.customer_id == new_reservation.customer_id)
-        .first()
-    )
-    user_email = user["email"]  # or user_obj.email if available
+    # --- EMAIL NOTIFICATION LOGIC STARTS HERE ---
+    # The email goes into the outbox in the same transaction as the booking;
+    # the outbox worker delivers it (see app.services.email_outbox).
+    user_email = user["email"]
     user_name = user.get("first_name", "Customer")
 
     subject = f"Booking Confirmation - {restaurant.name}"
@@ -132,22 +180,47 @@ async def book_table(
         </body>
     </html>
     """
+    email_outbox.enqueue_email(db, user_email, subject, body)
+    # --- END EMAIL LOGIC ---
 
-    # Send the email (handle exceptions gracefully)
-    try:
-        send_email_notification(user_email, subject, body)
-    except Exception as e:
-        print(f"Failed to send confirmation email: {e}")
+    if idempotency_key is None:
+        db.commit()
+        db.refresh(new_reservation)
 
-    # --- END EMAIL LOGIC ---
-    return response_dict
+        # Create response with restaurant name
+        return {
+            **new_reservation.__dict__,
+            "restaurant_name": restaurant.name if restaurant else None
+        }
+
+    # Store the response with the booking, so the key is saved if and only
+    # if the booking commits
+    content = ReservationSchema.ReservationResponse.model_validate(
+        {**new_reservation.__dict__, "restaurant_name": restaurant.name}
+    ).model_dump_json().encode()
+    idempotency.store.save(
+        db, user["user_id"], idempotency_key, digest, 201, content
+    )
+    try:
+        db.commit()
+    except IntegrityError:
+        # A concurrent request with the same key committed first
+        db.rollback()
+        replayed = idempotency.store.replay(
+            db, user["user_id"], idempotency_key, digest
+        )
+        if replayed is None:
+            raise
+        return replayed
+    idempotency.store.remember(user["user_id"], idempotency_key, digest, 201, content)
+    return Response(content=content, status_code=201, media_type="application/json")
 
 
 @router.get(
     "/restaurants/{restaurant_id}/availability",
     response_model=List[ReservationSlotResponse],
 )
-async def get_availability(
+def get_availability(
     restaurant_id: int,
     request: Request,
     db: Session = Depends(database.get_db),
@@ -181,11 +254,108 @@ async def get_availability(
     return slots
 
 
+@router.get(
+    "/restaurants/{restaurant_id}/availability/matrix",
+    response_model=AvailabilityMatrixResponse,
+)
+def get_availability_matrix(
+    restaurant_id: int,
+    request: Request,
+    from_date: date = Query(..., alias="from", description="First day (YYYY-MM-DD)"),
+    to_date: date = Query(..., alias="to", description="Last day (YYYY-MM-DD)"),
+    party_size: int = Query(..., gt=0),
+    db: Session = Depends(database.get_db),
+):
+    # 1) Only customers may view availability
+    user = request.state.user
+    if user["role"] != "customer":
+        raise HTTPException(403, "Not authorized to view availability")
+
+    if to_date < from_date:
+        raise HTTPException(400, "'to' must not be before 'from'")
+    if (to_date - from_date).days >= MAX_MATRIX_DAYS:
+        raise HTTPException(400, f"Date range is limited to {MAX_MATRIX_DAYS} days")
+
+    # 2) Open slots in the range, in one indexed range scan
+    window_start = max(datetime.combine(from_date, time.min), datetime.utcnow())
+    window_end = datetime.combine(to_date, time.max)
+    slots = (
+        db.query(ReservationSlot.slot_time, ReservationSlot.available_tables)
+        .filter(
+            ReservationSlot.restaurant_id == restaurant_id,
+            ReservationSlot.is_active == True,
+            ReservationSlot.available_tables > 0,
+            ReservationSlot.slot_time >= window_start,
+            ReservationSlot.slot_time <= window_end,
+        )
+        .all()
+    )
+
+    # 3) Count tables that seat the party and are free at each slot
+    inventory = table_inventory.load_inventory(
+        db, restaurant_id, window_start, window_end
+    )
+    days = [
+        from_date + timedelta(days=i) for i in range((to_date - from_date).days + 1)
+    ]
+    times = sorted({slot_time.time() for slot_time, _ in slots})
+    day_index = {day: i for i, day in enumerate(days)}
+    time_index = {t: i for i, t in enumerate(times)}
+    capacity: List[List[Optional[int]]] = [[None] * len(times) for _ in days]
+    for slot_time, available_tables in slots:
+        free = len(inventory.tables_for_party(party_size, slot_time))
+        capacity[day_index[slot_time.date()]][time_index[slot_time.time()]] = min(
+            free, available_tables
+        )
+
+    return {
+        "restaurant_id": restaurant_id,
+        "party_size": party_size,
+        "days": days,
+        "times": times,
+        "capacity": capacity,
+    }
+
+
+@router.get(
+    "/restaurants/{restaurant_id}/tables/available",
+    response_model=List[TableSchema.TableResponse],
+)
+def get_available_tables(
+    restaurant_id: int,
+    reservation_time: datetime,
+    party_size: int,
+    request: Request,
+    db: Session = Depends(database.get_db),
+):
+    # 1) Only customers may look up bookable tables
+    user = request.state.user
+    if user["role"] != "customer":
+        raise HTTPException(403, "Not authorized to view availability")
+
+    # 2) Tables that seat the party and are free for the whole turn,
+    #    smallest fitting table first
+    inventory = table_inventory.load_inventory(
+        db, restaurant_id, reservation_time, reservation_time
+    )
+    table_ids = inventory.tables_for_party(party_size, reservation_time)
+    if not table_ids:
+        return []
+
+    tables = (
+        db.query(TableModel.Table)
+        .filter(TableModel.Table.table_id.in_(table_ids))
+        .all()
+    )
+    order = {table_id: i for i, table_id in enumerate(table_ids)}
+    return sorted(tables, key=lambda t: order[t.table_id])
+
+
 @router.get(
     "/reservations",
     response_model=List[ReservationSchema.ReservationResponse],
 )
-async def list_reservations(
+def list_reservations(
     request: Request,
     db: Session = Depends(database.get_db),
 ):
@@ -227,11 +397,58 @@ async def list_reservations(
     return result
 
 
+@router.get(
+    "/reservations/by-code/{code}",
+    response_model=ReservationSchema.ReservationResponse,
+)
+def get_reservation_by_code(
+    code: str,
+    request: Request,
+    db: Session = Depends(database.get_db),
+):
+    # 1) Customers look up their own bookings, managers their restaurant's
+    user = request.state.user
+    if user["role"] not in ("customer", "restaurant_manager"):
+        raise HTTPException(403, "Not authorized to view reservation details")
+
+    # 2) Strings that cannot be any stored code are rejected without a query
+    codes = confirmation_codes.candidates(code)
+    if not codes:
+        raise HTTPException(404, "Reservation not found")
+
+    # 3) One lookup on the unique confirmation_code index, scoped to the caller
+    query = (
+        db.query(ReservationModel.Reservation, RestaurantModel.Restaurant.name)
+        .join(
+            RestaurantModel.Restaurant,
+            ReservationModel.Reservation.restaurant_id == RestaurantModel.Restaurant.restaurant_id,
+        )
+        .filter(ReservationModel.Reservation.confirmation_code.in_(codes))
+    )
+    if user["role"] == "customer":
+        query = query.join(
+            CustomerModel.Customer,
+            ReservationModel.Reservation.customer_id == CustomerModel.Customer.customer_id,
+        ).filter(CustomerModel.Customer.user_id == user["user_id"])
+    else:
+        query = query.join(
+            RestaurantManagerModel.RestaurantManager,
+            RestaurantModel.Restaurant.manager_id
+            == RestaurantManagerModel.RestaurantManager.manager_id,
+        ).filter(RestaurantManagerModel.RestaurantManager.user_id == user["user_id"])
+
+    row = query.first()
+    if not row:
+        raise HTTPException(404, "Reservation not found")
+    reservation, restaurant_name = row
+    return {**reservation.__dict__, "restaurant_name": restaurant_name}
+
+
 @router.get(
     "/reservations/{reservation_id}",
     response_model=ReservationSchema.ReservationResponse,
 )
-async def get_reservation_detail(
+def get_reservation_detail(
     reservation_id: int,
     request: Request,
     db: Session = Depends(database.get_db),
@@ -262,14 +479,17 @@ async def get_reservation_detail(
     if not reservation:
         raise HTTPException(404, "Reservation not found")
 
-    return reservation
+    return {
+        **reservation.__dict__,
+        "restaurant_name": reservation.restaurant.name,
+    }
 
 
 @router.put(
     "/reservations/{reservation_id}",
     response_model=ReservationSchema.ReservationResponse,
 )
-async def update_reservation(
+def update_reservation(
     reservation_id: int,
     update_data: ReservationSchema.ReservationUpdate,
     request: Request,
@@ -309,6 +529,8 @@ async def update_reservation(
     new_table_id = update_data.table_id or reservation.table_id
     new_time = update_data.reservation_time or reservation.reservation_time
 
+    new_party_size = update_data.party_size or reservation.party_size
+
     # 5a) Validate new table
     table = (
         db.query(TableModel.Table)
@@ -316,30 +538,41 @@ async def update_reservation(
             TableModel.Table.table_id == new_table_id,
             TableModel.Table.restaurant_id == reservation.restaurant_id,
         )
+        .with_for_update()
         .first()
     )
     if not table or not table.is_active:
         raise HTTPException(404, "Table not available for reservations")
-
-    # 5b) Validate the corresponding slot
-    slot = (
-        db.query(ReservationSlot)
-        .filter(
-            ReservationSlot.restaurant_id == reservation.restaurant_id,
-            ReservationSlot.slot_time == new_time,
-            ReservationSlot.is_active == True,
-        )
-        .with_for_update()
-        .first()
+    if table.capacity < new_party_size:
+        raise HTTPException(400, "Table cannot seat this party size")
+
+    # 5b) The table must be free for the new turn, ignoring this reservation
+    inventory = table_inventory.load_inventory(
+        db,
+        reservation.restaurant_id,
+        new_time,
+        new_time,
+        table_ids=[table.table_id],
     )
-    if not slot or slot.available_tables < 1:
-        raise HTTPException(400, "No available tables at this time slot")
-
-    # 5c) Decrement the slot's counter (and deactivate if zero)
-    slot.available_tables -= 1
-    if slot.available_tables == 0:
-        slot.is_active = False
-    db.add(slot)
+    if not inventory.is_free(
+        table.table_id, new_time, exclude_reservation_id=reservation.reservation_id
+    ):
+        raise HTTPException(409, "Table is already booked at this time")
+
+    # 5c) Moving to another time claims a table from the new slot and
+    #     returns the old one, each in a single conditional UPDATE. As in
+    #     book_table, times without a slot go by table inventory alone.
+    old_time = reservation.reservation_time
+    if (
+        new_time != old_time
+        and reservation.status == ReservationModel.ReservationStatus.CONFIRMED
+    ):
+        if not slot_counter.take(
+            db, reservation.restaurant_id, new_time
+        ) and slot_counter.slot_exists(db, reservation.restaurant_id, new_time):
+            raise HTTPException(400, "No available tables at this time slot")
+        if slot_counter.slot_exists(db, reservation.restaurant_id, old_time):
+            slot_counter.give_back(db, reservation.restaurant_id, old_time)
 
     # 6) Apply updates for allowed fields
     for field, value in update_data.dict(exclude_unset=True).items():
@@ -347,14 +580,17 @@ async def update_reservation(
 
     db.commit()
     db.refresh(reservation)
-    return reservation
+    return {
+        **reservation.__dict__,
+        "restaurant_name": reservation.restaurant.name,
+    }
 
 
 @router.delete(
     "/reservations/{reservation_id}",
     status_code=status.HTTP_204_NO_CONTENT,
 )
-async def cancel_reservation(
+def cancel_reservation(
     reservation_id: int,
     request: Request,
     db: Session = Depends(database.get_db),
@@ -391,27 +627,19 @@ async def cancel_reservation(
     if reservation.status == ReservationModel.ReservationStatus.CANCELLED:
         return Response(status_code=status.HTTP_204_NO_CONTENT)
 
-    # 5) Update status to CANCELLED
-    reservation.status = ReservationModel.ReservationStatus.CANCELLED
-
-    # 6) Reactivate the table
-    table = (
-        db.query(TableModel.Table)
-        .filter(
-            TableModel.Table.table_id == reservation.table_id,
-            TableModel.Table.restaurant_id == reservation.restaurant_id,
+    # 5) Update status to CANCELLED; the table inventory only counts
+    #    confirmed reservations, so this frees the table for the turn.
+    #    Completed reservations already used their slot.
+    if reservation.status == ReservationModel.ReservationStatus.CONFIRMED:
+        slot_counter.give_back(
+            db, reservation.restaurant_id, reservation.reservation_time
         )
-        .first()
-    )
-    if table:
-        table.is_active = True
-        db.add(table)
-
+    reservation.status = ReservationModel.ReservationStatus.CANCELLED
 
-    # 8) Commit all changes
+    # 6) Commit all changes
     db.commit()
 
-    # 9) Return no content
+    # 7) Return no content
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
@@ -433,11 +661,12 @@ def _verify_manager_restaurant(db: Session, manager_user_id: int, restaurant_id:
 # Manager routes for reservations
 @router.get(
     "/manager/restaurants/{restaurant_id}/reservations",
-    response_model=List[ReservationSchema.ReservationResponse],
+    response_model=Page[ReservationSchema.ReservationResponse],
 )
-async def list_all_reservations(
+def list_all_reservations(
     restaurant_id: int,
     request: Request,
+    page: PageParams = Depends(page_params),
     db: Session = Depends(database.get_db),
 ):
     # Only restaurant managers may list reservations
@@ -446,23 +675,31 @@ async def list_all_reservations(
         raise HTTPException(403, "Not authorized to view reservations")
 
     # Verify manager owns this restaurant
-    _verify_manager_restaurant(db, user["user_id"], restaurant_id)
-
-    # Fetch all reservations for the restaurant
-    reservations = (
-        db.query(ReservationModel.Reservation)
-        .filter(ReservationModel.Reservation.restaurant_id == restaurant_id)
-        .order_by(ReservationModel.Reservation.reservation_time)
-        .all()
+    restaurant = _verify_manager_restaurant(db, user["user_id"], restaurant_id)
+
+    # Fetch one page of reservations for the restaurant, by time
+    result = paginate(
+        db.query(ReservationModel.Reservation).filter(
+            ReservationModel.Reservation.restaurant_id == restaurant_id
+        ),
+        page,
+        [
+            ReservationModel.Reservation.reservation_time,
+            ReservationModel.Reservation.reservation_id,
+        ],
     )
-    return reservations
+    result["items"] = [
+        {**reservation.__dict__, "restaurant_name": restaurant.name}
+        for reservation in result["items"]
+    ]
+    return result
 
 
 @router.get(
     "/manager/restaurants/{restaurant_id}/reservations/{reservation_id}",
     response_model=ReservationSchema.ReservationResponse,
 )
-async def get_reservation_detail(
+def get_reservation_detail(
     restaurant_id: int,
     reservation_id: int,
     request: Request,
@@ -488,14 +725,17 @@ async def get_reservation_detail(
     if not reservation:
         raise HTTPException(404, "Reservation not found")
 
-    return reservation
+    return {
+        **reservation.__dict__,
+        "restaurant_name": reservation.restaurant.name,
+    }
 
 
 @router.put(
     "/manager/restaurants/{restaurant_id}/reservations/{reservation_id}",
     response_model=ReservationSchema.ReservationResponse,
 )
-async def update_reservation_status(
+def update_reservation_status(
     restaurant_id: int,
     reservation_id: int,
     update_data: ReservationSchema.ReservationUpdate,
@@ -527,7 +767,15 @@ async def update_reservation_status(
     if not data or set(data.keys()) != {"status"}:
         raise HTTPException(400, "Must supply exactly one field: status")
 
-    # 5) Apply the status update
+    # 5) Apply the status update, returning the slot's table when a
+    #    confirmed reservation is cancelled
+    if (
+        reservation.status == ReservationModel.ReservationStatus.CONFIRMED
+        and data["status"] == ReservationSchema.ReservationStatus.CANCELLED
+    ):
+        slot_counter.give_back(
+            db, reservation.restaurant_id, reservation.reservation_time
+        )
     reservation.status = data["status"]
 
     db.commit()
@@ -1,19 +1,40 @@
-from typing import List
+from collections import defaultdict
+from datetime import datetime, timedelta
 
-from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.database import get_db
+from app.database import get_async_db
+from app.pagination import PageParams, page_params, paginate_async
 from app.models.OperatingHoursModel import OperatingHours
+from app.models.ReservationModel import Reservation, ReservationStatus
 from app.models.ReservationSlotModel import ReservationSlot
+from app.models.RestaurantManagerModel import RestaurantManager
 from app.models.RestaurantModel import Restaurant
+from app.models.TableModel import Table
 from app.schemas.ReservationSlotSchema import (
     ReservationSlotCreate,
     ReservationSlotResponse,
+    SlotGenerateRequest,
+    SlotGenerateResponse,
 )
+from app.schemas.PaginationSchema import Page
+from app.services.upsert import upsert
 
 router = APIRouter(prefix="/manager")
 
+MAX_GENERATE_DAYS = 92
+UPSERT_BATCH_SIZE = 500
+
+
+def _duplicate_slot():
+    return HTTPException(
+        status_code=400,
+        detail="A slot at this time already exists for the restaurant",
+    )
+
 
 @router.post(
     "/restaurants/{restaurant_id}/slots", response_model=ReservationSlotResponse
@@ -22,7 +43,7 @@ async def create_reservation_slot(
     restaurant_id: int,
     reservation_data: ReservationSlotCreate,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     # Check user role
     user = request.state.user
@@ -32,25 +53,19 @@ async def create_reservation_slot(
         )
 
     # Check if restaurant exists
-    restaurant = (
-        db.query(Restaurant).filter(Restaurant.restaurant_id == restaurant_id).first()
-    )
+    restaurant = await db.get(Restaurant, restaurant_id)
     if not restaurant:
         raise HTTPException(status_code=404, detail="Restaurant not found")
 
     # Get the day of the week for the slot_time
-    from datetime import datetime
-
     day_of_week = reservation_data.slot_time.strftime("%A").upper()
 
     # Check if the slot_time falls within the operating hours
-    operating_hours = (
-        db.query(OperatingHours)
-        .filter(
+    operating_hours = await db.scalar(
+        select(OperatingHours).where(
             OperatingHours.restaurant_id == restaurant_id,
             OperatingHours.day_of_week == day_of_week,
         )
-        .first()
     )
 
     if not operating_hours:
@@ -68,22 +83,7 @@ async def create_reservation_slot(
             detail=f"Slot time {reservation_data.slot_time} is outside the operating hours ({operating_hours.opening_time} - {operating_hours.closing_time})",
         )
 
-    # Optional: Add logic to prevent duplicate slots at the same time
-    existing_slot = (
-        db.query(ReservationSlot)
-        .filter(
-            ReservationSlot.restaurant_id == restaurant_id,
-            ReservationSlot.slot_time == reservation_data.slot_time,
-        )
-        .first()
-    )
-    if existing_slot:
-        raise HTTPException(
-            status_code=400,
-            detail="A slot at this time already exists for the restaurant",
-        )
-
-    # Create slot
+    # Create slot; the unique (restaurant_id, slot_time) index rejects duplicates
     new_slot = ReservationSlot(
         restaurant_id=restaurant_id,
         slot_time=reservation_data.slot_time,
@@ -92,19 +92,150 @@ async def create_reservation_slot(
     )
 
     db.add(new_slot)
-    db.commit()
-    db.refresh(new_slot)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise _duplicate_slot()
+    await db.refresh(new_slot)
 
     return new_slot
 
 
+@router.post(
+    "/restaurants/{restaurant_id}/slots/generate",
+    response_model=SlotGenerateResponse,
+    status_code=201,
+    summary="Generate reservation slots from operating hours",
+)
+async def generate_reservation_slots(
+    restaurant_id: int,
+    params: SlotGenerateRequest,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+):
+    # 1) Check user role and the requested range
+    user = request.state.user
+    if user["role"] != "restaurant_manager":
+        raise HTTPException(
+            status_code=403, detail="Not authorized to create reservation slots"
+        )
+    if params.end_date < params.start_date:
+        raise HTTPException(status_code=400, detail="end_date is before start_date")
+    if (params.end_date - params.start_date).days >= MAX_GENERATE_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Date range is limited to {MAX_GENERATE_DAYS} days",
+        )
+
+    # Only the restaurant's own manager may generate its slots
+    manager = await db.scalar(
+        select(RestaurantManager).where(RestaurantManager.user_id == user.get("user_id"))
+    )
+    if not manager:
+        raise HTTPException(status_code=404, detail="Manager not found")
+    restaurant = await db.scalar(
+        select(Restaurant).filter_by(
+            restaurant_id=restaurant_id, manager_id=manager.manager_id
+        )
+    )
+    if not restaurant:
+        raise HTTPException(
+            status_code=404, detail="Restaurant not found or not managed by you"
+        )
+
+    # 2) Read the weekly hours and the active table count once
+    hours_by_day = defaultdict(list)
+    for hours in await db.scalars(
+        select(OperatingHours).where(OperatingHours.restaurant_id == restaurant_id)
+    ):
+        hours_by_day[hours.day_of_week.name].append(hours)
+    if not hours_by_day:
+        raise HTTPException(
+            status_code=400, detail="No operating hours found for this restaurant"
+        )
+    available_tables = await db.scalar(
+        select(func.count()).where(
+            Table.restaurant_id == restaurant_id, Table.is_active == True
+        )
+    )
+
+    # 3) Lay out slot times; the last seating leaves a full turn before closing.
+    #    Hours that close at or before they open run past midnight, and their
+    #    late slots belong to the day the service started.
+    interval = timedelta(minutes=params.interval_minutes)
+    turn = timedelta(minutes=params.turn_minutes)
+    slot_times = []
+    for offset in range((params.end_date - params.start_date).days + 1):
+        day = params.start_date + timedelta(days=offset)
+        for hours in hours_by_day.get(day.strftime("%A").upper(), []):
+            slot_time = datetime.combine(day, hours.opening_time)
+            closing = datetime.combine(day, hours.closing_time)
+            if closing <= slot_time:
+                closing += timedelta(days=1)
+            while slot_time + turn <= closing:
+                slot_times.append(slot_time)
+                slot_time += interval
+    slot_times = sorted(set(slot_times))
+
+    # Tables already taken by confirmed bookings at each slot time, so an
+    # overwrite does not hand them out again
+    booked = {}
+    if slot_times:
+        booked = dict(
+            (
+                await db.execute(
+                    select(Reservation.reservation_time, func.count())
+                    .where(
+                        Reservation.restaurant_id == restaurant_id,
+                        Reservation.status == ReservationStatus.CONFIRMED,
+                        Reservation.reservation_time.between(
+                            slot_times[0], slot_times[-1]
+                        ),
+                    )
+                    .group_by(Reservation.reservation_time)
+                )
+            ).all()
+        )
+
+    # 4) Upsert in multi-row batches; the unique (restaurant_id, slot_time)
+    #    index decides between insert and keep/overwrite
+    rows = [
+        {
+            "restaurant_id": restaurant_id,
+            "slot_time": slot_time,
+            "available_tables": max(available_tables - booked.get(slot_time, 0), 0),
+            "is_active": True,
+        }
+        for slot_time in slot_times
+    ]
+    dialect_name = db.get_bind().dialect.name
+    update_columns = ("available_tables", "is_active") if params.overwrite else ()
+    for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+        await db.execute(
+            upsert(
+                dialect_name,
+                ReservationSlot,
+                rows[start : start + UPSERT_BATCH_SIZE],
+                conflict_columns=("restaurant_id", "slot_time"),
+                update_columns=update_columns,
+            )
+        )
+    await db.commit()
+
+    return {"slots": len(rows), "available_tables": available_tables}
+
+
 @router.get(
     "/restaurants/{restaurant_id}/slots",
-    response_model=List[ReservationSlotResponse],
+    response_model=Page[ReservationSlotResponse],
     summary="Get all reservation slots for a restaurant",
 )
 async def get_reservation_slots(
-    restaurant_id: int, db: Session = Depends(get_db), request: Request = None
+    restaurant_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    request: Request = None,
+    page: PageParams = Depends(page_params),
 ):
     # Verify the user's role
     user = request.state.user
@@ -115,21 +246,19 @@ async def get_reservation_slots(
         )
 
     # Check if the restaurant exists
-    restaurant = (
-        db.query(Restaurant).filter(Restaurant.restaurant_id == restaurant_id).first()
-    )
+    restaurant = await db.get(Restaurant, restaurant_id)
     if not restaurant:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Restaurant not found"
         )
 
-    # Retrieve all slots for the restaurant
-    slots = (
-        db.query(ReservationSlot)
-        .filter(ReservationSlot.restaurant_id == restaurant_id)
-        .all()
+    # Retrieve one page of slots for the restaurant, by time
+    return await paginate_async(
+        db,
+        select(ReservationSlot).where(ReservationSlot.restaurant_id == restaurant_id),
+        page,
+        [ReservationSlot.slot_time, ReservationSlot.slot_id],
     )
-    return slots
 
 
 # PUT /api/manager/restaurants/{restaurant_id}/slots/{slot_id} - Update a reservation slot
@@ -143,7 +272,7 @@ async def update_reservation_slot(
     slot_id: int,
     reservation_data: ReservationSlotCreate,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     # Verify the user's role
     user = request.state.user
@@ -154,22 +283,18 @@ async def update_reservation_slot(
         )
 
     # Validate that the restaurant exists
-    restaurant = (
-        db.query(Restaurant).filter(Restaurant.restaurant_id == restaurant_id).first()
-    )
+    restaurant = await db.get(Restaurant, restaurant_id)
     if not restaurant:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Restaurant not found"
         )
 
     # Retrieve the slot to be updated
-    slot = (
-        db.query(ReservationSlot)
-        .filter(
+    slot = await db.scalar(
+        select(ReservationSlot).where(
             ReservationSlot.restaurant_id == restaurant_id,
             ReservationSlot.slot_id == slot_id,
         )
-        .first()
     )
     if not slot:
         raise HTTPException(
@@ -178,13 +303,11 @@ async def update_reservation_slot(
 
     # Validate the slot_time against operating hours
     day_of_week = reservation_data.slot_time.strftime("%A").upper()
-    operating_hours = (
-        db.query(OperatingHours)
-        .filter(
+    operating_hours = await db.scalar(
+        select(OperatingHours).where(
             OperatingHours.restaurant_id == restaurant_id,
             OperatingHours.day_of_week == day_of_week,
         )
-        .first()
     )
     if not operating_hours:
         raise HTTPException(
@@ -204,29 +327,17 @@ async def update_reservation_slot(
             ),
         )
 
-    # Prevent scheduling duplicate slots (apart from the current one)
-    existing_slot = (
-        db.query(ReservationSlot)
-        .filter(
-            ReservationSlot.restaurant_id == restaurant_id,
-            ReservationSlot.slot_time == reservation_data.slot_time,
-            ReservationSlot.slot_id != slot_id,
-        )
-        .first()
-    )
-    if existing_slot:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="A slot at this time already exists for the restaurant",
-        )
-
-    # Update slot fields
+    # Update slot fields; the unique index rejects moving onto another slot's time
     slot.slot_time = reservation_data.slot_time
     slot.available_tables = reservation_data.available_tables
     slot.is_active = reservation_data.is_active
 
-    db.commit()
-    db.refresh(slot)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise _duplicate_slot()
+    await db.refresh(slot)
 
     return slot
 
@@ -236,7 +347,7 @@ async def update_reservation_slot(
     summary="Deactivate a reservation slot",
 )
 async def delete_reservation_slot(
-    restaurant_id: int, slot_id: int, request: Request, db: Session = Depends(get_db)
+    restaurant_id: int, slot_id: int, request: Request, db: AsyncSession = Depends(get_async_db)
 ):
     # Verify the user's role
     user = request.state.user
@@ -247,22 +358,18 @@ async def delete_reservation_slot(
         )
 
     # Confirm that the restaurant exists
-    restaurant = (
-        db.query(Restaurant).filter(Restaurant.restaurant_id == restaurant_id).first()
-    )
+    restaurant = await db.get(Restaurant, restaurant_id)
     if not restaurant:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Restaurant not found"
         )
 
     # Retrieve the reservation slot to be deleted/deactivated
-    slot = (
-        db.query(ReservationSlot)
-        .filter(
+    slot = await db.scalar(
+        select(ReservationSlot).where(
             ReservationSlot.restaurant_id == restaurant_id,
             ReservationSlot.slot_id == slot_id,
         )
-        .first()
     )
     if not slot:
         raise HTTPException(
@@ -271,7 +378,7 @@ async def delete_reservation_slot(
 
     # Instead of performing a hard delete, deactivate the slot
     slot.is_active = False
-    db.commit()
+    await db.commit()
 
     # Return no content on successful deletion
     return {"message": "Reservation Slot deleted successfully"}
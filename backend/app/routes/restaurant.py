@@ -1,24 +1,43 @@
-from datetime import datetime, date as dt_date, time as dt_time
+import heapq
+from dataclasses import dataclass
+from datetime import datetime, timedelta, date as dt_date, time as dt_time
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
-from sqlalchemy.orm import Session
-from sqlalchemy import Table, func, or_
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import case, exists, func
 
 from app import database
+from app.pagination import PageParams, page_params, paginate
 from app.models import RestaurantManagerModel, RestaurantModel, TableModel
 from app.models import ReservationSlotModel, OperatingHoursModel
 from app.schemas import RestaurantSchema
+from app.schemas.PaginationSchema import Page
 
 from app.models.RestaurantModel import Restaurant
 from app.models.TableModel import Table
 from app.models.ReservationSlotModel import ReservationSlot
+from app.services import geo, geocoding, restaurant_cache, search_index, table_inventory
 
 router = APIRouter()
 
 
+def _load_for(response_model):
+    """
+    selectinload() options for the Restaurant relationships that
+    ``response_model`` serializes, so a list of N restaurants loads each
+    collection in one extra query instead of N.
+    """
+    relationships = Restaurant.__mapper__.relationships
+    return [
+        selectinload(getattr(Restaurant, name))
+        for name in response_model.model_fields
+        if name in relationships
+    ]
+
+
 # Manager routes for restaurant management
 @router.post("/manager/restaurants", response_model=RestaurantSchema.RestaurantResponse)
-async def create_restaurant(
+def create_restaurant(
     restaurant: RestaurantSchema.RestaurantCreate,
     request: Request,
     db: Session = Depends(database.get_db),
@@ -48,16 +67,21 @@ async def create_restaurant(
         zip_code=restaurant.zip_code,
         phone_number=restaurant.phone_number,
         email=restaurant.email,
-        cuisine_type=restaurant.cuisine_type,
+        # the column stores model enum members, not the schema's strings
+        cuisine_type=RestaurantModel.CuisineType(restaurant.cuisine_type),
         cost_rating=restaurant.cost_rating,
+        latitude=restaurant.latitude,
+        longitude=restaurant.longitude,
         availability=restaurant.availability,
         booked_slots=restaurant.booked_slots,
     )
+    geocoding.locate(db_restaurant)
 
     # Add the new restaurant to the DB session, commit the transaction, and refresh to get any auto-generated fields.
     db.add(db_restaurant)
     db.commit()
     db.refresh(db_restaurant)
+    search_index.index.refresh(db_restaurant)
 
     return db_restaurant
 
@@ -65,7 +89,7 @@ async def create_restaurant(
 @router.get(
     "/manager/restaurants", response_model=list[RestaurantSchema.RestaurantDetailResponse]
 )
-async def get_restaurants_by_manager(
+def get_restaurants_by_manager(
     request: Request, db: Session = Depends(database.get_db)
 ):
     # Check user role
@@ -87,6 +111,7 @@ async def get_restaurants_by_manager(
     # Inline query to fetch restaurants for the manager
     restaurants = (
         db.query(RestaurantModel.Restaurant)
+        .options(*_load_for(RestaurantSchema.RestaurantDetailResponse))
         .filter(RestaurantModel.Restaurant.manager_id == manager.manager_id)
         .all()
     )
@@ -97,7 +122,7 @@ async def get_restaurants_by_manager(
     "/manager/restaurants/{restaurant_id}",
     response_model=RestaurantSchema.RestaurantResponse,
 )
-async def get_restaurant_details(
+def get_restaurant_details(
     restaurant_id: int, request: Request, db: Session = Depends(database.get_db)
 ):
     # Check user role
@@ -110,6 +135,7 @@ async def get_restaurant_details(
     # Inline join to fetch restaurant details only if the restaurant is managed by this user
     restaurant = (
         db.query(RestaurantModel.Restaurant)
+        .options(*_load_for(RestaurantSchema.RestaurantResponse))
         .join(RestaurantManagerModel.RestaurantManager)
         .filter(
             RestaurantModel.Restaurant.restaurant_id == restaurant_id,
@@ -128,7 +154,7 @@ async def get_restaurant_details(
     "/manager/restaurants/{restaurant_id}",
     response_model=RestaurantSchema.RestaurantResponse,
 )
-async def update_restaurant_details(
+def update_restaurant_details(
     restaurant_id: int,
     restaurant_update: RestaurantSchema.RestaurantUpdate,
     request: Request,
@@ -158,16 +184,28 @@ async def update_restaurant_details(
 
     # Update only provided fields
     update_data = restaurant_update.dict(exclude_unset=True)
+    if update_data.get("cuisine_type"):
+        update_data["cuisine_type"] = RestaurantModel.CuisineType(
+            update_data["cuisine_type"]
+        )
     for key, value in update_data.items():
         setattr(restaurant, key, value)
 
+    # Re-geocode a moved address unless new coordinates came with it
+    address_changed = any(field in update_data for field in geocoding.ADDRESS_FIELDS)
+    coordinates_sent = "latitude" in update_data or "longitude" in update_data
+    if address_changed or coordinates_sent:
+        geocoding.locate(restaurant, regeocode=address_changed and not coordinates_sent)
+
     db.commit()
+    restaurant_cache.detail_cache.invalidate(restaurant_id)
     db.refresh(restaurant)
+    search_index.index.refresh(restaurant)
     return restaurant
 
 
 @router.delete("/manager/restaurants/{restaurant_id}", status_code=204)
-async def delete_manager_restaurant(
+def delete_manager_restaurant(
     restaurant_id: int, request: Request, db: Session = Depends(database.get_db)
 ):
     # Check user role
@@ -195,6 +233,8 @@ async def delete_manager_restaurant(
     # Delete the restaurant and commit the transaction
     db.delete(restaurant)
     db.commit()
+    restaurant_cache.detail_cache.invalidate(restaurant_id)
+    search_index.index.remove(restaurant_id)
     return {"detail": "Restaurant deleted successfully"}
 
 
@@ -202,9 +242,13 @@ async def delete_manager_restaurant(
 
 
 @router.get(
-    "/admin/restaurants", response_model=list[RestaurantSchema.RestaurantResponse]
+    "/admin/restaurants", response_model=Page[RestaurantSchema.RestaurantResponse]
 )
-async def get_all_restaurants(request: Request, db: Session = Depends(database.get_db)):
+def get_all_restaurants(
+    request: Request,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(database.get_db),
+):
     # Check user role for admin privileges
     user = request.state.user
     if user["role"] != "admin":
@@ -212,13 +256,18 @@ async def get_all_restaurants(request: Request, db: Session = Depends(database.g
             status_code=403, detail="Not authorized to view all restaurants"
         )
 
-    # Inline query to retrieve all restaurants
-    restaurants = db.query(RestaurantModel.Restaurant).all()
-    return restaurants
+    # One page of restaurants in id order
+    return paginate(
+        db.query(RestaurantModel.Restaurant).options(
+            *_load_for(RestaurantSchema.RestaurantResponse)
+        ),
+        page,
+        [RestaurantModel.Restaurant.restaurant_id],
+    )
 
 
 @router.delete("/admin/restaurants/{restaurant_id}", status_code=204)
-async def delete_restaurant_admin(
+def delete_restaurant_admin(
     restaurant_id: int, request: Request, db: Session = Depends(database.get_db)
 ):
     # Check admin access
@@ -249,15 +298,18 @@ async def delete_restaurant_admin(
     
     db.delete(restaurant)
     db.commit()
+    restaurant_cache.detail_cache.invalidate(restaurant_id)
+    search_index.index.remove(restaurant_id)
     return {"detail": "Restaurant deleted successfully"}
 
 
 @router.get(
     "/admin/restaurants/pending",
-    response_model=List[RestaurantSchema.RestaurantResponse],
+    response_model=Page[RestaurantSchema.RestaurantResponse],
 )
-async def get_pending_restaurants(
+def get_pending_restaurants(
     request: Request,
+    page: PageParams = Depends(page_params),
     db: Session = Depends(database.get_db),
 ):
     user = request.state.user
@@ -269,17 +321,17 @@ async def get_pending_restaurants(
 
     pending = (
         db.query(RestaurantModel.Restaurant)
+        .options(*_load_for(RestaurantSchema.RestaurantResponse))
         .filter(RestaurantModel.Restaurant.is_approved == False)
-        .all()
     )
-    return pending
+    return paginate(pending, page, [RestaurantModel.Restaurant.restaurant_id])
 
 
 @router.put(
     "/admin/restaurants/{restaurant_id}/approve",
     response_model=RestaurantSchema.RestaurantResponse,
 )
-async def approve_restaurant(
+def approve_restaurant(
     restaurant_id: int,
     request: Request,
     db: Session = Depends(database.get_db),
@@ -305,6 +357,7 @@ async def approve_restaurant(
     restaurant.is_approved = True
     restaurant.approved_at = datetime.utcnow()
     db.commit()
+    restaurant_cache.detail_cache.invalidate(restaurant_id)
     db.refresh(restaurant)
     return restaurant
 
@@ -313,7 +366,7 @@ async def approve_restaurant(
     "/admin/restaurants/{restaurant_id}/reject",
     response_model=RestaurantSchema.RestaurantResponse,
 )
-async def reject_restaurant(
+def reject_restaurant(
     restaurant_id: int,
     request: Request,
     db: Session = Depends(database.get_db),
@@ -339,6 +392,7 @@ async def reject_restaurant(
     restaurant.is_approved = False
     restaurant.approved_at = None
     db.commit()
+    restaurant_cache.detail_cache.invalidate(restaurant_id)
     db.refresh(restaurant)
     return restaurant
 
@@ -346,13 +400,30 @@ async def reject_restaurant(
 # Customer Endpoints
 
 
-@router.get(
-    "/restaurants/search",
-    response_model=List[RestaurantSchema.RestaurantResponse],
-    summary="Search restaurants by date, time, party size & location",
-)
-def search_restaurants(
-    request: Request,
+def _seats_party(party_size: int):
+    # EXISTS instead of a join so restaurants are not repeated per table
+    return exists().where(
+        Table.restaurant_id == Restaurant.restaurant_id,
+        Table.is_active == True,
+        Table.capacity >= party_size,
+    )
+
+
+@dataclass
+class SearchCriteria:
+    reservation_date: dt_date
+    reservation_time: Optional[dt_time]
+    party_size: Optional[int]
+    location: Optional[str]
+    q: Optional[str]
+    near: Optional[str]
+    radius: float
+    cuisine_type: Optional[RestaurantSchema.CuisineType]
+    min_rating: Optional[float]
+    max_cost_rating: Optional[int]
+
+
+def search_criteria(
     reservation_date: dt_date = Query(
         ..., description="Required reservation date (YYYY-MM-DD)"
     ),
@@ -363,10 +434,45 @@ def search_restaurants(
         None, gt=0, description="Optional number of guests"
     ),
     location: Optional[str] = Query(
-        None, description="Optional location substring (e.g. city or neighborhood)"
+        None, description="Optional location words or prefixes (e.g. city or zip code)"
     ),
-    db: Session = Depends(database.get_db),
-):
+    q: Optional[str] = Query(
+        None,
+        description="Optional keywords matched against name, description, cuisine "
+        "and address; results are ordered by relevance",
+    ),
+    near: Optional[str] = Query(
+        None,
+        description="Optional point as 'latitude,longitude'; only restaurants within "
+        "`radius` km are returned, nearest first",
+    ),
+    radius: float = Query(5.0, gt=0, le=500, description="Search radius in km around `near`"),
+    cuisine_type: Optional[RestaurantSchema.CuisineType] = Query(
+        None, description="Optional cuisine"
+    ),
+    min_rating: Optional[float] = Query(
+        None, ge=1, le=5, description="Optional minimum average rating"
+    ),
+    max_cost_rating: Optional[int] = Query(
+        None, ge=1, le=5, description="Optional maximum cost rating"
+    ),
+) -> SearchCriteria:
+    """Dependency for the restaurant search routes."""
+    return SearchCriteria(
+        reservation_date=reservation_date,
+        reservation_time=reservation_time,
+        party_size=party_size,
+        location=location,
+        q=q,
+        near=near,
+        radius=radius,
+        cuisine_type=cuisine_type,
+        min_rating=min_rating,
+        max_cost_rating=max_cost_rating,
+    )
+
+
+def _require_customer(request: Request):
     # ensure this endpoint is hit by a customer
     user = request.state.user
     if user.get("role") != "customer":
@@ -375,39 +481,118 @@ def search_restaurants(
             detail="Not authorized to search restaurants",
         )
 
-    q = db.query(Restaurant)
+
+def _search_candidates(db: Session, criteria: SearchCriteria):
+    """
+    Restaurants matching every criterion except the facet filters (cuisine,
+    rating and cost), plus the keyword match and the parsed ``near`` point
+    the caller still has to rank and apply the exact radius with.
+    """
+    query = db.query(Restaurant)
 
     # filter by location if provided
-    if location:
-        loc_filter = or_(
-            Restaurant.address_line1.ilike(f"%{location}%"),
-            Restaurant.address_line2.ilike(f"%{location}%"),
-            Restaurant.city.ilike(f"%{location}%"),
-            Restaurant.state.ilike(f"%{location}%"),
-            Restaurant.zip_code.ilike(f"%{location}%"),
+    if criteria.location:
+        query = query.filter(
+            search_index.match(db, criteria.location, "location").clause
         )
-        q = q.filter(loc_filter)
 
-    # filter by table capacity if provided
-    if party_size:
-        q = q.join(Table, Restaurant.restaurant_id == Table.restaurant_id).filter(
-            Table.capacity >= party_size
+    # filter by distance if provided: to the geohash cells around the point,
+    # through the geohash index, and within them to the lat/lng box around
+    # the circle
+    point = None
+    if criteria.near:
+        point = geo.parse_point(criteria.near)
+        if point is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="near must be 'latitude,longitude'",
+            )
+        query = query.filter(
+            geo.bucket_filter(Restaurant.geohash, *point, criteria.radius),
+            geo.box_filter(
+                Restaurant.latitude, Restaurant.longitude, *point, criteria.radius
+            ),
         )
 
-    # filter by slot date (always) and time (if provided)
-    q = q.join(
-        ReservationSlot, Restaurant.restaurant_id == ReservationSlot.restaurant_id
-    )
-    if reservation_time:
-        dt_full = datetime.combine(reservation_date, reservation_time)
-        q = q.filter(ReservationSlot.slot_time == dt_full)
+    # filter by keywords if provided
+    keywords = search_index.match(db, criteria.q) if criteria.q else None
+    if keywords:
+        query = query.filter(keywords.clause)
+
+    # filter by table capacity if provided
+    if criteria.party_size:
+        query = query.filter(_seats_party(criteria.party_size))
+
+    # filter by slot date (always) and time (if provided); range predicates
+    # keep the slot_time index usable
+    if criteria.reservation_time:
+        dt_full = datetime.combine(criteria.reservation_date, criteria.reservation_time)
+        slot_window = (ReservationSlot.slot_time == dt_full,)
     else:
-        q = q.filter(func.date(ReservationSlot.slot_time) == reservation_date)
+        day_start = datetime.combine(criteria.reservation_date, dt_time.min)
+        slot_window = (
+            ReservationSlot.slot_time >= day_start,
+            ReservationSlot.slot_time < day_start + timedelta(days=1),
+        )
 
     # ensure at least one table is available
-    q = q.filter(ReservationSlot.available_tables >= 1)
+    query = query.filter(
+        exists().where(
+            ReservationSlot.restaurant_id == Restaurant.restaurant_id,
+            ReservationSlot.available_tables >= 1,
+            *slot_window,
+        )
+    )
+    return query, keywords, point
+
+
+def _facet_filters(criteria: SearchCriteria) -> dict:
+    filters = {}
+    if criteria.cuisine_type:
+        filters["cuisine_type"] = Restaurant.cuisine_type == RestaurantModel.CuisineType(
+            criteria.cuisine_type
+        )
+    if criteria.min_rating is not None:
+        filters["rating"] = Restaurant.avg_rating >= criteria.min_rating
+    if criteria.max_cost_rating is not None:
+        filters["cost_rating"] = Restaurant.cost_rating <= criteria.max_cost_rating
+    return filters
+
+
+@router.get(
+    "/restaurants/search",
+    response_model=List[RestaurantSchema.RestaurantResponse],
+    summary="Search restaurants by date, time, party size, location, keywords, "
+    "distance, cuisine, rating & cost",
+)
+def search_restaurants(
+    request: Request,
+    criteria: SearchCriteria = Depends(search_criteria),
+    db: Session = Depends(database.get_db),
+):
+    _require_customer(request)
 
-    results = q.distinct().all()
+    query, keywords, point = _search_candidates(db, criteria)
+    query = query.filter(*_facet_filters(criteria).values()).options(
+        *_load_for(RestaurantSchema.RestaurantResponse)
+    )
+    if keywords:
+        # most relevant first
+        query = keywords.order(query)
+
+    results = query.all()
+    if keywords:
+        results = keywords.sort(results)
+    if point:
+        # then to the exact radius, nearest first
+        distances = {
+            r.restaurant_id: geo.distance_km(*point, r.latitude, r.longitude)
+            for r in results
+        }
+        results = sorted(
+            (r for r in results if distances[r.restaurant_id] <= criteria.radius),
+            key=lambda r: distances[r.restaurant_id],
+        )
 
     if not results:
         raise HTTPException(
@@ -418,6 +603,151 @@ def search_restaurants(
     return results
 
 
+def _rating_band():
+    # Whole stars, 0 for unrated; a CASE ladder because CAST rounds on MySQL
+    return case(
+        *((Restaurant.avg_rating >= band, band) for band in range(5, 0, -1)),
+        else_=0,
+    )
+
+
+@router.get(
+    "/restaurants/search/facets",
+    response_model=RestaurantSchema.RestaurantSearchFacets,
+    summary="Count search results per cuisine, cost rating and rating band",
+)
+def search_restaurant_facets(
+    request: Request,
+    criteria: SearchCriteria = Depends(search_criteria),
+    db: Session = Depends(database.get_db),
+):
+    _require_customer(request)
+
+    # With ``near``, the counts cover the box around the radius that
+    # _search_candidates filters to in SQL, rather than the exact circle
+    query, _, _ = _search_candidates(db, criteria)
+
+    # 1) One grouped query over the candidates. Each facet counts the
+    # candidates passing the other facets' filters, so grouping by every
+    # faceted value plus whether each filter passes is enough to build all
+    # of them
+    filters = _facet_filters(criteria)
+    flags = [case((clause, 1), else_=0) for clause in filters.values()]
+    groups = [Restaurant.cuisine_type, Restaurant.cost_rating, _rating_band(), *flags]
+    rows = query.with_entities(*groups, func.count()).group_by(*groups).all()
+
+    # 2) Sum the groups into the facets
+    facets = {"total": 0, "cuisine_type": {}, "cost_rating": {}, "rating": {}}
+    for cuisine, cost_rating, band, *passed, count in rows:
+        failed = {name for name, ok in zip(filters, passed) if not ok}
+        for facet, value in (
+            ("cuisine_type", cuisine.value),
+            ("cost_rating", cost_rating),
+            ("rating", band),
+        ):
+            if not failed - {facet}:
+                facets[facet][value] = facets[facet].get(value, 0) + count
+        if not failed:
+            facets["total"] += count
+    for facet in ("cuisine_type", "cost_rating", "rating"):
+        facets[facet] = dict(sorted(facets[facet].items()))
+    return facets
+
+
+@router.get(
+    "/restaurants/search/times",
+    response_model=List[RestaurantSchema.RestaurantAvailabilityResult],
+    summary="Search restaurants with their bookable times near a requested time",
+)
+def search_restaurant_times(
+    request: Request,
+    reservation_date: dt_date = Query(..., description="Reservation date (YYYY-MM-DD)"),
+    reservation_time: dt_time = Query(..., description="Requested time (HH:MM:SS)"),
+    party_size: int = Query(..., gt=0, description="Number of guests"),
+    location: Optional[str] = Query(
+        None, description="Optional location words or prefixes (e.g. city or zip code)"
+    ),
+    window_minutes: int = Query(30, ge=0, le=180),
+    times_per_restaurant: int = Query(3, ge=1, le=10),
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(database.get_db),
+):
+    # ensure this endpoint is hit by a customer
+    user = request.state.user
+    if user.get("role") != "customer":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to search restaurants",
+        )
+
+    target = datetime.combine(reservation_date, reservation_time)
+    window_start = target - timedelta(minutes=window_minutes)
+    window_end = target + timedelta(minutes=window_minutes)
+
+    # 1) Every open slot in the window for matching restaurants, in one query
+    q = (
+        db.query(Restaurant, ReservationSlot.slot_time)
+        .join(
+            ReservationSlot,
+            Restaurant.restaurant_id == ReservationSlot.restaurant_id,
+        )
+        .filter(
+            Restaurant.is_approved == True,
+            ReservationSlot.is_active == True,
+            ReservationSlot.available_tables >= 1,
+            ReservationSlot.slot_time >= window_start,
+            ReservationSlot.slot_time <= window_end,
+            _seats_party(party_size),
+        )
+    )
+    if location:
+        q = q.filter(search_index.match(db, location, "location").clause)
+
+    candidates: dict = {}
+    for restaurant, slot_time in q.all():
+        candidates.setdefault(restaurant.restaurant_id, (restaurant, []))[1].append(
+            slot_time
+        )
+    if not candidates:
+        return []
+
+    # 2) Drop slot times where every fitting table is already held
+    inventories = table_inventory.load_inventories(
+        db,
+        list(candidates),
+        window_start,
+        window_end,
+        min_capacity=party_size,
+    )
+
+    results = []
+    for restaurant_id, (restaurant, slot_times) in candidates.items():
+        inventory = inventories[restaurant_id]
+        bookable = [
+            t for t in slot_times if inventory.tables_for_party(party_size, t)
+        ]
+        if not bookable:
+            continue
+        nearest = heapq.nsmallest(
+            times_per_restaurant, bookable, key=lambda t: (abs(t - target), t)
+        )
+        results.append((abs(nearest[0] - target), restaurant, sorted(nearest)))
+
+    results.sort(key=lambda r: (r[0], -(r[1].avg_rating or 0), r[1].restaurant_id))
+    return [
+        {
+            "restaurant_id": restaurant.restaurant_id,
+            "name": restaurant.name,
+            "city": restaurant.city,
+            "cuisine_type": restaurant.cuisine_type.value,
+            "cost_rating": restaurant.cost_rating,
+            "avg_rating": restaurant.avg_rating or 0.0,
+            "slot_times": slot_times,
+        }
+        for _, restaurant, slot_times in results[:limit]
+    ]
+
+
 @router.get(
     "/restaurants/{restaurant_id}",
     response_model=RestaurantSchema.RestaurantDetailResponse,
@@ -436,9 +766,15 @@ def get_restaurant_detail(
     #         detail="Not authorized to view restaurant details",
     #     )
 
+    # serve the serialized response from the cache when we have it
+    cached = restaurant_cache.detail_cache.get(restaurant_id)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
     # fetch only approved restaurants
     restaurant = (
         db.query(Restaurant)
+        .options(*_load_for(RestaurantSchema.RestaurantDetailResponse))
         .filter(
             Restaurant.restaurant_id == restaurant_id,
             Restaurant.is_approved == True,
@@ -452,7 +788,15 @@ def get_restaurant_detail(
             detail="Restaurant not found",
         )
 
-    return restaurant
+    body = (
+        RestaurantSchema.RestaurantDetailResponse.model_validate(
+            restaurant, from_attributes=True
+        )
+        .model_dump_json()
+        .encode()
+    )
+    restaurant_cache.detail_cache.set(restaurant_id, body)
+    return Response(content=body, media_type="application/json")
 
 # @router.get(
 #     "/customer/restaurants", response_model=list[RestaurantSchema.RestaurantResponse]
@@ -467,9 +811,14 @@ def get_restaurant_detail(
 #     return restaurants
 
 @router.get(
-    "/customer/restaurants", response_model=list[RestaurantSchema.RestaurantDetailResponse]
+    "/customer/restaurants",
+    response_model=Page[RestaurantSchema.RestaurantDetailResponse],
 )
-async def get_all_restaurants(request: Request, db: Session = Depends(database.get_db)):
+def get_all_restaurants(
+    request: Request,
+    page: PageParams = Depends(page_params),
+    db: Session = Depends(database.get_db),
+):
     # Check user role for customer privileges
     user = request.state.user
     if user["role"] != "customer":
@@ -477,6 +826,11 @@ async def get_all_restaurants(request: Request, db: Session = Depends(database.g
             status_code=403, detail="Not authorized to view all restaurants"
         )
 
-    # Inline query to retrieve all restaurants
-    restaurants = db.query(RestaurantModel.Restaurant).all()
-    return restaurants
\ No newline at end of file
+    # One page of restaurants in id order
+    return paginate(
+        db.query(RestaurantModel.Restaurant).options(
+            *_load_for(RestaurantSchema.RestaurantDetailResponse)
+        ),
+        page,
+        [RestaurantModel.Restaurant.restaurant_id],
+    )
\ No newline at end of file
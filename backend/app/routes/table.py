@@ -1,10 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 from app import database
+from app.pagination import PageParams, page_params, paginate_async
 from app.models import RestaurantManagerModel, RestaurantModel, TableModel
 from app.schemas import TableSchema
+from app.schemas.PaginationSchema import Page
+from app.services import restaurant_cache
 
 router = APIRouter()
 
@@ -19,7 +23,7 @@ async def add_tables(
     restaurant_id: int,
     tables: TableSchema.TableBulkCreate,
     request: Request,
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
 ):
     user = request.state.user
     if user["role"] != "restaurant_manager":
@@ -28,14 +32,13 @@ async def add_tables(
         )
 
     # Verify that the restaurant exists and is managed by the current manager
-    restaurant = (
-        db.query(RestaurantModel.Restaurant)
+    restaurant = await db.scalar(
+        select(RestaurantModel.Restaurant)
         .join(RestaurantManagerModel.RestaurantManager)
-        .filter(
+        .where(
             RestaurantModel.Restaurant.restaurant_id == restaurant_id,
             RestaurantManagerModel.RestaurantManager.user_id == user["user_id"],
         )
-        .first()
     )
     if not restaurant:
         raise HTTPException(
@@ -54,11 +57,12 @@ async def add_tables(
         db.add(new_table)
         created_tables.append(new_table)
 
-    db.commit()
-    
+    await db.commit()
+    restaurant_cache.detail_cache.invalidate(restaurant_id)
+
     # Refresh all created records
     for table in created_tables:
-        db.refresh(table)
+        await db.refresh(table)
 
     if not created_tables:
         raise HTTPException(status_code=400, detail="Failed to create tables")
@@ -68,10 +72,13 @@ async def add_tables(
 
 @router.get(
     "/manager/restaurants/{restaurant_id}/tables",
-    response_model=list[TableSchema.TableResponse],
+    response_model=Page[TableSchema.TableResponse],
 )
 async def get_tables(
-    restaurant_id: int, request: Request, db: Session = Depends(database.get_db)
+    restaurant_id: int,
+    request: Request,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(database.get_async_db),
 ):
     user = request.state.user
     if user["role"] != "restaurant_manager":
@@ -80,27 +87,26 @@ async def get_tables(
         )
 
     # Verify that the restaurant exists and is managed by the current manager
-    restaurant = (
-        db.query(RestaurantModel.Restaurant)
+    restaurant = await db.scalar(
+        select(RestaurantModel.Restaurant)
         .join(RestaurantManagerModel.RestaurantManager)
-        .filter(
+        .where(
             RestaurantModel.Restaurant.restaurant_id == restaurant_id,
             RestaurantManagerModel.RestaurantManager.user_id == user["user_id"],
         )
-        .first()
     )
     if not restaurant:
         raise HTTPException(
             status_code=404, detail="Restaurant not found or not managed by you"
         )
 
-    # Retrieve all tables for the restaurant (in place of get_tables_by_restaurant)
-    tables = (
-        db.query(TableModel.Table)
-        .filter(TableModel.Table.restaurant_id == restaurant_id)
-        .all()
+    # Retrieve one page of tables for the restaurant
+    return await paginate_async(
+        db,
+        select(TableModel.Table).where(TableModel.Table.restaurant_id == restaurant_id),
+        page,
+        [TableModel.Table.table_id],
     )
-    return tables
 
 
 @router.put(
@@ -111,7 +117,7 @@ async def update_tables(
     restaurant_id: int,
     tables: TableSchema.TableBulkCreate,
     request: Request,
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
 ):
     user = request.state.user
     if user["role"] != "restaurant_manager":
@@ -121,14 +127,13 @@ async def update_tables(
         )
 
     # Verify that the restaurant exists and is managed by the current manager
-    restaurant = (
-        db.query(RestaurantModel.Restaurant)
+    restaurant = await db.scalar(
+        select(RestaurantModel.Restaurant)
         .join(RestaurantManagerModel.RestaurantManager)
-        .filter(
+        .where(
             RestaurantModel.Restaurant.restaurant_id == restaurant_id,
             RestaurantManagerModel.RestaurantManager.user_id == user["user_id"],
         )
-        .first()
     )
     if not restaurant:
         raise HTTPException(
@@ -138,13 +143,11 @@ async def update_tables(
     updated_tables = []
     for table in tables.tables:
         # Check if table exists by table_number
-        existing_table = (
-            db.query(TableModel.Table)
-            .filter(
+        existing_table = await db.scalar(
+            select(TableModel.Table).where(
                 TableModel.Table.table_number == table.table_number,
                 TableModel.Table.restaurant_id == restaurant_id,
             )
-            .first()
         )
 
         if existing_table:
@@ -164,11 +167,12 @@ async def update_tables(
             db.add(new_table)
             updated_tables.append(new_table)
 
-    db.commit()
-    
+    await db.commit()
+    restaurant_cache.detail_cache.invalidate(restaurant_id)
+
     # Refresh all updated records
     for table in updated_tables:
-        db.refresh(table)
+        await db.refresh(table)
 
     if not updated_tables:
         raise HTTPException(status_code=400, detail="Failed to update tables")
@@ -183,7 +187,7 @@ async def delete_table(
     restaurant_id: int,
     table_id: int,
     request: Request,
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
 ):
     user = request.state.user
     if user["role"] != "restaurant_manager":
@@ -193,14 +197,13 @@ async def delete_table(
         )
 
     # Verify that the restaurant exists and is managed by the current manager
-    restaurant = (
-        db.query(RestaurantModel.Restaurant)
+    restaurant = await db.scalar(
+        select(RestaurantModel.Restaurant)
         .join(RestaurantManagerModel.RestaurantManager)
-        .filter(
+        .where(
             RestaurantModel.Restaurant.restaurant_id == restaurant_id,
             RestaurantManagerModel.RestaurantManager.user_id == user["user_id"],
         )
-        .first()
     )
     if not restaurant:
         raise HTTPException(
@@ -208,13 +211,11 @@ async def delete_table(
         )
 
     # Retrieve the table by table_id and restaurant_id (in place of get_table_by_id_and_restaurant)
-    table = (
-        db.query(TableModel.Table)
-        .filter(
+    table = await db.scalar(
+        select(TableModel.Table).where(
             TableModel.Table.table_id == table_id,
             TableModel.Table.restaurant_id == restaurant_id,
         )
-        .first()
     )
     if not table:
         raise HTTPException(
@@ -223,6 +224,7 @@ async def delete_table(
         )
 
     # Delete the table inline (replacing delete_table_db)
-    db.delete(table)
-    db.commit()
+    await db.delete(table)
+    await db.commit()
+    restaurant_cache.detail_cache.invalidate(restaurant_id)
     return {"detail": "Table deleted successfully"}
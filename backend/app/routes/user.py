@@ -2,40 +2,66 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordRequestForm
 
 # from app.auth.auth_middleware import AuthMiddleware
-from passlib.context import CryptContext
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import database
 from app.auth.jwt_utils import create_access_token
+from app.auth.passwords import password_hasher
 from app.models import AdminModel, CustomerModel, RestaurantManagerModel, UserModel
 from app.schemas import UserSchema
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 router = APIRouter()
 
 
 @router.post("/login")
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(database.get_db),
+    db: AsyncSession = Depends(database.get_async_db),
 ):
     # Inline query to retrieve the user by email (using the username field)
-    user = (
-        db.query(UserModel.User)
-        .filter(UserModel.User.email == form_data.username)
-        .first()
+    user = await db.scalar(
+        select(UserModel.User).where(UserModel.User.email == form_data.username)
+    )
+    if not user:
+        raise HTTPException(status_code=400, detail="Invalid credentials")
+
+    # Verify the password off the event loop
+    valid, new_hash = await password_hasher.verify_and_update(
+        form_data.password, user.password_hash
     )
-    # Verify password using the password context
-    if not user or not pwd_context.verify(form_data.password, user.password_hash):
+    if not valid:
         raise HTTPException(status_code=400, detail="Invalid credentials")
 
+    # Re-hash with the current bcrypt cost if the stored hash is outdated
+    if new_hash:
+        user.password_hash = new_hash
+        await db.commit()
+
     access_token = create_access_token(
         data={"user_id": user.user_id, "email": user.email, "role": user.role.value}
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
 
+# Role-specific row created alongside each user, with its default values
+_ROLE_ROWS = {
+    "CUSTOMER": (
+        CustomerModel.Customer,
+        {"notification_preference": CustomerModel.NotificationPreference.EMAIL},
+    ),
+    "ADMIN": (AdminModel.Admin, {}),
+    "RESTAURANT_MANAGER": (
+        RestaurantManagerModel.RestaurantManager,
+        {"approved_at": None},
+    ),
+}
+
+BULK_INSERT_BATCH_SIZE = 1000
+
+
 @router.post("/register", response_model=UserSchema.UserResponse)
 def register_user(user: UserSchema.UserCreate, db: Session = Depends(database.get_db)):
     # Check if a user with the same email already exists
@@ -46,7 +72,7 @@ def register_user(user: UserSchema.UserCreate, db: Session = Depends(database.ge
         raise HTTPException(status_code=400, detail="Email already registered")
 
     # Hash the provided password
-    hashed_password = pwd_context.hash(user.password)
+    hashed_password = password_hasher.hash_sync(user.password)
     # Create a new User instance with the hashed password
     new_user = UserModel.User(
         email=user.email,
@@ -54,36 +80,107 @@ def register_user(user: UserSchema.UserCreate, db: Session = Depends(database.ge
         phone_number=user.phone_number,
         first_name=user.first_name,
         last_name=user.last_name,
-        role=user.role,
+        role=UserModel.UserRole[user.role.name],
     )
-    db.add(new_user)
-    db.commit()
+    # Attach the role row through its relationship so the user and the role
+    # row are inserted in one flush and committed together
+    role_model, role_defaults = _ROLE_ROWS[user.role.name]
+    db.add(role_model(user=new_user, **role_defaults))
+    try:
+        db.commit()
+    except IntegrityError:
+        # Lost a race with a concurrent registration for the same email
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Email already registered")
     db.refresh(new_user)
 
-    # Create an entry in the respective table based on the user's role
-    if user.role.name == "CUSTOMER":  # or use UserRole.CUSTOMER.name if imported
-        new_customer = CustomerModel.Customer(
-            user_id=new_user.user_id,
-            notification_preference=CustomerModel.NotificationPreference.EMAIL,  # default value
+    return new_user
+
+
+@router.post(
+    "/admin/users/bulk",
+    response_model=UserSchema.UserBulkCreateResult,
+    status_code=201,
+)
+def bulk_register_users(
+    payload: UserSchema.UserBulkCreate,
+    request: Request,
+    db: Session = Depends(database.get_db),
+):
+    # 1) Only admins can import users
+    user = request.state.user
+    if user["role"] != "admin":
+        raise HTTPException(status_code=403, detail="Not authorized to import users")
+
+    # 2) Reject a payload that repeats an email
+    emails = [new_user.email for new_user in payload.users]
+    if len(set(emails)) != len(emails):
+        raise HTTPException(status_code=400, detail="Duplicate emails in payload")
+
+    # 3) Leave accounts that already exist untouched
+    existing = set()
+    for start in range(0, len(emails), BULK_INSERT_BATCH_SIZE):
+        existing.update(
+            db.scalars(
+                select(UserModel.User.email).where(
+                    UserModel.User.email.in_(emails[start : start + BULK_INSERT_BATCH_SIZE])
+                )
+            )
         )
-        db.add(new_customer)
-        db.commit()
-        db.refresh(new_customer)
-    elif user.role.name == "ADMIN":  # or UserRole.ADMIN.name
-        new_admin = AdminModel.Admin(user_id=new_user.user_id)
-        db.add(new_admin)
-        db.commit()
-        db.refresh(new_admin)
-    elif user.role.name == "RESTAURANT_MANAGER":  # or UserRole.RESTAURANT_MANAGER.name
-        new_manager = RestaurantManagerModel.RestaurantManager(
-            user_id=new_user.user_id,
-            approved_at=None,  # default value
+    new_users = [new_user for new_user in payload.users if new_user.email not in existing]
+
+    # 4) Keep imported hashes; hash plain passwords on the import pool,
+    #    which leaves the login workers free
+    for new_user in new_users:
+        if new_user.password_hash is not None and not password_hasher.is_hash(
+            new_user.password_hash
+        ):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unsupported password_hash for {new_user.email}",
+            )
+    plain = [new_user.password for new_user in new_users if new_user.password_hash is None]
+    plain_hashes = iter(password_hasher.hash_many(plain))
+    hashes = [
+        new_user.password_hash or next(plain_hashes) for new_user in new_users
+    ]
+
+    # 5) Insert users, then their role rows, one executemany per batch and
+    #    table; everything commits together
+    for start in range(0, len(new_users), BULK_INSERT_BATCH_SIZE):
+        batch = new_users[start : start + BULK_INSERT_BATCH_SIZE]
+        db.execute(
+            insert(UserModel.User),
+            [
+                {
+                    "email": new_user.email,
+                    "password_hash": password_hash,
+                    "phone_number": new_user.phone_number,
+                    "first_name": new_user.first_name,
+                    "last_name": new_user.last_name,
+                    "role": UserModel.UserRole[new_user.role.name],
+                }
+                for new_user, password_hash in zip(batch, hashes[start:])
+            ],
         )
-        db.add(new_manager)
-        db.commit()
-        db.refresh(new_manager)
+        # RETURNING is not available on MySQL, so read the new ids back
+        user_ids = dict(
+            db.execute(
+                select(UserModel.User.email, UserModel.User.user_id).where(
+                    UserModel.User.email.in_([new_user.email for new_user in batch])
+                )
+            ).all()
+        )
+        role_rows = {}
+        for new_user in batch:
+            role_rows.setdefault(new_user.role.name, []).append(
+                {"user_id": user_ids[new_user.email], **_ROLE_ROWS[new_user.role.name][1]}
+            )
+        for role_name, rows in role_rows.items():
+            db.execute(insert(_ROLE_ROWS[role_name][0]), rows)
+    db.commit()
 
-    return new_user
+    return {"created": len(new_users), "skipped": sorted(existing)}
 
 
 @router.get("/users/{user_id}", response_model=UserSchema.UserResponse)
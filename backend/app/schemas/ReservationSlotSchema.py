@@ -1,4 +1,5 @@
-from datetime import datetime
+from datetime import date, datetime, time
+from typing import List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -19,3 +20,37 @@ class ReservationSlotResponse(ReservationSlotBase):
 
     class Config:
         from_attributes = True
+
+
+class SlotGenerateRequest(BaseModel):
+    """Generate slots every ``interval_minutes`` through each day's opening hours."""
+
+    start_date: date
+    end_date: date
+    interval_minutes: int = Field(30, ge=5, le=240)
+    # A slot is only generated if a table seated then is free by closing time
+    turn_minutes: int = Field(90, ge=15, le=480)
+    # Reset available_tables (active tables less confirmed bookings) and
+    # is_active on slots that already exist; otherwise they are left as they are
+    overwrite: bool = False
+
+
+class SlotGenerateResponse(BaseModel):
+    # Slot times written, including existing ones that were kept
+    slots: int
+    available_tables: int
+
+
+class AvailabilityMatrixResponse(BaseModel):
+    """
+    Bookable capacity for a party over a date range.
+
+    ``capacity[d][t]`` is the number of tables that can seat the party on
+    ``days[d]`` at ``times[t]``; ``None`` means there is no open slot then.
+    """
+
+    restaurant_id: int
+    party_size: int
+    days: List[date]
+    times: List[time]
+    capacity: List[List[Optional[int]]]
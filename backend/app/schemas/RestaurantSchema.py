@@ -1,6 +1,6 @@
 from datetime import datetime, time
 from enum import Enum
-from typing import List, Optional, Any
+from typing import Dict, List, Optional, Any
 
 from pydantic import BaseModel, EmailStr, Field, validator
 
@@ -35,6 +35,9 @@ class RestaurantBase(BaseModel):
     email: EmailStr
     cuisine_type: CuisineType
     cost_rating: int = Field(..., ge=1, le=5)
+    # Geocoded from the address when not given
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     availability: Optional[List[str]] = None
     booked_slots: Optional[List[str]] = None
 
@@ -67,6 +70,8 @@ class RestaurantUpdate(BaseModel):
     email: Optional[EmailStr] = None
     cuisine_type: Optional[CuisineType] = None
     cost_rating: Optional[int] = Field(None, ge=1, le=5)
+    latitude: Optional[float] = Field(None, ge=-90, le=90)
+    longitude: Optional[float] = Field(None, ge=-180, le=180)
     is_approved: Optional[bool] = None
     approved_at: Optional[datetime] = None
     availability: Optional[List[str]] = None
@@ -92,6 +97,7 @@ class RestaurantResponse(RestaurantBase):
     restaurant_id: int
     manager_id: int
     avg_rating: float
+    review_count: int = 0
     is_approved: bool
     approved_at: Optional[datetime]
     created_at: datetime
@@ -120,6 +126,7 @@ class RestaurantResponse(RestaurantBase):
 class RestaurantDetailResponse(RestaurantResponse):
     tables: List[TableResponse] = []
     reviews: List[ReviewResponse] = []
+    rating_histogram: Dict[int, int] = Field(default_factory=dict)
 
     class Config:
         from_attributes = True
@@ -135,3 +142,29 @@ class RestaurantSearch(BaseModel):
     cuisine_type: Optional[CuisineType] = None
     min_rating: Optional[float] = Field(None, ge=1, le=5)
     max_cost_rating: Optional[int] = Field(None, ge=1, le=5)
+
+
+class RestaurantSearchFacets(BaseModel):
+    """
+    Result counts per filter value for a search. Each facet applies every
+    filter except its own, so an option's count is how many results
+    choosing it would give.
+    """
+
+    total: int
+    cuisine_type: Dict[CuisineType, int]
+    cost_rating: Dict[int, int]
+    # Whole stars of the average rating: 4 covers 4.0-4.9; 0 is unrated
+    rating: Dict[int, int]
+
+
+class RestaurantAvailabilityResult(BaseModel):
+    """A restaurant with its bookable slot times closest to the requested time."""
+
+    restaurant_id: int
+    name: str
+    city: str
+    cuisine_type: CuisineType
+    cost_rating: int
+    avg_rating: float
+    slot_times: List[datetime]
@@ -2,7 +2,7 @@ from datetime import datetime, time
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, EmailStr, Field, model_validator
 
 
 class UserRole(str, Enum):
@@ -23,6 +23,34 @@ class UserCreate(UserBase):
     password: str = Field(..., min_length=8)
 
 
+# Largest import accepted in one request. Plain passwords are hashed before
+# the response, so large imports should send existing hashes instead.
+MAX_BULK_USERS = 10000
+
+
+class UserImport(UserBase):
+    """A user to import, with either a plain password or an existing bcrypt hash."""
+
+    password: Optional[str] = Field(None, min_length=8)
+    password_hash: Optional[str] = None
+
+    @model_validator(mode="after")
+    def one_password(self):
+        if (self.password is None) == (self.password_hash is None):
+            raise ValueError("Give exactly one of password and password_hash")
+        return self
+
+
+class UserBulkCreate(BaseModel):
+    users: List[UserImport] = Field(..., min_length=1, max_length=MAX_BULK_USERS)
+
+
+class UserBulkCreateResult(BaseModel):
+    created: int
+    # Emails that already had an account and were left untouched
+    skipped: List[EmailStr] = []
+
+
 class UserUpdate(BaseModel):
     email: Optional[EmailStr] = None
     phone_number: Optional[str] = None
@@ -0,0 +1,129 @@
+"""
+Reservation confirmation codes.
+
+A code is the reservation id run through a keyed 40-bit permutation (a
+four-round Feistel network over HMAC-SHA256), written as 8 Crockford base32
+characters, followed by a 2-character keyed checksum. Distinct ids always
+give distinct codes, so no collision check against the database is needed,
+and to anyone without CONFIRMATION_CODE_KEY consecutive ids look unrelated.
+The key is required: the app refuses to start without it.
+
+The checksum lets lookups accept common typing slips (case, hyphens, I/L/O)
+in current codes. Codes stored before codes were derived from ids (random
+A-Z0-9 strings) or issued under a since-rotated key fail the checksum, so
+candidates() also offers the typed code verbatim for an exact lookup.
+"""
+import hashlib
+import hmac
+import os
+import re
+import secrets
+from typing import List, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _load_key() -> bytes:
+    key = os.getenv("CONFIRMATION_CODE_KEY")
+    if not key:
+        # A well-known default would let anyone compute the code of any
+        # reservation id, so refuse to start instead
+        raise RuntimeError(
+            "CONFIRMATION_CODE_KEY is not set; set it to a long random secret"
+        )
+    return key.encode()
+
+
+CODE_KEY = _load_key()
+
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+# Characters people confuse with the ones in the alphabet
+_NORMALIZE = str.maketrans({"I": "1", "L": "1", "O": "0", "-": None, " ": None})
+
+# Shape of every code ever stored: the earlier random codes were
+# 10 characters of A-Z0-9 too
+_STORED_CODE = re.compile(r"[A-Z0-9]{10}")
+
+HALF_BITS = 20
+HALF_MASK = (1 << HALF_BITS) - 1
+SEQUENCE_BITS = 2 * HALF_BITS
+ROUNDS = 4
+CHECK_BITS = 10
+CODE_LENGTH = (SEQUENCE_BITS + CHECK_BITS) // 5
+
+
+def _digest(key: bytes, tag: bytes, value: int) -> int:
+    mac = hmac.new(key, tag + value.to_bytes(5, "big"), hashlib.sha256)
+    return int.from_bytes(mac.digest()[:4], "big")
+
+
+def _permute(value: int, key: bytes, inverse: bool = False) -> int:
+    left, right = value >> HALF_BITS, value & HALF_MASK
+    rounds = range(ROUNDS - 1, -1, -1) if inverse else range(ROUNDS)
+    for r in rounds:
+        if inverse:
+            left, right = right ^ (_digest(key, bytes([r]), left) & HALF_MASK), left
+        else:
+            left, right = right, left ^ (_digest(key, bytes([r]), right) & HALF_MASK)
+    return (left << HALF_BITS) | right
+
+
+def _checksum(value: int, key: bytes) -> int:
+    return _digest(key, b"check", value) & ((1 << CHECK_BITS) - 1)
+
+
+def encode(sequence: int, key: bytes = CODE_KEY) -> str:
+    """Confirmation code for a sequence number (the reservation id)."""
+    if not 0 <= sequence < 1 << SEQUENCE_BITS:
+        raise ValueError(f"sequence {sequence} out of range")
+    value = (_permute(sequence, key) << CHECK_BITS) | _checksum(sequence, key)
+    return "".join(
+        ALPHABET[(value >> shift) & 31] for shift in range(5 * (CODE_LENGTH - 1), -1, -5)
+    )
+
+
+def normalize(code: str) -> str:
+    return code.upper().translate(_NORMALIZE)
+
+
+def decode(code: str, key: bytes = CODE_KEY) -> Optional[int]:
+    """Sequence number for a code, or None if it is malformed or fails its checksum."""
+    code = normalize(code)
+    if len(code) != CODE_LENGTH:
+        return None
+    value = 0
+    for char in code:
+        index = ALPHABET.find(char)
+        if index < 0:
+            return None
+        value = (value << 5) | index
+    sequence = _permute(value >> CHECK_BITS, key, inverse=True)
+    if _checksum(sequence, key) != value & ((1 << CHECK_BITS) - 1):
+        return None
+    return sequence
+
+
+def candidates(code: str) -> List[str]:
+    """
+    Stored codes a typed ``code`` can refer to: its normalized form when it
+    passes the checksum, and the upper-cased code as typed, for legacy codes
+    and codes issued under a previous key. Empty when it cannot match
+    anything, so the lookup can be skipped.
+    """
+    found = []
+    if decode(code) is not None:
+        found.append(normalize(code))
+    verbatim = code.strip().upper()
+    if verbatim not in found and _STORED_CODE.fullmatch(verbatim):
+        found.append(verbatim)
+    return found
+
+
+def placeholder() -> str:
+    """
+    Unique stand-in for the NOT NULL column until the reservation id is
+    known. Lowercase hex, so it never matches a real code.
+    """
+    return secrets.token_hex(10)
@@ -0,0 +1,225 @@
+"""
+Transactional outbox for outgoing email.
+
+Routes call enqueue_email() inside their own transaction, so the message is
+stored if and only if the booking commits. A separate worker process drains
+the outbox over one long-lived SMTP connection:
+
+    python -m app.services.email_outbox
+
+Each batch is claimed in one short transaction that pushes the rows'
+next_attempt_at EMAIL_OUTBOX_CLAIM_SECONDS ahead, then sent with no
+transaction open, then recorded in a second short transaction. A worker
+that dies mid-batch leaves its unsent rows to be picked up again once the
+claim runs out.
+"""
+import logging
+import os
+import smtplib
+import time
+from datetime import datetime, timedelta
+from email.message import Message
+from typing import Callable, Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models.EmailOutboxModel import EmailOutbox, OutboxStatus
+from app.routes.email import build_email_message
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = int(os.getenv("EMAIL_OUTBOX_BATCH_SIZE", "50"))
+MAX_ATTEMPTS = int(os.getenv("EMAIL_OUTBOX_MAX_ATTEMPTS", "6"))
+POLL_INTERVAL_SECONDS = float(os.getenv("EMAIL_OUTBOX_POLL_SECONDS", "2"))
+# Retry n waits RETRY_BASE * 2**(n-1), capped at RETRY_MAX
+RETRY_BASE = timedelta(seconds=int(os.getenv("EMAIL_OUTBOX_RETRY_BASE_SECONDS", "30")))
+RETRY_MAX = timedelta(hours=1)
+# How long a claimed batch stays invisible to other workers; must exceed
+# the time it takes to send a batch
+CLAIM_TIMEOUT = timedelta(seconds=int(os.getenv("EMAIL_OUTBOX_CLAIM_SECONDS", "300")))
+# A connection unused for this long is checked with NOOP before reuse
+SMTP_IDLE_SECONDS = float(os.getenv("SMTP_IDLE_SECONDS", "30"))
+
+
+def enqueue_email(db: Session, to_email: str, subject: str, body: str) -> EmailOutbox:
+    """Add a message to the outbox; it is sent once the caller commits."""
+    message = EmailOutbox(to_email=to_email, subject=subject, body=body)
+    db.add(message)
+    return message
+
+
+def retry_delay(attempts: int) -> timedelta:
+    return min(RETRY_BASE * (2 ** (attempts - 1)), RETRY_MAX)
+
+
+class SMTPConnection:
+    """
+    A lazily opened SMTP session reused across messages and batches.
+
+    STARTTLS and login happen once per connection instead of once per email.
+    A connection left idle is checked with NOOP before reuse, and a reused
+    one the server has dropped is replaced once before the send counts as
+    failed. Any other SMTP error drops the connection so the next send
+    reconnects.
+    """
+
+    def __init__(self, smtp_factory: Callable[..., smtplib.SMTP] = smtplib.SMTP):
+        self.smtp_factory = smtp_factory
+        self.server = os.getenv("SMTP_SERVER", "smtp.gmail.com")
+        self.port = int(os.getenv("SMTP_PORT", "587"))
+        self.username = os.getenv("SMTP_USERNAME")
+        self.password = os.getenv("SMTP_PASSWORD")
+        self.use_tls = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = self.smtp_factory(self.server, self.port)
+        if self.use_tls:
+            smtp.starttls()
+        if self.username:
+            smtp.login(self.username, self.password)
+        return smtp
+
+    def _alive(self) -> bool:
+        try:
+            code, _ = self._smtp.noop()
+        except (smtplib.SMTPException, OSError):
+            return False
+        return code == 250
+
+    def send(self, message: Message) -> None:
+        reused = self._smtp is not None
+        if reused and time.monotonic() - self._last_used >= SMTP_IDLE_SECONDS:
+            if not self._alive():
+                self.close()
+                reused = False
+        if self._smtp is None:
+            self._smtp = self._connect()
+        try:
+            try:
+                self._smtp.send_message(message)
+            except smtplib.SMTPServerDisconnected:
+                if not reused:
+                    raise
+                # The server timed out a connection we kept open
+                self.close()
+                self._smtp = self._connect()
+                self._smtp.send_message(message)
+        except Exception:
+            self.close()
+            raise
+        self._last_used = time.monotonic()
+
+    def close(self) -> None:
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                pass
+            self._smtp = None
+
+
+def drain_once(db: Session, connection: SMTPConnection) -> int:
+    """
+    Send one batch of due messages and return how many were processed.
+
+    Rows are claimed with FOR UPDATE SKIP LOCKED where the database supports
+    it, so several workers can drain the same outbox; the row locks are
+    released before any email is sent.
+    """
+    # 1) Claim due rows and commit, so no locks are held while sending
+    now = datetime.utcnow()
+    batch = (
+        db.query(EmailOutbox)
+        .filter(
+            EmailOutbox.status == OutboxStatus.PENDING,
+            EmailOutbox.next_attempt_at <= now,
+        )
+        .order_by(EmailOutbox.next_attempt_at, EmailOutbox.outbox_id)
+        .limit(BATCH_SIZE)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    claimed = []
+    for message in batch:
+        message.attempts += 1
+        message.next_attempt_at = now + CLAIM_TIMEOUT
+        claimed.append(
+            (
+                message.outbox_id,
+                message.attempts,
+                build_email_message(message.to_email, message.subject, message.body),
+            )
+        )
+    db.commit()
+
+    # 2) Send outside any transaction
+    results = []
+    for outbox_id, attempts, email in claimed:
+        try:
+            connection.send(email)
+        except Exception as e:
+            results.append((outbox_id, attempts, e))
+        else:
+            results.append((outbox_id, attempts, None))
+
+    # 3) Record the outcomes. The attempts guard skips rows whose claim ran
+    #    out and were taken by another worker meanwhile.
+    now = datetime.utcnow()
+    for outbox_id, attempts, error in results:
+        if error is None:
+            values = {
+                "status": OutboxStatus.SENT,
+                "sent_at": now,
+                "last_error": None,
+            }
+        elif attempts >= MAX_ATTEMPTS:
+            values = {"status": OutboxStatus.DEAD, "last_error": str(error)}
+            logger.error(
+                f"Giving up on email {outbox_id} after {attempts} attempts: {error}"
+            )
+        else:
+            values = {
+                "next_attempt_at": now + retry_delay(attempts),
+                "last_error": str(error),
+            }
+            logger.warning(f"Email {outbox_id} failed, will retry: {error}")
+        db.execute(
+            update(EmailOutbox)
+            .where(
+                EmailOutbox.outbox_id == outbox_id,
+                EmailOutbox.attempts == attempts,
+            )
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+    return len(claimed)
+
+
+def run_worker(session_factory, connection: Optional[SMTPConnection] = None) -> None:
+    """Drain the outbox forever, sleeping only when there is nothing due."""
+    connection = connection or SMTPConnection()
+    try:
+        while True:
+            db = session_factory()
+            try:
+                processed = drain_once(db, connection)
+            finally:
+                db.close()
+            if processed < BATCH_SIZE:
+                time.sleep(POLL_INTERVAL_SECONDS)
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    run_worker(SessionLocal)
@@ -0,0 +1,155 @@
+"""
+Geohash buckets and great-circle distances for proximity search.
+
+Every geocoded restaurant stores a GEOHASH_PRECISION character geohash of
+its coordinates in an indexed column. A geohash names a lat/lng cell, and
+every point inside the cell has a hash starting with the cell's name, so
+"restaurants in cell c" is the index range scan geohash >= c AND
+geohash < c's successor.
+
+A radius search picks the finest precision whose cells are at least as
+tall and wide as the circle, takes the cell holding the centre plus its
+eight neighbours (which together cover the circle), narrows those nine
+ranges to the lat/lng box around the circle, and only measures exact
+distances for the restaurants left.
+"""
+import math
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+GEOHASH_PRECISION = 9  # cells of roughly 5 x 5 m
+EARTH_RADIUS_KM = 6371.0088
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def encode(lat: float, lng: float, precision: int = GEOHASH_PRECISION) -> str:
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, value, bits, even = [], 0, 0, True
+    while len(chars) < precision:
+        # Bits alternate between longitude and latitude, longitude first
+        coordinate, bounds = (lng, lng_range) if even else (lat, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        if coordinate >= middle:
+            value = value << 1 | 1
+            bounds[0] = middle
+        else:
+            value <<= 1
+            bounds[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(_BASE32[value])
+            value = bits = 0
+    return "".join(chars)
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """Height and width in degrees of a geohash cell at ``precision``."""
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2**lat_bits, 360.0 / 2**lng_bits
+
+
+def distance_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Haversine great-circle distance."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = (
+        math.sin(d_phi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _extent(lat: float, radius_km: float) -> Tuple[float, Optional[float]]:
+    """
+    Half the height and width in degrees of the box around a circle of
+    ``radius_km`` centred at latitude ``lat``; no width if it spans a pole.
+    """
+    angle = radius_km / EARTH_RADIUS_KM
+    cos_lat = math.cos(math.radians(lat))
+    if math.sin(angle) >= cos_lat:
+        return math.degrees(angle), None
+    # Widest longitude reached by the circle, which is beyond the centre's
+    # latitude when away from the equator
+    return math.degrees(angle), math.degrees(math.asin(math.sin(angle) / cos_lat))
+
+
+def covering_cells(lat: float, lng: float, radius_km: float) -> List[str]:
+    """
+    Geohash cells that together contain every point within ``radius_km`` of
+    (lat, lng), or [] when the circle is too large to prune by (it spans a
+    pole or more than a precision-1 cell).
+    """
+    d_lat, d_lng = _extent(lat, radius_km)
+    if d_lng is None:
+        return []
+
+    precision = 0
+    for candidate in range(1, GEOHASH_PRECISION + 1):
+        height, width = cell_size(candidate)
+        if height < d_lat or width < d_lng:
+            break
+        precision = candidate
+    if not precision:
+        return []
+
+    height, width = cell_size(precision)
+    cells = set()
+    for d_y in (-height, 0.0, height):
+        y = lat + d_y
+        if not -90.0 <= y <= 90.0:
+            continue
+        for d_x in (-width, 0.0, width):
+            x = (lng + d_x + 180.0) % 360.0 - 180.0
+            cells.add(encode(y, x, precision))
+    return sorted(cells)
+
+
+def bucket_filter(column, lat: float, lng: float, radius_km: float):
+    """
+    WHERE clause keeping the rows whose ``column`` geohash falls in the
+    cells around (lat, lng); ungeocoded rows never match.
+    """
+    cells = covering_cells(lat, lng, radius_km)
+    if not cells:
+        return column.isnot(None)
+    return or_(
+        *(
+            and_(column >= cell, column < cell[:-1] + chr(ord(cell[-1]) + 1))
+            for cell in cells
+        )
+    )
+
+
+def box_filter(lat_column, lng_column, lat: float, lng: float, radius_km: float):
+    """
+    WHERE clause keeping the rows whose coordinates fall in the lat/lng box
+    around the circle of ``radius_km``: every row within the radius, plus
+    the few in the box's corners.
+    """
+    d_lat, d_lng = _extent(lat, radius_km)
+    clauses = [lat_column.between(lat - d_lat, lat + d_lat)]
+    if d_lng is not None and d_lng < 180.0:
+        west, east = lng - d_lng, lng + d_lng
+        if west < -180.0:
+            clauses.append(or_(lng_column >= west + 360.0, lng_column <= east))
+        elif east > 180.0:
+            clauses.append(or_(lng_column >= west, lng_column <= east - 360.0))
+        else:
+            clauses.append(lng_column.between(west, east))
+    return and_(*clauses)
+
+
+def parse_point(text: str) -> Optional[Tuple[float, float]]:
+    """'lat,lng' as a pair of floats, or None if it is not a valid point."""
+    try:
+        lat, lng = (float(part) for part in text.split(","))
+    except ValueError:
+        return None
+    if not (-90.0 <= lat <= 90.0 and -180.0 <= lng <= 180.0):
+        return None
+    return lat, lng
@@ -0,0 +1,188 @@
+"""
+Address geocoding for restaurants.
+
+create_restaurant and update_restaurant_details call locate() to fill in
+latitude and longitude from the address (unless the manager sent explicit
+coordinates) and the geohash bucket used by proximity search.
+
+GEOCODER selects the provider:
+
+    none       never geocode; only explicit coordinates are stored (default)
+    nominatim  OpenStreetMap Nominatim at GEOCODER_URL. Needs a
+               GEOCODER_USER_AGENT identifying the deployment, per the
+               Nominatim usage policy; requests are spaced at least
+               GEOCODER_MIN_INTERVAL_SECONDS (1) apart.
+    offline    built-in city centroids, no network; for tests and local
+               development only. Restaurants in a known city get its centre
+               plus a small offset derived from the street address, so the
+               coordinates are made up and proximity results are only
+               roughly right; unknown cities stay ungeocoded.
+
+A geocoding failure never fails the write: the restaurant is saved without
+coordinates and does not show up in proximity searches until it is edited.
+"""
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Callable, Optional, Protocol, Tuple
+
+import httpx
+from dotenv import load_dotenv
+
+from app.services import geo
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+GEOCODER = os.getenv("GEOCODER", "none").lower()
+GEOCODER_URL = os.getenv("GEOCODER_URL", "https://nominatim.openstreetmap.org/search")
+GEOCODER_USER_AGENT = os.getenv("GEOCODER_USER_AGENT", "restaurant-reservations")
+GEOCODER_TIMEOUT_SECONDS = float(os.getenv("GEOCODER_TIMEOUT_SECONDS", "5"))
+# The Nominatim usage policy allows at most one request per second
+GEOCODER_MIN_INTERVAL_SECONDS = float(os.getenv("GEOCODER_MIN_INTERVAL_SECONDS", "1"))
+
+ADDRESS_FIELDS = ("address_line1", "address_line2", "city", "state", "zip_code")
+
+Point = Tuple[float, float]
+
+
+class Geocoder(Protocol):
+    def geocode(self, address: dict) -> Optional[Point]:
+        ...
+
+
+# (city, state) -> (latitude, longitude)
+CITY_CENTROIDS = {
+    ("austin", "TX"): (30.2672, -97.7431),
+    ("boston", "MA"): (42.3601, -71.0589),
+    ("chicago", "IL"): (41.8781, -87.6298),
+    ("dallas", "TX"): (32.7767, -96.7970),
+    ("denver", "CO"): (39.7392, -104.9903),
+    ("houston", "TX"): (29.7604, -95.3698),
+    ("las vegas", "NV"): (36.1699, -115.1398),
+    ("los angeles", "CA"): (34.0522, -118.2437),
+    ("miami", "FL"): (25.7617, -80.1918),
+    ("new york", "NY"): (40.7128, -74.0060),
+    ("oakland", "CA"): (37.8044, -122.2712),
+    ("philadelphia", "PA"): (39.9526, -75.1652),
+    ("phoenix", "AZ"): (33.4484, -112.0740),
+    ("portland", "OR"): (45.5152, -122.6784),
+    ("sacramento", "CA"): (38.5816, -121.4944),
+    ("san diego", "CA"): (32.7157, -117.1611),
+    ("san francisco", "CA"): (37.7749, -122.4194),
+    ("san jose", "CA"): (37.3382, -121.8863),
+    ("seattle", "WA"): (47.6062, -122.3321),
+    ("washington", "DC"): (38.9072, -77.0369),
+}
+
+# Largest offset from the city centre, in degrees (about 3 km)
+OFFLINE_SPREAD_DEGREES = 0.03
+
+
+class OfflineGeocoder:
+    """Deterministic stand-in that needs no network access."""
+
+    def geocode(self, address: dict) -> Optional[Point]:
+        city = (address.get("city") or "").strip().lower()
+        state = (address.get("state") or "").strip().upper()
+        centroid = CITY_CENTROIDS.get((city, state))
+        if centroid is None:
+            return None
+        street = " ".join(
+            (address.get(field) or "").strip().lower()
+            for field in ("address_line1", "address_line2", "zip_code")
+        )
+        digest = hashlib.sha256(street.encode()).digest()
+        offsets = (
+            (int.from_bytes(digest[i : i + 4], "big") / 0xFFFFFFFF * 2 - 1)
+            * OFFLINE_SPREAD_DEGREES
+            for i in (0, 4)
+        )
+        d_lat, d_lng = offsets
+        return round(centroid[0] + d_lat, 6), round(centroid[1] + d_lng, 6)
+
+
+class NominatimGeocoder:
+    def __init__(
+        self,
+        url: str = GEOCODER_URL,
+        user_agent: str = GEOCODER_USER_AGENT,
+        timeout: float = GEOCODER_TIMEOUT_SECONDS,
+        min_interval: float = GEOCODER_MIN_INTERVAL_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.url = url
+        self.user_agent = user_agent
+        self.timeout = timeout
+        self.min_interval = min_interval
+        self.clock = clock
+        self.sleep = sleep
+        self._last_request: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _wait_turn(self) -> None:
+        with self._lock:
+            if self._last_request is not None:
+                wait = self._last_request + self.min_interval - self.clock()
+                if wait > 0:
+                    self.sleep(wait)
+            self._last_request = self.clock()
+
+    def geocode(self, address: dict) -> Optional[Point]:
+        query = ", ".join(
+            address[field] for field in ADDRESS_FIELDS if address.get(field)
+        )
+        self._wait_turn()
+        try:
+            response = httpx.get(
+                self.url,
+                params={"q": query, "format": "jsonv2", "limit": 1},
+                headers={"User-Agent": self.user_agent},
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            results = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning(f"Geocoding failed for {query!r}: {e}")
+            return None
+        if not results:
+            return None
+        return float(results[0]["lat"]), float(results[0]["lon"])
+
+
+class NoGeocoder:
+    def geocode(self, address: dict) -> Optional[Point]:
+        return None
+
+
+def _make_geocoder() -> Geocoder:
+    if GEOCODER == "nominatim":
+        return NominatimGeocoder()
+    if GEOCODER == "offline":
+        return OfflineGeocoder()
+    if GEOCODER != "none":
+        logger.error(f"Unknown GEOCODER {GEOCODER!r}; restaurants will not be geocoded")
+    return NoGeocoder()
+
+
+geocoder = _make_geocoder()
+
+
+def locate(restaurant, regeocode: bool = False) -> None:
+    """
+    Geocode ``restaurant`` if it has no coordinates (or ``regeocode`` is set
+    because its address changed), then refresh its geohash bucket.
+    """
+    if regeocode or restaurant.latitude is None or restaurant.longitude is None:
+        point = geocoder.geocode(
+            {field: getattr(restaurant, field) for field in ADDRESS_FIELDS}
+        )
+        restaurant.latitude, restaurant.longitude = point or (None, None)
+    if restaurant.latitude is None or restaurant.longitude is None:
+        restaurant.geohash = None
+    else:
+        restaurant.geohash = geo.encode(restaurant.latitude, restaurant.longitude)
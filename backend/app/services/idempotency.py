@@ -0,0 +1,182 @@
+"""
+Idempotency keys for retried POST requests.
+
+A client that sends an ``Idempotency-Key`` header gets the stored response
+back when it repeats the request, instead of the route running again. The
+route saves the response in the same transaction as the work it did, so a
+key is recorded if and only if that work committed. Two concurrent requests
+with the same key race on the unique (user_id, idempotency_key) index: the
+loser rolls back and replays the winner's response. A route that queues on
+a row lock the winner held checks the key again once it has the lock, so
+the loser usually replays instead of failing on the work the winner just
+did; the re-check is a plain read, because a locking read of a missing key
+takes a gap lock that deadlocks two concurrent inserts on InnoDB.
+
+Stored responses live in the idempotency_keys table for
+IDEMPOTENCY_TTL_SECONDS, with a per-process LRU in front so that the burst
+of retries after a timeout is answered without touching the database.
+Expired rows are removed by
+
+    python -m app.services.idempotency
+"""
+import hashlib
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+from dotenv import load_dotenv
+from fastapi import HTTPException, Response
+from pydantic import BaseModel
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+
+from app.models.IdempotencyKeyModel import IdempotencyKey
+from app.services.restaurant_cache import MemoryBackend
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+CACHE_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_CACHE_TTL_SECONDS", "600"))
+CACHE_MAX_ENTRIES = int(os.getenv("IDEMPOTENCY_CACHE_MAX_ENTRIES", "10000"))
+MAX_KEY_LENGTH = 64
+
+
+def request_hash(payload: BaseModel) -> str:
+    return hashlib.sha256(payload.model_dump_json().encode()).hexdigest()
+
+
+def _pack(status_code: int, digest: str, body: bytes) -> bytes:
+    return f"{status_code} {digest}\n".encode() + body
+
+
+def _unpack(value: bytes):
+    header, body = value.split(b"\n", 1)
+    status_code, digest = header.decode().split(" ")
+    return int(status_code), digest, body
+
+
+class IdempotencyStore:
+    def __init__(
+        self,
+        cache: Optional[MemoryBackend],
+        ttl: int = IDEMPOTENCY_TTL_SECONDS,
+        cache_ttl: int = CACHE_TTL_SECONDS,
+    ):
+        self.cache = cache
+        self.ttl = ttl
+        self.cache_ttl = cache_ttl
+
+    def replay(
+        self, db: Session, user_id: int, key: str, digest: str
+    ) -> Optional[Response]:
+        """
+        Return the stored response for ``key``, or None if the key is new.
+        Raises 422 if the key was used with a different request.
+        """
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise HTTPException(
+                400, f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters"
+            )
+
+        cached = self.cache.get(f"{user_id}:{key}") if self.cache else None
+        if cached is not None:
+            status_code, stored_digest, body = _unpack(cached)
+        else:
+            row = (
+                db.query(IdempotencyKey)
+                .filter(
+                    IdempotencyKey.user_id == user_id,
+                    IdempotencyKey.idempotency_key == key,
+                )
+                .first()
+            )
+            if row is None:
+                return None
+            now = datetime.utcnow()
+            if row.expires_at <= now:
+                # Delete right away so the caller can save the key again
+                db.execute(
+                    delete(IdempotencyKey).where(IdempotencyKey.key_id == row.key_id)
+                )
+                return None
+            status_code, stored_digest, body = (
+                row.status_code,
+                row.request_hash,
+                row.response_body,
+            )
+            remaining = int((row.expires_at - now).total_seconds())
+            self._remember(
+                user_id, key, stored_digest, status_code, body,
+                min(self.cache_ttl, remaining),
+            )
+
+        if stored_digest != digest:
+            raise HTTPException(
+                422, "Idempotency-Key was already used for a different request"
+            )
+        return Response(
+            content=body,
+            status_code=status_code,
+            media_type="application/json",
+            headers={"Idempotent-Replayed": "true"},
+        )
+
+    def save(
+        self,
+        db: Session,
+        user_id: int,
+        key: str,
+        digest: str,
+        status_code: int,
+        body: bytes,
+    ) -> None:
+        """Record the response; it is stored once the caller commits."""
+        now = datetime.utcnow()
+        db.add(
+            IdempotencyKey(
+                user_id=user_id,
+                idempotency_key=key,
+                request_hash=digest,
+                status_code=status_code,
+                response_body=body,
+                created_at=now,
+                expires_at=now + timedelta(seconds=self.ttl),
+            )
+        )
+
+    def remember(
+        self, user_id: int, key: str, digest: str, status_code: int, body: bytes
+    ) -> None:
+        """Put a committed response in the front cache."""
+        self._remember(user_id, key, digest, status_code, body, self.cache_ttl)
+
+    def _remember(self, user_id, key, digest, status_code, body, ttl) -> None:
+        if self.cache and ttl > 0:
+            self.cache.set(f"{user_id}:{key}", _pack(status_code, digest, body), ttl)
+
+
+def purge_expired(db: Session, now: Optional[datetime] = None) -> int:
+    result = db.execute(
+        delete(IdempotencyKey).where(
+            IdempotencyKey.expires_at <= (now or datetime.utcnow())
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+
+store = IdempotencyStore(MemoryBackend(max_entries=CACHE_MAX_ENTRIES))
+
+
+if __name__ == "__main__":
+    from app.database import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        logger.info(f"Purged {purge_expired(db)} expired idempotency keys")
+    finally:
+        db.close()
@@ -0,0 +1,179 @@
+"""
+Connection pool settings and statistics.
+
+Pools are sized from the DB_POOL_* environment variables so each instance in
+the autoscaling group can be tuned without a code change. Keep
+max instances * (DB_POOL_SIZE + DB_MAX_OVERFLOW) under the database's
+connection limit.
+
+DB_POOL_PRE_PING picks how stale connections are detected:
+
+    always  ping on every checkout (one extra round trip per request)
+    idle    ping only connections idle longer than DB_POOL_PRE_PING_IDLE_SECONDS
+    never   rely on DB_POOL_RECYCLE and disconnect handling alone
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Optional
+
+from dotenv import load_dotenv
+from sqlalchemy import event, exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+load_dotenv()
+
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+PRE_PING = os.getenv("DB_POOL_PRE_PING", "idle").lower()
+PRE_PING_IDLE_SECONDS = float(os.getenv("DB_POOL_PRE_PING_IDLE_SECONDS", "30"))
+
+PRE_PING_STRATEGIES = ("always", "idle", "never")
+if PRE_PING not in PRE_PING_STRATEGIES:
+    raise ValueError(
+        f"DB_POOL_PRE_PING must be one of {', '.join(PRE_PING_STRATEGIES)}, got {PRE_PING!r}"
+    )
+
+# Upper bounds (ms) of the checkout wait histogram; the last bucket is +Inf
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PoolStats:
+    """Checkout counters and wait-time histogram for one pool."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.wait_sum_ms = 0.0
+            self.wait_max_ms = 0.0
+            self.buckets = [0] * (len(WAIT_BUCKETS_MS) + 1)
+
+    def observe(self, wait_ms: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_sum_ms += wait_ms
+            self.wait_max_ms = max(self.wait_max_ms, wait_ms)
+            self.buckets[bisect_left(WAIT_BUCKETS_MS, wait_ms)] += 1
+
+    def histogram(self) -> dict:
+        labels = [str(bound) for bound in WAIT_BUCKETS_MS] + ["+Inf"]
+        return dict(zip(labels, self.buckets))
+
+
+class _TimedPoolMixin:
+    """Times how long each checkout waits for a connection."""
+
+    stats: PoolStats
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.stats.observe((time.perf_counter() - started) * 1000, timed_out=True)
+            raise
+        self.stats.observe((time.perf_counter() - started) * 1000)
+        return connection
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    def __init__(self, *args, **kwargs):
+        self.stats = PoolStats()
+        super().__init__(*args, **kwargs)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        self.stats = PoolStats()
+        super().__init__(*args, **kwargs)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+def engine_options(is_async: bool = False) -> dict:
+    """Keyword arguments for create_engine() / create_async_engine()."""
+    return {
+        "poolclass": TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool,
+        "pool_size": POOL_SIZE,
+        "max_overflow": MAX_OVERFLOW,
+        "pool_recycle": POOL_RECYCLE,
+        "pool_timeout": POOL_TIMEOUT,
+        "pool_pre_ping": PRE_PING == "always",
+    }
+
+
+def install_idle_pre_ping(pool, idle_seconds: float = PRE_PING_IDLE_SECONDS) -> None:
+    """
+    Ping connections that sat in the pool longer than ``idle_seconds``.
+
+    A failed ping raises DisconnectionError, which makes the pool discard the
+    connection and retry the checkout with a fresh one.
+    """
+
+    @event.listens_for(pool, "checkin")
+    def _mark_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(pool, "checkout")
+    def _ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        try:
+            cursor = dbapi_connection.cursor()
+            try:
+                cursor.execute("SELECT 1")
+            finally:
+                cursor.close()
+        except Exception as e:
+            raise exc.DisconnectionError() from e
+
+
+def configure_engine(engine) -> None:
+    """Apply the pre-ping strategy to ``engine`` (sync engine or pool owner)."""
+    if PRE_PING == "idle":
+        install_idle_pre_ping(engine.pool)
+
+
+def snapshot(pool) -> Optional[dict]:
+    """Current occupancy and checkout statistics for ``pool``."""
+    stats: Optional[PoolStats] = getattr(pool, "stats", None)
+    if stats is None:
+        return None
+    with stats._lock:
+        return {
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            # QueuePool.overflow() counts down from -pool_size
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": pool._max_overflow,
+            "timeout_seconds": pool.timeout(),
+            "pre_ping": PRE_PING,
+            "checkouts": stats.checkouts,
+            "timeouts": stats.timeouts,
+            "wait_ms": {
+                "sum": round(stats.wait_sum_ms, 3),
+                "max": round(stats.wait_max_ms, 3),
+                "histogram": stats.histogram(),
+            },
+        }
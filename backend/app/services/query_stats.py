@@ -0,0 +1,187 @@
+"""
+Per-request SQL statistics.
+
+install() hooks an engine's before/after_cursor_execute events, and
+QueryStatsMiddleware opens a QueryStats for every HTTP request. While a
+request runs, each statement it issues is counted and timed, including
+those from sync routes and ThreadedSession calls on the thread pool, which
+inherit the request's context.
+
+Every response carries a Server-Timing entry, e.g.
+
+    Server-Timing: db;dur=4.1;desc="6 queries"
+
+and a structured log line is written for each request: at DEBUG normally,
+at WARNING when the same statement ran QUERY_DUPLICATE_THRESHOLD or more
+times (usually an N+1 loop) or the request went over QUERY_BUDGET.
+
+With QUERY_BUDGET_RAISE=true, the statement that goes over the budget raises
+QueryBudgetExceeded instead, which fails the request loudly in tests.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, List, Optional, Tuple
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+# Statements allowed per request; 0 disables the check
+QUERY_BUDGET = int(os.getenv("QUERY_BUDGET", "0"))
+QUERY_BUDGET_RAISE = os.getenv("QUERY_BUDGET_RAISE", "false").lower() == "true"
+QUERY_DUPLICATE_THRESHOLD = int(os.getenv("QUERY_DUPLICATE_THRESHOLD", "5"))
+SERVER_TIMING = os.getenv("QUERY_STATS_SERVER_TIMING", "true").lower() == "true"
+
+
+class QueryBudgetExceeded(RuntimeError):
+    pass
+
+
+class QueryStats:
+    """
+    Statement count, time spent in the database and repeats for one request.
+    With ``keep_statements``, ``executed`` also lists every statement run, as
+    (statement, parameters, executemany), for tests to inspect.
+    """
+
+    def __init__(
+        self,
+        budget: int = 0,
+        raise_on_budget: bool = False,
+        keep_statements: bool = False,
+    ):
+        self.budget = budget
+        self.raise_on_budget = raise_on_budget
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Counter = Counter()
+        self.executed: Optional[List[Tuple[str, Any, bool]]] = (
+            [] if keep_statements else None
+        )
+        self._lock = threading.Lock()
+
+    def start(
+        self, statement: str, parameters: Any = None, executemany: bool = False
+    ) -> None:
+        with self._lock:
+            self.count += 1
+            self.statements[statement] += 1
+            if self.executed is not None:
+                self.executed.append((statement, parameters, executemany))
+            count = self.count
+        if self.raise_on_budget and self.budget and count > self.budget:
+            raise QueryBudgetExceeded(
+                f"statement {count} exceeds the budget of {self.budget}: {statement}"
+            )
+
+    def finish(self, seconds: float) -> None:
+        with self._lock:
+            self.seconds += seconds
+
+    def duplicates(self, threshold: Optional[int] = None) -> List[dict]:
+        threshold = threshold or QUERY_DUPLICATE_THRESHOLD
+        with self._lock:
+            return [
+                {"statement": statement, "count": count}
+                for statement, count in self.statements.most_common()
+                if count >= threshold
+            ]
+
+    @property
+    def over_budget(self) -> bool:
+        return bool(self.budget) and self.count > self.budget
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.seconds * 1000:.1f};desc="{self.count} queries"'
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current() -> Optional[QueryStats]:
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is not None:
+        stats.start(statement, parameters, executemany)
+        context._query_stats_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    started = getattr(context, "_query_stats_started", None)
+    if stats is not None and started is not None:
+        stats.finish(time.perf_counter() - started)
+
+
+def install(engine: Engine) -> None:
+    """Count and time the engine's statements for the current request."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class QueryStatsMiddleware:
+    """Opens a QueryStats per HTTP request and reports it when the request ends."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(QUERY_BUDGET, QUERY_BUDGET_RAISE)
+        token = _current.set(stats)
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if SERVER_TIMING:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", stats.server_timing().encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            self._log(scope, status_code, stats)
+
+    @staticmethod
+    def _log(scope: Scope, status_code: int, stats: QueryStats) -> None:
+        duplicates = stats.duplicates()
+        level = logging.WARNING if duplicates or stats.over_budget else logging.DEBUG
+        if not logger.isEnabledFor(level):
+            return
+        logger.log(
+            level,
+            json.dumps(
+                {
+                    "event": "request_queries",
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status": status_code,
+                    "queries": stats.count,
+                    "db_ms": round(stats.seconds * 1000, 1),
+                    "budget": stats.budget or None,
+                    "duplicates": duplicates,
+                }
+            ),
+        )
@@ -0,0 +1,161 @@
+"""
+Read-through cache for the public restaurant detail response.
+
+get_restaurant_detail stores the serialized JSON bytes keyed by restaurant
+id, and every route that changes something the detail response shows calls
+invalidate() for that restaurant after committing. A reader that raced a
+write can at worst put back a copy that is stale for RESTAURANT_CACHE_TTL_SECONDS.
+
+RESTAURANT_CACHE_BACKEND selects the store:
+
+    memory  in-process LRU with TTL (default)
+    redis   shared Redis at REDIS_URL (needs the redis package)
+    none    caching disabled
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+CACHE_BACKEND = os.getenv("RESTAURANT_CACHE_BACKEND", "memory").lower()
+CACHE_TTL_SECONDS = int(os.getenv("RESTAURANT_CACHE_TTL_SECONDS", "60"))
+CACHE_MAX_ENTRIES = int(os.getenv("RESTAURANT_CACHE_MAX_ENTRIES", "1024"))
+
+
+class MemoryBackend:
+    """Thread-safe LRU of bytes values that expire ``ttl`` seconds after set()."""
+
+    def __init__(
+        self,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= self.clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (value, self.clock() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class RedisBackend:
+    """Adapter for a redis-py compatible client (get / set with ex / delete)."""
+
+    def __init__(self, client, prefix: str = "booktable:"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        self.client.set(self.prefix + key, value, ex=ttl)
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=self.prefix + "*"))
+        if keys:
+            self.client.delete(*keys)
+
+
+class ResponseCache:
+    """Serialized responses keyed by id, with hit/miss/invalidation counters."""
+
+    def __init__(self, backend, namespace: str, ttl: int = CACHE_TTL_SECONDS):
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def _key(self, key) -> str:
+        return f"{self.namespace}:{key}"
+
+    def get(self, key) -> Optional[bytes]:
+        value = self.backend.get(self._key(key)) if self.backend else None
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value: bytes) -> None:
+        if self.backend:
+            self.backend.set(self._key(key), value, self.ttl)
+
+    def invalidate(self, key) -> None:
+        if self.backend:
+            self.backend.delete(self._key(key))
+        with self._lock:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        if self.backend:
+            self.backend.clear()
+        with self._lock:
+            self.hits = self.misses = self.invalidations = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": type(self.backend).__name__ if self.backend else None,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+def _backend_from_settings():
+    if CACHE_BACKEND == "none":
+        return None
+    if CACHE_BACKEND == "redis":
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RESTAURANT_CACHE_BACKEND=redis requires the redis package")
+        return RedisBackend(
+            redis.Redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0"))
+        )
+    if CACHE_BACKEND == "memory":
+        return MemoryBackend()
+    raise ValueError(f"Unknown RESTAURANT_CACHE_BACKEND {CACHE_BACKEND!r}")
+
+
+detail_cache = ResponseCache(_backend_from_settings(), namespace="restaurant-detail")
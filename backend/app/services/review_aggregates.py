@@ -0,0 +1,117 @@
+"""
+Per-restaurant review aggregates.
+
+Restaurant.review_count, rating_sum and rating_<n>_count are adjusted with a
+single relative UPDATE in the same transaction as the review write, so a
+review insert, edit or delete costs O(1) regardless of how many reviews the
+restaurant already has, and concurrent writers cannot lose each other's
+changes. avg_rating is derived from the same row in that UPDATE.
+
+rebuild() recomputes everything from the reviews table in bulk; run it after
+a backfill or if the aggregates are ever suspected to have drifted:
+
+    python -m app.services.review_aggregates [restaurant_id ...]
+"""
+import logging
+from typing import Iterable, List, Optional
+
+from sqlalchemy import Update, case, func, select, update
+from sqlalchemy.orm import Session
+
+from app.models.CustomerReviewModel import Review
+from app.models.RestaurantModel import Restaurant
+
+logger = logging.getLogger(__name__)
+
+STARS = range(1, 6)
+REBUILD_BATCH_SIZE = 1000
+
+
+def _star_column(star: int):
+    return getattr(Restaurant, f"rating_{star}_count")
+
+
+def adjust(
+    restaurant_id: int, added: Optional[int] = None, removed: Optional[int] = None
+) -> Update:
+    """
+    UPDATE statement that moves one review into and/or out of the aggregates.
+
+    Pass ``added`` for a new review, ``removed`` for a deleted one and both
+    for a changed rating.
+    """
+    count_delta = (added is not None) - (removed is not None)
+    new_count = Restaurant.review_count + count_delta
+    new_sum = Restaurant.rating_sum + ((added or 0) - (removed or 0))
+
+    # avg_rating goes first: MySQL evaluates SET assignments left to right
+    # against the already-updated row, other databases against the old one
+    values = [
+        (
+            Restaurant.avg_rating,
+            case((new_count > 0, new_sum * 1.0 / new_count), else_=0.0),
+        ),
+        (Restaurant.review_count, new_count),
+        (Restaurant.rating_sum, new_sum),
+    ]
+    if added != removed:
+        if added is not None:
+            values.append((_star_column(added), _star_column(added) + 1))
+        if removed is not None:
+            values.append((_star_column(removed), _star_column(removed) - 1))
+
+    return (
+        update(Restaurant)
+        .where(Restaurant.restaurant_id == restaurant_id)
+        .ordered_values(*values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def rebuild(db: Session, restaurant_ids: Optional[Iterable[int]] = None) -> int:
+    """Recompute aggregates from the reviews table and return restaurants updated."""
+    totals_query = select(
+        Review.restaurant_id,
+        func.count(),
+        func.sum(Review.rating),
+        *[func.sum(case((Review.rating == star, 1), else_=0)) for star in STARS],
+    ).group_by(Review.restaurant_id)
+    ids_query = select(Restaurant.restaurant_id)
+    if restaurant_ids is not None:
+        restaurant_ids = list(restaurant_ids)
+        totals_query = totals_query.where(Review.restaurant_id.in_(restaurant_ids))
+        ids_query = ids_query.where(Restaurant.restaurant_id.in_(restaurant_ids))
+
+    totals = {row[0]: row[1:] for row in db.execute(totals_query)}
+    rows: List[dict] = []
+    for restaurant_id in db.scalars(ids_query):
+        count, total, *histogram = totals.get(restaurant_id, (0, 0) + (0,) * len(STARS))
+        row = {
+            "restaurant_id": restaurant_id,
+            "review_count": count,
+            "rating_sum": total or 0,
+            "avg_rating": (total / count) if count else 0.0,
+        }
+        for star, star_count in zip(STARS, histogram):
+            row[f"rating_{star}_count"] = star_count or 0
+        rows.append(row)
+
+    # Bulk UPDATE ... WHERE restaurant_id = ? executed in batches
+    for start in range(0, len(rows), REBUILD_BATCH_SIZE):
+        db.execute(update(Restaurant), rows[start : start + REBUILD_BATCH_SIZE])
+    db.commit()
+    return len(rows)
+
+
+if __name__ == "__main__":
+    import sys
+
+    from app.database import SessionLocal
+
+    logging.basicConfig(level=logging.INFO)
+    ids = [int(arg) for arg in sys.argv[1:]] or None
+    db = SessionLocal()
+    try:
+        logger.info(f"Rebuilt review aggregates for {rebuild(db, ids)} restaurants")
+    finally:
+        db.close()
@@ -0,0 +1,361 @@
+"""
+Full-text search over restaurants.
+
+The restaurant search routes match free text against one of two scopes:
+
+    location  address_line1, address_line2, city, state, zip_code
+    text      name, description and cuisine plus the location columns
+
+Text is split into lowercase alphanumeric tokens. Every query token has to
+match as a prefix of some token in the scope ("bro" finds "Brooklyn"), and
+matches are ranked by relevance. A token that starts a cuisine name ("ital")
+also matches restaurants of that cuisine.
+
+RESTAURANT_SEARCH_BACKEND selects the implementation:
+
+    auto    native full-text on MySQL (FULLTEXT, MATCH ... AGAINST) and
+            PostgreSQL (GIN over a tsvector), memory elsewhere (default);
+            on MySQL, words FULLTEXT skips (under 3 characters, stopwords)
+            are matched against state and zip_code instead
+    memory  in-process inverted index, built from the database on first use
+
+The native indexes are declared on the Restaurant model; existing databases
+get them from migrations/add_restaurant_search_indexes.py. The memory index
+is kept in step by the restaurant write routes, which call refresh() or
+remove() after committing, and is rebuilt in the background every
+RESTAURANT_SEARCH_RELOAD_SECONDS to pick up writes made by other processes.
+At most RESTAURANT_SEARCH_MAX_CANDIDATES of its best matches reach SQL.
+"""
+import bisect
+import heapq
+import math
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional, Set
+
+from dotenv import load_dotenv
+from sqlalchemy import and_, or_, true
+from sqlalchemy.dialects.mysql import match as mysql_match
+from sqlalchemy.dialects.postgresql import to_tsquery
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.models.RestaurantModel import (
+    LOCATION_SEARCH_COLUMNS,
+    TEXT_SEARCH_COLUMNS,
+    CuisineType,
+    Restaurant,
+    search_document,
+)
+
+load_dotenv()
+
+SEARCH_BACKEND = os.getenv("RESTAURANT_SEARCH_BACKEND", "auto").lower()
+RELOAD_SECONDS = int(os.getenv("RESTAURANT_SEARCH_RELOAD_SECONDS", "300"))
+# Most memory-index matches handed to SQL, as restaurant_id IN (...)
+MAX_CANDIDATES = int(os.getenv("RESTAURANT_SEARCH_MAX_CANDIDATES", "1000"))
+
+# InnoDB's innodb_ft_min_token_size default and its built-in stopword list
+MYSQL_MIN_TOKEN_SIZE = 3
+MYSQL_STOPWORDS = frozenset(
+    "a about an are as at be by com de en for from how i in is it la of on or "
+    "that the this to was what when where who will with und www".split()
+)
+
+SCOPES = {"location": LOCATION_SEARCH_COLUMNS, "text": TEXT_SEARCH_COLUMNS}
+
+# Weight of a term by the field it came from, for the memory index
+FIELD_WEIGHTS = {"name": 3.0, "cuisine_type": 2.0}
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return _TOKEN.findall(text.lower()) if text else []
+
+
+def _cuisines_for(token: str) -> List[CuisineType]:
+    return [c for c in CuisineType if c.value.startswith(token)]
+
+
+class InvertedIndex:
+    """
+    Term -> {restaurant_id: weight} postings with a sorted term list, so a
+    prefix lookup is a bisect plus a scan over the terms sharing the prefix.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[int, float]] = {}
+        self._terms: List[str] = []
+        self._docs: Dict[int, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, doc_id: int, fields: Dict[str, Optional[str]]) -> None:
+        self.remove(doc_id)
+        weights: Dict[str, float] = defaultdict(float)
+        for field, value in fields.items():
+            for token in tokenize(value):
+                weights[token] = max(weights[token], FIELD_WEIGHTS.get(field, 1.0))
+        for term, weight in weights.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                bisect.insort(self._terms, term)
+            postings[doc_id] = weight
+        self._docs[doc_id] = set(weights)
+
+    def remove(self, doc_id: int) -> None:
+        for term in self._docs.pop(doc_id, ()):
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+                del self._terms[bisect.bisect_left(self._terms, term)]
+
+    def _prefixed(self, prefix: str) -> List[str]:
+        start = bisect.bisect_left(self._terms, prefix)
+        end = start
+        while end < len(self._terms) and self._terms[end].startswith(prefix):
+            end += 1
+        return self._terms[start:end]
+
+    def search(self, tokens: List[str]) -> Dict[int, float]:
+        """
+        Ids of the documents matching every token, scored by the sum over
+        tokens of the best field weight times idf among the terms it prefixes.
+        """
+        scores: Optional[Dict[int, float]] = None
+        total = len(self._docs)
+        for token in tokens:
+            best: Dict[int, float] = {}
+            for term in self._prefixed(token):
+                postings = self._postings[term]
+                idf = math.log(1 + total / len(postings))
+                for doc_id, weight in postings.items():
+                    if scores is None or doc_id in scores:
+                        best[doc_id] = max(best.get(doc_id, 0.0), weight * idf)
+            scores = (
+                best
+                if scores is None
+                else {doc_id: scores[doc_id] + s for doc_id, s in best.items()}
+            )
+            if not scores:
+                break
+        return scores or {}
+
+
+class MemorySearchIndex:
+    """
+    A location and a text InvertedIndex over every restaurant.
+
+    The first search builds the indexes; once they are older than
+    reload_seconds, the next search starts a rebuild on a background thread
+    and keeps answering from the current indexes until the new ones are
+    swapped in. Writes reported while a rebuild runs are replayed onto its
+    result, since its snapshot may predate them.
+    """
+
+    def __init__(
+        self,
+        reload_seconds: int = RELOAD_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.reload_seconds = reload_seconds
+        self.clock = clock
+        self._indexes: Dict[str, InvertedIndex] = {}
+        self._loaded_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._reloader: Optional[threading.Thread] = None
+        self._pending: Optional[List[tuple]] = None
+
+    @staticmethod
+    def _fields(row, scope: str) -> Dict[str, Optional[str]]:
+        fields = {column: getattr(row, column) for column in SCOPES[scope]}
+        if scope == "text":
+            fields["cuisine_type"] = row.cuisine_type.value if row.cuisine_type else None
+        return fields
+
+    @classmethod
+    def _build(cls, db: Session) -> Dict[str, InvertedIndex]:
+        columns = {"restaurant_id", "cuisine_type", *TEXT_SEARCH_COLUMNS}
+        rows = db.query(*(getattr(Restaurant, c) for c in columns)).all()
+        indexes = {scope: InvertedIndex() for scope in SCOPES}
+        for row in rows:
+            for scope, index in indexes.items():
+                index.add(row.restaurant_id, cls._fields(row, scope))
+        return indexes
+
+    def _swap(self, indexes: Dict[str, InvertedIndex]) -> None:
+        with self._lock:
+            for op, restaurant_id, fields in self._pending or ():
+                for scope, index in indexes.items():
+                    if op == "add":
+                        index.add(restaurant_id, fields[scope])
+                    else:
+                        index.remove(restaurant_id)
+            self._indexes = indexes
+            self._loaded_at = self.clock()
+            self._pending = None
+
+    def _rebuild(self, bind) -> None:
+        try:
+            with Session(bind=bind) as db:
+                self._swap(self._build(db))
+        finally:
+            with self._lock:
+                self._pending = None
+                self._reloader = None
+
+    def search(self, db: Session, tokens: List[str], scope: str) -> Dict[int, float]:
+        if self._loaded_at is None:
+            # Nothing to answer from yet, so the first search waits; the load
+            # lock keeps concurrent first searches from all building one
+            with self._load_lock:
+                if self._loaded_at is None:
+                    with self._lock:
+                        self._pending = []
+                    try:
+                        self._swap(self._build(db))
+                    finally:
+                        with self._lock:
+                            self._pending = None
+        with self._lock:
+            if (
+                self._reloader is None
+                and self.clock() - self._loaded_at >= self.reload_seconds
+            ):
+                self._pending = []
+                self._reloader = threading.Thread(
+                    target=self._rebuild,
+                    args=(db.get_bind(),),
+                    name="search-index-reload",
+                    daemon=True,
+                )
+                self._reloader.start()
+            return self._indexes[scope].search(tokens)
+
+    def refresh(self, restaurant: Restaurant) -> None:
+        """Re-index one restaurant after a committed create or update."""
+        with self._lock:
+            if self._loaded_at is None and self._pending is None:
+                return
+            fields = {scope: self._fields(restaurant, scope) for scope in SCOPES}
+            for scope, index in self._indexes.items():
+                index.add(restaurant.restaurant_id, fields[scope])
+            if self._pending is not None:
+                self._pending.append(("add", restaurant.restaurant_id, fields))
+
+    def remove(self, restaurant_id: int) -> None:
+        with self._lock:
+            for index in self._indexes.values():
+                index.remove(restaurant_id)
+            if self._pending is not None:
+                self._pending.append(("remove", restaurant_id, None))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._indexes = {}
+            self._loaded_at = None
+
+
+index = MemorySearchIndex()
+
+
+def _backend(db: Session) -> str:
+    dialect = db.get_bind().dialect.name
+    if SEARCH_BACKEND == "memory" or dialect not in ("mysql", "mariadb", "postgresql"):
+        return "memory"
+    return dialect
+
+
+class Match:
+    """
+    The WHERE clause for one search, plus how to order by relevance: in SQL
+    on the native backends, in Python from the memory index's scores.
+    """
+
+    def __init__(self, clause, rank=None, scores: Optional[Dict[int, float]] = None):
+        self.clause = clause
+        self.rank = rank
+        self.scores = scores
+
+    def order(self, query):
+        return query.order_by(self.rank.desc()) if self.rank is not None else query
+
+    def sort(self, restaurants: list) -> list:
+        if self.scores is None:
+            return restaurants
+        return sorted(restaurants, key=lambda r: -self.scores.get(r.restaurant_id, 0.0))
+
+
+def _unindexed(dialect: str, token: str) -> bool:
+    """Whether InnoDB's FULLTEXT parser drops ``token`` from MATCH ... AGAINST."""
+    return dialect != "postgresql" and (
+        len(token) < MYSQL_MIN_TOKEN_SIZE or token in MYSQL_STOPWORDS
+    )
+
+
+def _native_match(dialect: str, tokens: List[str], scope: str) -> Match:
+    columns = [getattr(Restaurant, c) for c in SCOPES[scope]]
+    indexed = [t for t in tokens if not _unindexed(dialect, t)]
+    if dialect == "postgresql":
+        document = search_document(*columns)
+
+        def matches(terms, operator="&"):
+            query = to_tsquery("simple", f" {operator} ".join(f"{t}:*" for t in terms))
+            return document.bool_op("@@")(query), query
+
+        rank = func.ts_rank(document, matches(tokens, "|")[1])
+    else:
+
+        def matches(terms, operator="+"):
+            against = " ".join(f"{operator}{t}*" for t in terms)
+            return mysql_match(*columns, against=against).in_boolean_mode(), None
+
+        rank = matches(indexed, "")[0] if indexed else None
+
+    # Cuisine is an enum column outside the full-text index, so a token that
+    # names a cuisine may match either. Words MySQL leaves out of the index
+    # ("CA", "la") would never match there; look them up as a state code or
+    # the start of a zip code instead.
+    plain, conditions = [], []
+    for token in tokens:
+        cuisines = _cuisines_for(token) if scope == "text" else []
+        if _unindexed(dialect, token):
+            clause = or_(
+                Restaurant.state == token.upper(),
+                Restaurant.zip_code.startswith(token),
+            )
+        elif cuisines:
+            clause = matches([token])[0]
+        else:
+            plain.append(token)
+            continue
+        if cuisines:
+            clause = or_(Restaurant.cuisine_type.in_(cuisines), clause)
+        conditions.append(clause)
+    if plain:
+        conditions.insert(0, matches(plain)[0])
+    return Match(and_(*conditions), rank=rank)
+
+
+def match(db: Session, text: Optional[str], scope: str = "text") -> Match:
+    """Restaurants whose ``scope`` columns match every token of ``text``."""
+    tokens = tokenize(text)
+    if not tokens:
+        return Match(true())
+    backend = _backend(db)
+    if backend != "memory":
+        return _native_match(backend, tokens, scope)
+    scores = index.search(db, tokens, scope)
+    if len(scores) > MAX_CANDIDATES:
+        # Keep the IN list bounded: only the best-scored matches go to SQL
+        best = heapq.nlargest(MAX_CANDIDATES, scores, key=scores.get)
+        scores = {doc_id: scores[doc_id] for doc_id in best}
+    return Match(Restaurant.restaurant_id.in_(list(scores)), scores=scores)
@@ -0,0 +1,65 @@
+"""
+ReservationSlot.available_tables bookkeeping.
+
+Each change is one conditional UPDATE evaluated by the database, so
+concurrent bookings of the same slot never read-modify-write the counter in
+Python or queue on a row lock taken with SELECT ... FOR UPDATE. The
+``available_tables > 0`` guard makes the last table go to exactly one of
+the competing bookings, and the matching cap on give_back keeps a slot from
+offering more tables than the restaurant has in service.
+"""
+from datetime import datetime
+
+from sqlalchemy import exists, func, select, update
+from sqlalchemy.orm import Session
+
+from app.models.ReservationSlotModel import ReservationSlot
+from app.models.TableModel import Table
+
+
+def _slot(restaurant_id: int, slot_time: datetime):
+    return (
+        ReservationSlot.restaurant_id == restaurant_id,
+        ReservationSlot.slot_time == slot_time,
+    )
+
+
+def take(db: Session, restaurant_id: int, slot_time: datetime) -> bool:
+    """Claim one table in the slot; False if there is no open slot with a table left."""
+    result = db.execute(
+        update(ReservationSlot)
+        .where(
+            *_slot(restaurant_id, slot_time),
+            ReservationSlot.is_active == True,
+            ReservationSlot.available_tables > 0,
+        )
+        .values(available_tables=ReservationSlot.available_tables - 1)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def give_back(db: Session, restaurant_id: int, slot_time: datetime) -> bool:
+    """
+    Return a table to the slot; False if the reservation's time has no slot
+    or the slot already offers every active table.
+    """
+    active_tables = (
+        select(func.count())
+        .where(Table.restaurant_id == restaurant_id, Table.is_active == True)
+        .scalar_subquery()
+    )
+    result = db.execute(
+        update(ReservationSlot)
+        .where(
+            *_slot(restaurant_id, slot_time),
+            ReservationSlot.available_tables < active_tables,
+        )
+        .values(available_tables=ReservationSlot.available_tables + 1)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+def slot_exists(db: Session, restaurant_id: int, slot_time: datetime) -> bool:
+    return db.scalar(select(exists().where(*_slot(restaurant_id, slot_time))))
@@ -0,0 +1,159 @@
+import os
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.ReservationModel import Reservation, ReservationStatus
+from app.models.TableModel import Table
+
+# How long a reservation holds its table. A booking at 19:00 occupies the
+# table for [19:00, 19:00 + TURN_TIME).
+TURN_TIME = timedelta(minutes=int(os.getenv("RESERVATION_TURN_MINUTES", "90")))
+
+
+class TableInventory:
+    """
+    In-memory view of a restaurant's tables and the reservations holding them.
+
+    Every reservation holds its table for exactly TURN_TIME, so two bookings of
+    the same table clash when their start times are less than TURN_TIME apart.
+    Start times are kept sorted per table, which turns every availability check
+    into two bisects.
+    """
+
+    def __init__(self, tables: Iterable[Tuple[int, int]]):
+        # table_id -> capacity, in best-fit order (smallest table first)
+        self.capacity: Dict[int, int] = dict(
+            sorted(tables, key=lambda t: (t[1], t[0]))
+        )
+        self._starts: Dict[int, List[datetime]] = {t: [] for t in self.capacity}
+        self._ids: Dict[int, List[int]] = {t: [] for t in self.capacity}
+
+    def book(self, table_id: int, start: datetime, reservation_id: int) -> None:
+        starts = self._starts.setdefault(table_id, [])
+        ids = self._ids.setdefault(table_id, [])
+        i = bisect_right(starts, start)
+        starts.insert(i, start)
+        ids.insert(i, reservation_id)
+
+    def release(self, table_id: int, start: datetime, reservation_id: int) -> None:
+        starts = self._starts.get(table_id, [])
+        ids = self._ids.get(table_id, [])
+        i = bisect_left(starts, start)
+        while i < len(starts) and starts[i] == start:
+            if ids[i] == reservation_id:
+                del starts[i]
+                del ids[i]
+                return
+            i += 1
+
+    def conflicts(
+        self,
+        table_id: int,
+        start: datetime,
+        exclude_reservation_id: Optional[int] = None,
+    ) -> List[int]:
+        """Reservation ids on the table overlapping [start, start + TURN_TIME)."""
+        starts = self._starts.get(table_id, [])
+        lo = bisect_right(starts, start - TURN_TIME)
+        hi = bisect_left(starts, start + TURN_TIME)
+        ids = self._ids[table_id][lo:hi] if hi > lo else []
+        return [r for r in ids if r != exclude_reservation_id]
+
+    def is_free(
+        self,
+        table_id: int,
+        start: datetime,
+        exclude_reservation_id: Optional[int] = None,
+    ) -> bool:
+        if table_id not in self.capacity:
+            return False
+        return not self.conflicts(table_id, start, exclude_reservation_id)
+
+    def tables_for_party(
+        self,
+        party_size: int,
+        start: datetime,
+        exclude_reservation_id: Optional[int] = None,
+    ) -> List[int]:
+        """Free tables that seat the party, smallest fitting table first."""
+        return [
+            table_id
+            for table_id, capacity in self.capacity.items()
+            if capacity >= party_size
+            and self.is_free(table_id, start, exclude_reservation_id)
+        ]
+
+
+def load_inventory(
+    db: Session,
+    restaurant_id: int,
+    window_start: datetime,
+    window_end: datetime,
+    table_ids: Optional[List[int]] = None,
+) -> TableInventory:
+    """
+    Build the inventory for bookings starting within [window_start, window_end].
+
+    Only reservations that can overlap the window are loaded; the lookup is a
+    range scan on the (table_id, reservation_time) index.
+    """
+    return load_inventories(
+        db, [restaurant_id], window_start, window_end, table_ids=table_ids
+    )[restaurant_id]
+
+
+def load_inventories(
+    db: Session,
+    restaurant_ids: List[int],
+    window_start: datetime,
+    window_end: datetime,
+    table_ids: Optional[List[int]] = None,
+    min_capacity: Optional[int] = None,
+) -> Dict[int, TableInventory]:
+    """
+    Same as load_inventory for many restaurants at once, in two queries.
+
+    ``min_capacity`` skips tables too small to matter for the caller.
+    """
+    tables_q = db.query(Table.restaurant_id, Table.table_id, Table.capacity).filter(
+        Table.restaurant_id.in_(restaurant_ids),
+        Table.is_active == True,
+    )
+    if table_ids is not None:
+        tables_q = tables_q.filter(Table.table_id.in_(table_ids))
+    if min_capacity is not None:
+        tables_q = tables_q.filter(Table.capacity >= min_capacity)
+
+    tables_by_restaurant: Dict[int, List[Tuple[int, int]]] = {
+        r: [] for r in restaurant_ids
+    }
+    restaurant_of: Dict[int, int] = {}
+    for restaurant_id, table_id, capacity in tables_q.all():
+        tables_by_restaurant[restaurant_id].append((table_id, capacity))
+        restaurant_of[table_id] = restaurant_id
+    inventories = {
+        r: TableInventory(tables) for r, tables in tables_by_restaurant.items()
+    }
+    if not restaurant_of:
+        return inventories
+
+    booked = (
+        db.query(
+            Reservation.table_id,
+            Reservation.reservation_time,
+            Reservation.reservation_id,
+        )
+        .filter(
+            Reservation.table_id.in_(list(restaurant_of)),
+            Reservation.reservation_time > window_start - TURN_TIME,
+            Reservation.reservation_time < window_end + TURN_TIME,
+            Reservation.status == ReservationStatus.CONFIRMED,
+        )
+        .all()
+    )
+    for table_id, start, reservation_id in booked:
+        inventories[restaurant_of[table_id]].book(table_id, start, reservation_id)
+    return inventories
@@ -0,0 +1,49 @@
+"""
+INSERT ... ON CONFLICT for the databases we run on.
+
+MySQL spells it ON DUPLICATE KEY UPDATE and always arbitrates on every
+unique key; PostgreSQL and SQLite take ON CONFLICT (columns) DO UPDATE /
+DO NOTHING against the named unique index.
+"""
+from typing import List, Sequence
+
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+
+_INSERTS = {
+    "mysql": mysql.insert,
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def upsert(
+    dialect_name: str,
+    model,
+    rows: List[dict],
+    conflict_columns: Sequence[str],
+    update_columns: Sequence[str] = (),
+):
+    """
+    Multi-row INSERT of ``rows`` that updates ``update_columns`` on rows that
+    collide on ``conflict_columns``, or leaves them untouched if no update
+    columns are given.
+    """
+    if dialect_name not in _INSERTS:
+        raise NotImplementedError(f"No upsert support for {dialect_name}")
+    statement = _INSERTS[dialect_name](model).values(rows)
+
+    if dialect_name == "mysql":
+        # A no-op assignment stands in for DO NOTHING; INSERT IGNORE would
+        # also swallow unrelated errors
+        first = conflict_columns[0]
+        assignments = {column: statement.inserted[column] for column in update_columns}
+        return statement.on_duplicate_key_update(
+            assignments or {first: getattr(model, first)}
+        )
+
+    if update_columns:
+        return statement.on_conflict_do_update(
+            index_elements=list(conflict_columns),
+            set_={column: statement.excluded[column] for column in update_columns},
+        )
+    return statement.on_conflict_do_nothing(index_elements=list(conflict_columns))
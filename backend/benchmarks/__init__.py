@@ -0,0 +1,4 @@
+import os
+
+# Benchmarks only ever run against throwaway databases
+os.environ.setdefault("CONFIRMATION_CODE_KEY", "benchmark-confirmation-code-key")
@@ -0,0 +1,325 @@
+"""
+Latency benchmark for the customer booking flow.
+
+Seeds a fresh database (see benchmarks.dataset), then replays a scripted mix
+of search, restaurant detail, availability, book and cancel requests against
+the app, either in-process through httpx's ASGI transport or over HTTP
+against a local uvicorn. Reports p50/p95/p99 latency and throughput per
+route and writes them as JSON, so runs on different commits can be compared:
+
+    cd backend
+    python -m benchmarks.booking_flow --output bench-before.json
+    git checkout <other commit>
+    python -m benchmarks.booking_flow --output bench-after.json --baseline bench-before.json
+
+The database comes from DATABASE_URL (default: sqlite:///./benchmark.db) and
+is dropped and recreated by every run; never point it at real data.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import httpx
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
+
+from app.auth.jwt_utils import create_access_token  # noqa: E402
+from benchmarks.dataset import Dataset, generate  # noqa: E402
+
+# Relative weight of each step in the workload
+WORKLOAD_MIX = {
+    "search": 30,
+    "detail": 25,
+    "availability": 25,
+    "book": 12,
+    "cancel": 8,
+}
+
+
+@dataclass
+class Sample:
+    route: str
+    status: int
+    seconds: float
+
+
+class Workload:
+    """Picks the next request from WORKLOAD_MIX using a seeded RNG."""
+
+    def __init__(self, dataset: Dataset, seed: int = 42):
+        self.dataset = dataset
+        self.rng = random.Random(seed)
+        self.slot_times = dataset.slot_times()
+        self.headers = {
+            user_id: {
+                "Authorization": "Bearer "
+                + create_access_token(
+                    {
+                        "user_id": user_id,
+                        "email": f"user{user_id}@bench.example",
+                        "role": "customer",
+                    },
+                    timedelta(hours=12),
+                )
+            }
+            for user_id in dataset.customer_user_ids
+        }
+        # (reservation_id, headers) booked during the run, for cancels
+        self.booked: List[tuple] = []
+        routes, weights = zip(*WORKLOAD_MIX.items())
+        self._routes, self._weights = list(routes), list(weights)
+
+    def next_request(self):
+        route = self.rng.choices(self._routes, self._weights)[0]
+        if route == "cancel" and not self.booked:
+            route = "book"
+        headers = self.headers[self.rng.choice(self.dataset.customer_user_ids)]
+        restaurant_id = self.rng.choice(self.dataset.restaurant_ids)
+
+        if route == "search":
+            day = self.rng.choice(self.slot_times).date()
+            params = {"reservation_date": day.isoformat(), "party_size": 2}
+            if self.rng.random() < 0.5:
+                params["location"] = self.rng.choice(self.dataset.cities)
+            return route, "GET", "/api/restaurants/search", params, None, headers
+        if route == "detail":
+            return route, "GET", f"/api/restaurants/{restaurant_id}", None, None, headers
+        if route == "availability":
+            path = f"/api/restaurants/{restaurant_id}/availability"
+            return route, "GET", path, None, None, headers
+        if route == "book":
+            table_id, capacity = self.rng.choice(self.dataset.tables[restaurant_id])
+            body = {
+                "restaurant_id": restaurant_id,
+                "table_id": table_id,
+                "reservation_time": self.rng.choice(self.slot_times).isoformat(),
+                "party_size": self.rng.randint(1, capacity),
+            }
+            return route, "POST", "/api/reservations", None, body, headers
+        reservation_id, headers = self.booked.pop(
+            self.rng.randrange(len(self.booked))
+        )
+        path = f"/api/reservations/{reservation_id}"
+        return route, "DELETE", path, None, None, headers
+
+    def record(self, route: str, response: httpx.Response, headers: dict) -> None:
+        if route == "book" and response.status_code == 201:
+            self.booked.append((response.json()["reservation_id"], headers))
+
+
+async def run_workload(
+    client: httpx.AsyncClient,
+    workload: Workload,
+    requests: int,
+    concurrency: int = 8,
+) -> List[Sample]:
+    samples: List[Sample] = []
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            route, method, path, params, body, headers = workload.next_request()
+            started = time.perf_counter()
+            try:
+                response = await client.request(
+                    method, path, params=params, json=body, headers=headers
+                )
+                status = response.status_code
+            except httpx.HTTPError:
+                response, status = None, 0
+            samples.append(Sample(route, status, time.perf_counter() - started))
+            if response is not None:
+                workload.record(route, response, headers)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+def summarize(samples: List[Sample], wall_seconds: float) -> Dict[str, dict]:
+    by_route: Dict[str, List[Sample]] = defaultdict(list)
+    for sample in samples:
+        by_route[sample.route].append(sample)
+    by_route["all"] = samples
+
+    summary = {}
+    for route, route_samples in sorted(by_route.items()):
+        latencies = sorted(s.seconds * 1000 for s in route_samples)
+        statuses: Dict[str, int] = defaultdict(int)
+        for s in route_samples:
+            statuses[str(s.status)] += 1
+        summary[route] = {
+            "count": len(route_samples),
+            "errors": sum(1 for s in route_samples if s.status == 0 or s.status >= 500),
+            "status_codes": dict(sorted(statuses.items())),
+            "mean_ms": round(sum(latencies) / len(latencies), 3) if latencies else 0.0,
+            "p50_ms": round(percentile(latencies, 50), 3),
+            "p95_ms": round(percentile(latencies, 95), 3),
+            "p99_ms": round(percentile(latencies, 99), 3),
+            "throughput_rps": round(len(route_samples) / wall_seconds, 2)
+            if wall_seconds
+            else 0.0,
+        }
+    return summary
+
+
+def compare(current: Dict[str, dict], baseline: Dict[str, dict]) -> List[str]:
+    lines = [f"{'route':<14}{'p50':>18}{'p95':>18}{'p99':>18}"]
+    for route, stats in current.items():
+        base = baseline.get(route)
+        if not base:
+            continue
+        cells = []
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            change = (stats[key] - base[key]) / base[key] * 100 if base[key] else 0.0
+            cells.append(f"{stats[key]:8.2f} ({change:+5.1f}%)")
+        lines.append(f"{route:<14}" + "".join(f"{c:>18}" for c in cells))
+    return lines
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _start_server(port: int, workers: int) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning",
+        ],
+        env=os.environ.copy(),
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("uvicorn exited during startup")
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/openapi.json", timeout=1)
+            return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("uvicorn did not start within 30s")
+
+
+async def _run(args, dataset: Dataset) -> tuple:
+    workload = Workload(dataset, seed=args.seed)
+    server = None
+    if args.server:
+        port = _free_port()
+        server = _start_server(port, args.workers)
+        client = httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=30)
+    else:
+        from app.main import app
+
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=30
+        )
+    try:
+        async with client:
+            if args.warmup:
+                await run_workload(client, workload, args.warmup, args.concurrency)
+            started = time.perf_counter()
+            samples = await run_workload(
+                client, workload, args.requests, args.concurrency
+            )
+            return samples, time.perf_counter() - started
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+def main(argv: Optional[List[str]] = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--restaurants", type=int, default=50)
+    parser.add_argument("--tables", type=int, default=8, help="tables per restaurant")
+    parser.add_argument("--days", type=int, default=7, help="days of slots")
+    parser.add_argument("--reservations", type=int, default=20, help="per restaurant")
+    parser.add_argument("--customers", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--server", action="store_true", help="drive a local uvicorn")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="compare against an earlier results file")
+    args = parser.parse_args(argv)
+
+    from app.database import Base, engine
+    import app.main  # noqa: F401  registers every model on Base.metadata
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    dataset = generate(
+        engine,
+        restaurants=args.restaurants,
+        tables_per_restaurant=args.tables,
+        days=args.days,
+        reservations_per_restaurant=args.reservations,
+        customers=args.customers,
+        seed=args.seed,
+    )
+
+    samples, wall_seconds = asyncio.run(_run(args, dataset))
+    result = {
+        "commit": _git_commit(),
+        "timestamp": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+        "mode": "uvicorn" if args.server else "in-process",
+        "database": engine.dialect.name,
+        "parameters": {k: v for k, v in vars(args).items() if k not in ("output", "baseline")},
+        "dataset": dataset.counts,
+        "wall_seconds": round(wall_seconds, 3),
+        "routes": summarize(samples, wall_seconds),
+    }
+
+    print(f"{'route':<14}{'count':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}")
+    for route, stats in result["routes"].items():
+        print(
+            f"{route:<14}{stats['count']:>7}{stats['errors']:>8}{stats['p50_ms']:>10.2f}"
+            f"{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}{stats['throughput_rps']:>10.1f}"
+        )
+    if args.baseline:
+        with open(args.baseline) as f:
+            print("\n" + "\n".join(compare(result["routes"], json.load(f)["routes"])))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    return result
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,473 @@
+"""
+Deterministic synthetic data for benchmarks and scaling investigations.
+
+generate() fills an empty database with restaurants, their managers, tables,
+operating hours and reservation slots, a pool of customers, reservations and
+reviews, all derived from one random seed. Rows are streamed restaurant by
+restaurant into per-table batches and written with executemany INSERTs (COPY
+on PostgreSQL) against the Base.metadata tables. Every row carries an
+explicit primary key, so nothing is read back while seeding and memory stays
+flat however large the dataset.
+
+Popularity is skewed: the restaurant with popularity rank k gets a share of
+reservations and reviews proportional to 1 / k**skew, which reproduces the
+hot restaurants and long tail that uniform fixtures hide. The data is
+internally consistent: bookings never overlap on a table, slot counters are
+net of confirmed future bookings, and the review aggregate columns match the
+reviews written.
+
+From the command line (DATABASE_URL selects the database, whose tables are
+dropped and recreated):
+
+    python -m benchmarks.dataset --scale large
+    python -m benchmarks.dataset --restaurants 5000 --reservations 400000 --skew 1.2
+"""
+import argparse
+import csv
+import io
+import logging
+import random
+import time as clock
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.models.CustomerModel import Customer
+from app.models.CustomerReviewModel import Review
+from app.models.OperatingHoursModel import OperatingHours
+from app.models.ReservationModel import Reservation, ReservationStatus
+from app.models.ReservationSlotModel import ReservationSlot
+from app.models.RestaurantManagerModel import RestaurantManager
+from app.models.RestaurantModel import CuisineType, Restaurant
+from app.models.TableModel import Table
+from app.models.UserModel import User, UserRole
+from app.schemas.OperatingHoursSchema import DayOfWeek
+from app.services import confirmation_codes, geo, geocoding
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 5000
+
+_GEOCODER = geocoding.OfflineGeocoder()
+
+CITIES = [
+    ("San Jose", "CA", "951"),
+    ("San Francisco", "CA", "941"),
+    ("Oakland", "CA", "946"),
+    ("Seattle", "WA", "981"),
+    ("Portland", "OR", "972"),
+    ("Austin", "TX", "787"),
+    ("Chicago", "IL", "606"),
+    ("New York", "NY", "100"),
+]
+STREETS = ["Main St", "Oak Ave", "Market St", "1st St", "Park Blvd", "Lake Dr"]
+NAME_WORDS = ["Golden", "Little", "Blue", "Garden", "Corner", "Harbor", "Olive", "Spice"]
+NAME_NOUNS = ["Kitchen", "Bistro", "House", "Table", "Grill", "Cafe", "Diner", "Room"]
+TABLE_SIZES = [2, 2, 4, 4, 4, 6, 8]
+COMMENTS = [None, "Great food", "Slow service", "Lovely atmosphere", "Would come back"]
+
+# Dinner service: 17:00 to 21:30 every 30 minutes
+SLOT_TIMES = [time(17 + i // 2, 30 * (i % 2)) for i in range(10)]
+# Start times 90 minutes apart, so one table can take a booking at each
+TURNS = [time(17, 0), time(18, 30), time(20, 0), time(21, 30)]
+OPENING, CLOSING = time(11, 0), time(23, 0)
+
+# Share of past bookings that were cancelled instead of completed
+PAST_CANCEL_RATE = 0.15
+
+SCALES = {
+    "small": dict(restaurants=50, customers=200, reservations=1_000, reviews=500),
+    "medium": dict(restaurants=5_000, customers=50_000, reservations=200_000, reviews=100_000),
+    "large": dict(restaurants=100_000, customers=500_000, reservations=3_000_000,
+                  reviews=2_000_000, days=2),
+}
+
+# Parents before children, so batches can be flushed in this order
+MODELS = [
+    User,
+    RestaurantManager,
+    Customer,
+    Restaurant,
+    Table,
+    OperatingHours,
+    ReservationSlot,
+    Reservation,
+    Review,
+]
+
+
+@dataclass
+class Dataset:
+    """What a workload needs to know about the generated rows."""
+
+    start_date: date
+    days: int
+    cities: List[str]
+    restaurant_ids: List[int]
+    # restaurant_id -> [(table_id, capacity)]; empty unless requested
+    tables: Dict[int, List[Tuple[int, int]]] = field(default_factory=dict)
+    customer_user_ids: List[int] = field(default_factory=list)
+    counts: Dict[str, int] = field(default_factory=dict)
+
+    def slot_times(self) -> List[datetime]:
+        return [
+            datetime.combine(self.start_date + timedelta(days=d), t)
+            for d in range(self.days)
+            for t in SLOT_TIMES
+        ]
+
+
+def _copy_value(value):
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if hasattr(value, "name") and hasattr(value, "value"):
+        return value.name  # Enum columns store member names
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    return value
+
+
+def _copy(connection, table, rows: List[dict]) -> None:
+    """PostgreSQL COPY FROM STDIN of ``rows`` as CSV."""
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(_copy_value(row[c]) for c in columns)
+    buffer.seek(0)
+    cursor = connection.connection.driver_connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table.name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+class BatchWriter:
+    """Buffers rows per model and writes every buffer, parents first, when one fills."""
+
+    def __init__(self, connection, batch_size: int = BATCH_SIZE):
+        self.connection = connection
+        self.batch_size = batch_size
+        self.use_copy = connection.dialect.name == "postgresql"
+        self.buffers: Dict[type, List[dict]] = {model: [] for model in MODELS}
+        self.counts: Dict[str, int] = {model.__tablename__: 0 for model in MODELS}
+
+    def add(self, model, row: dict) -> None:
+        buffer = self.buffers[model]
+        buffer.append(row)
+        if len(buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        for model, rows in self.buffers.items():
+            if not rows:
+                continue
+            if self.use_copy:
+                _copy(self.connection, model.__table__, rows)
+            else:
+                self.connection.execute(model.__table__.insert(), rows)
+            self.counts[model.__tablename__] += len(rows)
+            rows.clear()
+
+
+def _reset_sequences(connection) -> None:
+    """Explicit ids leave PostgreSQL sequences behind; move them past the data."""
+    if connection.dialect.name != "postgresql":
+        return
+    for model in MODELS:
+        table = model.__table__
+        pk = list(table.primary_key.columns)[0].name
+        connection.execute(
+            text(
+                f"SELECT setval(pg_get_serial_sequence('{table.name}', '{pk}'), "
+                f"COALESCE((SELECT MAX({pk}) FROM {table.name}), 1))"
+            )
+        )
+
+
+def allocate(total: int, count: int, skew: float) -> List[int]:
+    """
+    Split ``total`` over ``count`` ranks in proportion to 1 / rank**skew,
+    using largest remainders so the parts add up exactly.
+    """
+    if count == 0:
+        return []
+    weights = [1 / (rank ** skew) for rank in range(1, count + 1)]
+    scale = total / sum(weights)
+    shares = [w * scale for w in weights]
+    parts = [int(s) for s in shares]
+    by_remainder = sorted(range(count), key=lambda i: parts[i] - shares[i])
+    for i in by_remainder[: total - sum(parts)]:
+        parts[i] += 1
+    return parts
+
+
+def _rating(rng: random.Random, quality: float) -> int:
+    return min(5, max(1, round(rng.gauss(quality, 0.9))))
+
+
+def generate(
+    engine: Engine,
+    restaurants: int = 50,
+    tables_per_restaurant: int = 8,
+    days: int = 7,
+    reservations_per_restaurant: int = 20,
+    customers: int = 200,
+    seed: int = 42,
+    start_date: Optional[date] = None,
+    history_days: int = 0,
+    reviews_per_restaurant: float = 0,
+    skew: float = 0.0,
+    describe_tables: bool = True,
+    batch_size: int = BATCH_SIZE,
+) -> Dataset:
+    """
+    Seed an empty database and describe what was written.
+
+    Reservations fall on the ``days`` days with slots starting at
+    ``start_date`` (default tomorrow) and, when ``history_days`` is set, on
+    that many days before it. ``skew`` 0 spreads reservations and reviews
+    evenly; around 1 gives a realistic long tail.
+    """
+    rng = random.Random(seed)
+    start_date = start_date or date.today() + timedelta(days=1)
+    first_day = start_date - timedelta(days=history_days)
+    total_days = history_days + days
+    now = datetime.utcnow()
+
+    # Popularity ranks are shuffled so that popular restaurants do not
+    # simply have the lowest ids
+    ranks = list(range(restaurants))
+    rng.shuffle(ranks)
+    reservation_parts = allocate(
+        round(restaurants * reservations_per_restaurant), restaurants, skew
+    )
+    review_parts = allocate(round(restaurants * reviews_per_restaurant), restaurants, skew)
+
+    cities = set()
+    tables: Dict[int, List[Tuple[int, int]]] = {}
+    cuisines = list(CuisineType)
+    reservation_id = review_id = capped = 0
+
+    with engine.begin() as connection:
+        writer = BatchWriter(connection, batch_size)
+
+        customer_user_ids = []
+        for i in range(1, customers + 1):
+            user_id = restaurants + i
+            customer_user_ids.append(user_id)
+            writer.add(User, dict(
+                user_id=user_id, email=f"customer{i}@bench.example", password_hash="x",
+                first_name="Customer", last_name=str(i), role=UserRole.CUSTOMER,
+                created_at=now, updated_at=now,
+            ))
+            writer.add(Customer, dict(customer_id=i, user_id=user_id))
+
+        for r in range(1, restaurants + 1):
+            writer.add(User, dict(
+                user_id=r, email=f"manager{r}@bench.example", password_hash="x",
+                first_name="Manager", last_name=str(r), role=UserRole.RESTAURANT_MANAGER,
+                created_at=now, updated_at=now,
+            ))
+            writer.add(RestaurantManager, dict(manager_id=r, user_id=r, approved_at=now))
+
+            city, state, zip_prefix = rng.choice(CITIES)
+            cities.add(city)
+            restaurant = dict(
+                restaurant_id=r,
+                manager_id=r,
+                name=f"{rng.choice(NAME_WORDS)} {rng.choice(NAME_NOUNS)} {r}",
+                description="Benchmark restaurant",
+                address_line1=f"{rng.randint(1, 9999)} {rng.choice(STREETS)}",
+                city=city,
+                state=state,
+                zip_code=f"{zip_prefix}{rng.randint(0, 99):02d}",
+                phone_number=f"555-{rng.randint(0, 9999):04d}",
+                email=f"restaurant{r}@bench.example",
+                cuisine_type=rng.choice(cuisines),
+                cost_rating=rng.randint(1, 4),
+                is_approved=True,
+                approved_at=now,
+                created_at=now,
+                updated_at=now,
+            )
+            # Always the offline geocoder: every CITIES entry is one it knows
+            latitude, longitude = _GEOCODER.geocode(restaurant)
+            restaurant.update(
+                latitude=latitude,
+                longitude=longitude,
+                geohash=geo.encode(latitude, longitude),
+            )
+
+            # Reviews, and the aggregate columns that summarize them
+            quality = rng.uniform(2.5, 4.8)
+            histogram = [0] * 5
+            for _ in range(review_parts[ranks[r - 1]]):
+                review_id += 1
+                rating = _rating(rng, quality)
+                histogram[rating - 1] += 1
+                writer.add(Review, dict(
+                    review_id=review_id,
+                    customer_id=rng.randint(1, customers),
+                    restaurant_id=r,
+                    rating=rating,
+                    comment=rng.choice(COMMENTS),
+                    created_at=now,
+                    updated_at=now,
+                ))
+            review_count = sum(histogram)
+            rating_sum = sum(star * n for star, n in zip(range(1, 6), histogram))
+            restaurant.update(
+                review_count=review_count,
+                rating_sum=rating_sum,
+                avg_rating=rating_sum / review_count if review_count else 0.0,
+                **{f"rating_{star}_count": n for star, n in zip(range(1, 6), histogram)},
+            )
+            writer.add(Restaurant, restaurant)
+
+            restaurant_tables = []
+            for n in range(tables_per_restaurant):
+                table_id = (r - 1) * tables_per_restaurant + n + 1
+                capacity = rng.choice(TABLE_SIZES)
+                restaurant_tables.append((table_id, capacity))
+                writer.add(Table, dict(
+                    table_id=table_id, restaurant_id=r, capacity=capacity,
+                    table_number=f"T{n + 1}", is_active=True,
+                ))
+            if describe_tables:
+                tables[r] = restaurant_tables
+            for d, day in enumerate(DayOfWeek):
+                writer.add(OperatingHours, dict(
+                    hours_id=(r - 1) * 7 + d + 1, restaurant_id=r, day_of_week=day,
+                    opening_time=OPENING, closing_time=CLOSING,
+                ))
+
+            # Reservations on distinct (table, day, turn) cells, so no two
+            # overlap on a table
+            cells = tables_per_restaurant * total_days * len(TURNS)
+            wanted = min(reservation_parts[ranks[r - 1]], cells)
+            capped += reservation_parts[ranks[r - 1]] - wanted
+            booked: Dict[datetime, int] = {}
+            for cell in sorted(rng.sample(range(cells), wanted)):
+                table_index, rest = divmod(cell, total_days * len(TURNS))
+                day, turn = divmod(rest, len(TURNS))
+                table_id, capacity = restaurant_tables[table_index]
+                slot_time = datetime.combine(first_day + timedelta(days=day), TURNS[turn])
+                if day < history_days:
+                    status = (
+                        ReservationStatus.CANCELLED
+                        if rng.random() < PAST_CANCEL_RATE
+                        else ReservationStatus.COMPLETED
+                    )
+                else:
+                    status = ReservationStatus.CONFIRMED
+                    booked[slot_time] = booked.get(slot_time, 0) + 1
+                reservation_id += 1
+                writer.add(Reservation, dict(
+                    reservation_id=reservation_id,
+                    customer_id=rng.randint(1, customers),
+                    restaurant_id=r,
+                    table_id=table_id,
+                    reservation_time=slot_time,
+                    party_size=rng.randint(1, capacity),
+                    status=status,
+                    confirmation_code=confirmation_codes.encode(reservation_id),
+                    created_at=now,
+                    updated_at=now,
+                ))
+
+            for d in range(days):
+                for t in SLOT_TIMES:
+                    slot_time = datetime.combine(start_date + timedelta(days=d), t)
+                    writer.add(ReservationSlot, dict(
+                        slot_id=((r - 1) * days + d) * len(SLOT_TIMES)
+                        + SLOT_TIMES.index(t) + 1,
+                        restaurant_id=r,
+                        slot_time=slot_time,
+                        available_tables=max(
+                            tables_per_restaurant - booked.get(slot_time, 0), 0
+                        ),
+                        is_active=True,
+                    ))
+
+        writer.flush()
+        _reset_sequences(connection)
+
+    if capped:
+        logger.warning(
+            f"{capped} reservations did not fit on fully booked restaurants; "
+            "add tables, days or history days, or lower the skew"
+        )
+
+    return Dataset(
+        start_date=start_date,
+        days=days,
+        cities=sorted(cities),
+        restaurant_ids=list(range(1, restaurants + 1)),
+        tables=tables,
+        customer_user_ids=customer_user_ids,
+        counts=writer.counts,
+    )
+
+
+def main(argv: Optional[Iterable[str]] = None) -> Dataset:
+    parser = argparse.ArgumentParser(
+        description="Generate a deterministic synthetic dataset."
+    )
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+    parser.add_argument("--restaurants", type=int)
+    parser.add_argument("--customers", type=int)
+    parser.add_argument("--reservations", type=int, help="total reservations")
+    parser.add_argument("--reviews", type=int, help="total reviews")
+    parser.add_argument("--tables", type=int, default=8, help="tables per restaurant")
+    parser.add_argument("--days", type=int, help="days of slots from tomorrow (default 7)")
+    parser.add_argument("--history-days", type=int, default=90)
+    parser.add_argument("--skew", type=float, default=0.8)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    settings = dict(SCALES[args.scale])
+    for key in ("restaurants", "customers", "reservations", "reviews", "days"):
+        if getattr(args, key) is not None:
+            settings[key] = getattr(args, key)
+
+    from app.database import Base, engine
+    import app.main  # noqa: F401  registers every model on Base.metadata
+
+    logging.basicConfig(level=logging.INFO)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    started = clock.perf_counter()
+    restaurants = settings["restaurants"]
+    dataset = generate(
+        engine,
+        restaurants=restaurants,
+        tables_per_restaurant=args.tables,
+        days=settings.get("days", 7),
+        reservations_per_restaurant=settings["reservations"] / restaurants,
+        customers=settings["customers"],
+        seed=args.seed,
+        history_days=args.history_days,
+        reviews_per_restaurant=settings["reviews"] / restaurants,
+        skew=args.skew,
+        describe_tables=False,
+        batch_size=args.batch_size,
+    )
+    elapsed = clock.perf_counter() - started
+    for table, count in dataset.counts.items():
+        logger.info(f"{table:<22}{count:>12,}")
+    logger.info(f"Generated {sum(dataset.counts.values()):,} rows in {elapsed:.1f}s")
+    return dataset
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,8 @@ from app.models import (
     AdminModel,
     CustomerModel,
     CustomerReviewModel,
+    EmailOutboxModel,
+    IdempotencyKeyModel,
     OperatingHoursModel,
     ReservationModel,
     ReservationSlotModel,
@@ -0,0 +1,59 @@
+import os
+import sys
+import logging
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Add the parent directory to Python path
+parent_dir = str(Path(__file__).parent.parent)
+sys.path.append(parent_dir)
+
+# Load environment variables
+load_dotenv(os.path.join(parent_dir, '.env'))
+
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.exc import SQLAlchemyError
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+if not DATABASE_URL:
+    logger.error("DATABASE_URL not found in environment variables")
+    sys.exit(1)
+
+
+def create_table(connection):
+    """Create the idempotency_keys table with its indexes"""
+    from app.models.IdempotencyKeyModel import IdempotencyKey
+
+    if inspect(connection).has_table(IdempotencyKey.__tablename__):
+        logger.info(f"Table {IdempotencyKey.__tablename__} already exists")
+        return
+    IdempotencyKey.__table__.create(connection)
+    logger.info(f"Created table {IdempotencyKey.__tablename__}")
+
+
+def migrate():
+    logger.info("Starting migration process")
+    engine = create_engine(DATABASE_URL)
+    try:
+        with engine.connect() as connection:
+            create_table(connection)
+            connection.commit()
+            logger.info("Migration completed successfully!")
+    except SQLAlchemyError as e:
+        logger.error(f"Migration failed: {str(e)}")
+        raise
+
+
+if __name__ == "__main__":
+    try:
+        migrate()
+    except Exception as e:
+        logger.error(f"Migration script failed: {str(e)}")
+        sys.exit(1)
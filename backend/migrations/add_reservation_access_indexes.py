@@ -0,0 +1,65 @@
+import os
+import sys
+import logging
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Add the parent directory to Python path
+parent_dir = str(Path(__file__).parent.parent)
+sys.path.append(parent_dir)
+
+# Load environment variables
+load_dotenv(os.path.join(parent_dir, '.env'))
+
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.sql import text
+from sqlalchemy.exc import SQLAlchemyError
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+if not DATABASE_URL:
+    logger.error("DATABASE_URL not found in environment variables")
+    sys.exit(1)
+
+INDEXES = {
+    "ix_reservations_customer_time": "customer_id, reservation_time",
+    "ix_reservations_restaurant_time": "restaurant_id, reservation_time",
+}
+
+
+def add_indexes(connection):
+    """Create the composite indexes behind the customer and manager reservation lists"""
+    existing = {ix["name"] for ix in inspect(connection).get_indexes("reservations")}
+    for index_name, columns in INDEXES.items():
+        if index_name in existing:
+            logger.info(f"Index {index_name} already exists")
+            continue
+        connection.execute(text(f"CREATE INDEX {index_name} ON reservations ({columns})"))
+        logger.info(f"Created index {index_name}")
+
+
+def migrate():
+    logger.info("Starting migration process")
+    engine = create_engine(DATABASE_URL)
+    try:
+        with engine.connect() as connection:
+            add_indexes(connection)
+            connection.commit()
+            logger.info("Migration completed successfully!")
+    except SQLAlchemyError as e:
+        logger.error(f"Migration failed: {str(e)}")
+        raise
+
+
+if __name__ == "__main__":
+    try:
+        migrate()
+    except Exception as e:
+        logger.error(f"Migration script failed: {str(e)}")
+        sys.exit(1)
@@ -0,0 +1,119 @@
+import os
+import sys
+import logging
+from pathlib import Path
+from types import SimpleNamespace
+from dotenv import load_dotenv
+
+# Add the parent directory to Python path
+parent_dir = str(Path(__file__).parent.parent)
+sys.path.append(parent_dir)
+
+# Load environment variables
+load_dotenv(os.path.join(parent_dir, '.env'))
+
+from sqlalchemy import create_engine, inspect, select
+from sqlalchemy.sql import text
+from sqlalchemy.exc import SQLAlchemyError
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+if not DATABASE_URL:
+    logger.error("DATABASE_URL not found in environment variables")
+    sys.exit(1)
+
+COLUMNS = {
+    "latitude": "FLOAT",
+    "longitude": "FLOAT",
+    "geohash": "VARCHAR(12)",
+}
+INDEX_NAME = "ix_restaurants_geohash"
+# Restaurants geocoded per transaction during the backfill
+BATCH_SIZE = 100
+
+
+def add_columns(connection):
+    """Add the coordinate and geohash bucket columns to the restaurants table"""
+    existing = {column["name"] for column in inspect(connection).get_columns("restaurants")}
+    for column_name, column_type in COLUMNS.items():
+        if column_name in existing:
+            logger.info(f"Column {column_name} already exists")
+            continue
+        connection.execute(text(f"ALTER TABLE restaurants ADD COLUMN {column_name} {column_type}"))
+        logger.info(f"Successfully added {column_name} column")
+
+    indexes = {ix["name"] for ix in inspect(connection).get_indexes("restaurants")}
+    if INDEX_NAME in indexes:
+        logger.info(f"Index {INDEX_NAME} already exists")
+    else:
+        connection.execute(text(f"CREATE INDEX {INDEX_NAME} ON restaurants (geohash)"))
+        logger.info(f"Created index {INDEX_NAME}")
+
+
+def backfill(connection):
+    """
+    Geocode every restaurant that has no geohash yet with the configured
+    GEOCODER, committing every BATCH_SIZE restaurants so an interrupted run
+    keeps its progress. Nominatim is queried at most once per second.
+    """
+    from app.models.RestaurantModel import Restaurant
+    from app.services import geocoding
+
+    table = Restaurant.__table__
+    rows = connection.execute(
+        select(
+            table.c.restaurant_id,
+            table.c.latitude,
+            table.c.longitude,
+            *(table.c[field] for field in geocoding.ADDRESS_FIELDS),
+        ).where(table.c.geohash.is_(None))
+    ).all()
+    located = 0
+    for start in range(0, len(rows), BATCH_SIZE):
+        for row in rows[start:start + BATCH_SIZE]:
+            restaurant = SimpleNamespace(**row._asdict())
+            geocoding.locate(restaurant)
+            if restaurant.geohash is None:
+                continue
+            connection.execute(
+                table.update()
+                .where(table.c.restaurant_id == row.restaurant_id)
+                .values(
+                    latitude=restaurant.latitude,
+                    longitude=restaurant.longitude,
+                    geohash=restaurant.geohash,
+                )
+            )
+            located += 1
+        connection.commit()
+        logger.info(f"Geocoded {located} of {min(start + BATCH_SIZE, len(rows))} so far")
+    logger.info(f"Geocoded {located} of {len(rows)} restaurants without a location")
+
+
+def migrate():
+    logger.info("Starting migration process")
+    engine = create_engine(DATABASE_URL)
+    try:
+        with engine.connect() as connection:
+            add_columns(connection)
+            connection.commit()
+            backfill(connection)
+            connection.commit()
+            logger.info("Migration completed successfully!")
+    except SQLAlchemyError as e:
+        logger.error(f"Migration failed: {str(e)}")
+        raise
+
+
+if __name__ == "__main__":
+    try:
+        migrate()
+    except Exception as e:
+        logger.error(f"Migration script failed: {str(e)}")
+        sys.exit(1)
@@ -0,0 +1,79 @@
+import os
+import sys
+import logging
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Add the parent directory to Python path
+parent_dir = str(Path(__file__).parent.parent)
+sys.path.append(parent_dir)
+
+# Load environment variables
+load_dotenv(os.path.join(parent_dir, '.env'))
+
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models.RestaurantModel import Restaurant
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+if not DATABASE_URL:
+    logger.error("DATABASE_URL not found in environment variables")
+    sys.exit(1)
+
+INDEX_NAMES = ("ix_restaurants_location_search", "ix_restaurants_text_search")
+
+
+def add_indexes(connection):
+    """
+    Create the full-text indexes behind restaurant search: FULLTEXT on
+    MySQL, GIN over the search tsvector on PostgreSQL. Other databases use
+    the in-process index in app/services/search_index.py and need nothing.
+
+    On MySQL, InnoDB skips words shorter than innodb_ft_min_token_size (3 by
+    default) and stopwords; search looks those up in the state and zip_code
+    columns instead, so the defaults can stay.
+    """
+    dialect = connection.dialect.name
+    if dialect not in ("mysql", "mariadb", "postgresql"):
+        logger.info(f"No full-text indexes needed on {dialect}")
+        return
+
+    existing = {ix["name"] for ix in inspect(connection).get_indexes("restaurants")}
+    for index in Restaurant.__table__.indexes:
+        if index.name not in INDEX_NAMES:
+            continue
+        if index.name in existing:
+            logger.info(f"Index {index.name} already exists")
+            continue
+        # Each name is declared once per dialect; create() skips the others
+        index.create(connection)
+    logger.info("Restaurant search indexes are in place")
+
+
+def migrate():
+    logger.info("Starting migration process")
+    engine = create_engine(DATABASE_URL)
+    try:
+        with engine.connect() as connection:
+            add_indexes(connection)
+            connection.commit()
+            logger.info("Migration completed successfully!")
+    except SQLAlchemyError as e:
+        logger.error(f"Migration failed: {str(e)}")
+        raise
+
+
+if __name__ == "__main__":
+    try:
+        migrate()
+    except Exception as e:
+        logger.error(f"Migration script failed: {str(e)}")
+        sys.exit(1)
@@ -0,0 +1,74 @@
+import os
+import sys
+import logging
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Add the parent directory to Python path
+parent_dir = str(Path(__file__).parent.parent)
+sys.path.append(parent_dir)
+
+# Load environment variables
+load_dotenv(os.path.join(parent_dir, '.env'))
+
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import text
+from sqlalchemy.exc import SQLAlchemyError
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+if not DATABASE_URL:
+    logger.error("DATABASE_URL not found in environment variables")
+    sys.exit(1)
+
+AGGREGATE_COLUMNS = ["review_count", "rating_sum"] + [
+    f"rating_{star}_count" for star in range(1, 6)
+]
+
+
+def add_columns(connection):
+    """Add the review aggregate columns to the restaurants table"""
+    existing = {column["name"] for column in inspect(connection).get_columns("restaurants")}
+    for column_name in AGGREGATE_COLUMNS:
+        if column_name in existing:
+            logger.info(f"Column {column_name} already exists")
+            continue
+        connection.execute(text(f"""
+            ALTER TABLE restaurants
+            ADD COLUMN {column_name} INTEGER NOT NULL DEFAULT 0
+        """))
+        logger.info(f"Successfully added {column_name} column")
+
+
+def migrate():
+    logger.info("Starting migration process")
+    engine = create_engine(DATABASE_URL)
+    try:
+        with engine.connect() as connection:
+            add_columns(connection)
+            connection.commit()
+
+        # Backfill from the existing reviews
+        from app.services.review_aggregates import rebuild
+
+        with Session(engine) as db:
+            logger.info(f"Rebuilt review aggregates for {rebuild(db)} restaurants")
+        logger.info("Migration completed successfully!")
+    except SQLAlchemyError as e:
+        logger.error(f"Migration failed: {str(e)}")
+        raise
+
+
+if __name__ == "__main__":
+    try:
+        migrate()
+    except Exception as e:
+        logger.error(f"Migration script failed: {str(e)}")
+        sys.exit(1)
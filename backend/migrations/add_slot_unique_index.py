@@ -0,0 +1,79 @@
+import os
+import sys
+import logging
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Add the parent directory to Python path
+parent_dir = str(Path(__file__).parent.parent)
+sys.path.append(parent_dir)
+
+# Load environment variables
+load_dotenv(os.path.join(parent_dir, '.env'))
+
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.sql import text
+from sqlalchemy.exc import SQLAlchemyError
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+if not DATABASE_URL:
+    logger.error("DATABASE_URL not found in environment variables")
+    sys.exit(1)
+
+INDEX_NAME = "uq_reservation_slots_restaurant_time"
+
+
+def remove_duplicate_slots(connection):
+    """Keep the oldest slot for each (restaurant_id, slot_time)"""
+    result = connection.execute(text("""
+        DELETE FROM reservation_slots
+        WHERE slot_id NOT IN (
+            SELECT keep_id FROM (
+                SELECT MIN(slot_id) AS keep_id
+                FROM reservation_slots
+                GROUP BY restaurant_id, slot_time
+            ) AS keepers
+        )
+    """))
+    logger.info(f"Removed {result.rowcount} duplicate slots")
+
+
+def add_index(connection):
+    """Create the unique (restaurant_id, slot_time) index"""
+    existing = {ix["name"] for ix in inspect(connection).get_indexes("reservation_slots")}
+    if INDEX_NAME in existing:
+        logger.info(f"Index {INDEX_NAME} already exists")
+        return
+    connection.execute(text(
+        f"CREATE UNIQUE INDEX {INDEX_NAME} ON reservation_slots (restaurant_id, slot_time)"
+    ))
+    logger.info(f"Created index {INDEX_NAME}")
+
+
+def migrate():
+    logger.info("Starting migration process")
+    engine = create_engine(DATABASE_URL)
+    try:
+        with engine.connect() as connection:
+            remove_duplicate_slots(connection)
+            add_index(connection)
+            connection.commit()
+            logger.info("Migration completed successfully!")
+    except SQLAlchemyError as e:
+        logger.error(f"Migration failed: {str(e)}")
+        raise
+
+
+if __name__ == "__main__":
+    try:
+        migrate()
+    except Exception as e:
+        logger.error(f"Migration script failed: {str(e)}")
+        sys.exit(1)
@@ -0,0 +1,80 @@
+import os
+import sys
+import logging
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Add the parent directory to Python path
+parent_dir = str(Path(__file__).parent.parent)
+sys.path.append(parent_dir)
+
+# Load environment variables
+load_dotenv(os.path.join(parent_dir, '.env'))
+
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.sql import text
+from sqlalchemy.exc import SQLAlchemyError
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s',
+)
+logger = logging.getLogger(__name__)
+
+DATABASE_URL = os.getenv("DATABASE_URL")
+if not DATABASE_URL:
+    logger.error("DATABASE_URL not found in environment variables")
+    sys.exit(1)
+
+INDEX_NAME = "ix_reservations_table_time"
+
+
+def add_index(connection):
+    """Create the (table_id, reservation_time) index used by the table inventory"""
+    existing = {ix["name"] for ix in inspect(connection).get_indexes("reservations")}
+    if INDEX_NAME in existing:
+        logger.info(f"Index {INDEX_NAME} already exists")
+        return
+    connection.execute(text(
+        f"CREATE INDEX {INDEX_NAME} ON reservations (table_id, reservation_time)"
+    ))
+    logger.info(f"Created index {INDEX_NAME}")
+
+
+def release_booking_locks(connection):
+    """
+    Bookings used to switch tables.is_active off until the reservation was
+    cancelled. Availability now comes from reservations, so re-enable tables
+    that were only switched off because of a confirmed reservation.
+    """
+    result = connection.execute(text("""
+        UPDATE tables SET is_active = 1
+        WHERE is_active = 0
+        AND table_id IN (
+            SELECT table_id FROM reservations WHERE status = 'CONFIRMED'
+        )
+    """))
+    logger.info(f"Re-enabled {result.rowcount} tables locked by bookings")
+
+
+def migrate():
+    logger.info("Starting migration process")
+    engine = create_engine(DATABASE_URL)
+    try:
+        with engine.connect() as connection:
+            add_index(connection)
+            release_booking_locks(connection)
+            connection.commit()
+            logger.info("Migration completed successfully!")
+    except SQLAlchemyError as e:
+        logger.error(f"Migration failed: {str(e)}")
+        raise
+
+
+if __name__ == "__main__":
+    try:
+        migrate()
+    except Exception as e:
+        logger.error(f"Migration script failed: {str(e)}")
+        sys.exit(1)
@@ -1,11 +1,25 @@
+import os
+
 import pytest # type: ignore
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from app.database import Base, get_db
+# Must be set before the app is imported
+os.environ.setdefault("CONFIRMATION_CODE_KEY", "test-confirmation-code-key")
+
+from app.auth.jwt_utils import create_access_token
+from app.database import Base, ThreadedSession, get_async_db, get_db
 from app.main import app
+from app.services import geocoding, idempotency, query_stats, restaurant_cache, search_index
+from app.models import (
+    CustomerModel,
+    RestaurantManagerModel,
+    RestaurantModel,
+    TableModel,
+    UserModel,
+)
 
 
 # Create an in-memory SQLite database for testing
@@ -18,6 +32,16 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Any request that issues more statements than this fails with
+# QueryBudgetExceeded
+query_stats.install(engine)
+query_stats.QUERY_BUDGET = 40
+query_stats.QUERY_BUDGET_RAISE = True
+
+# No network in tests; the default (GEOCODER=none) would leave every
+# restaurant without coordinates
+geocoding.geocoder = geocoding.OfflineGeocoder()
+
 
 @pytest.fixture(scope="function")
 def db_session():
@@ -51,7 +75,15 @@ def client(db_session):
         finally:
             pass
 
+    async def override_get_async_db():
+        yield ThreadedSession(db_session)
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    # Ids are reused across tests, so start every test with an empty cache
+    restaurant_cache.detail_cache.clear()
+    idempotency.store.cache.clear()
+    search_index.index.clear()
     
     with TestClient(app) as test_client:
         yield test_client
@@ -60,6 +92,24 @@ def client(db_session):
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(scope="function")
+def recorded_queries(monkeypatch):
+    """
+    The query_stats.QueryStats of every request the test makes, oldest
+    first, each keeping the statements it ran in ``executed``.
+    """
+    recorded = []
+    QueryStats = query_stats.QueryStats
+
+    def keeping_statements(*args, **kwargs):
+        stats = QueryStats(*args, keep_statements=True, **kwargs)
+        recorded.append(stats)
+        return stats
+
+    monkeypatch.setattr(query_stats, "QueryStats", keeping_statements)
+    return recorded
+
+
 @pytest.fixture(scope="function")
 def test_user(client):
     """
@@ -88,4 +138,70 @@ def auth_headers(client, test_user):
     assert response.status_code == 200
     
     token = response.json()["access_token"]
-    return {"Authorization": f"Bearer {token}"}
\ No newline at end of file
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture(scope="function")
+def seeded(db_session):
+    """
+    Seed one approved restaurant with a four-seat table, its manager and a
+    customer, and return ids plus auth headers for both users.
+    """
+    manager_user = UserModel.User(
+        email="manager@example.com",
+        password_hash="x",
+        first_name="Mia",
+        last_name="Manager",
+        role=UserModel.UserRole.RESTAURANT_MANAGER,
+    )
+    customer_user = UserModel.User(
+        email="customer@example.com",
+        password_hash="x",
+        first_name="Cal",
+        last_name="Customer",
+        role=UserModel.UserRole.CUSTOMER,
+    )
+    db_session.add_all([manager_user, customer_user])
+    db_session.flush()
+    manager = RestaurantManagerModel.RestaurantManager(user_id=manager_user.user_id)
+    customer = CustomerModel.Customer(user_id=customer_user.user_id)
+    db_session.add_all([manager, customer])
+    db_session.flush()
+    restaurant = RestaurantModel.Restaurant(
+        manager_id=manager.manager_id,
+        name="Test Restaurant",
+        address_line1="123 Test St",
+        city="San Jose",
+        state="CA",
+        zip_code="95112",
+        phone_number="123-456-7890",
+        email="restaurant@example.com",
+        cuisine_type=RestaurantModel.CuisineType.ITALIAN,
+        cost_rating=2,
+        is_approved=True,
+    )
+    db_session.add(restaurant)
+    db_session.flush()
+    table = TableModel.Table(
+        restaurant_id=restaurant.restaurant_id, capacity=4, table_number="T1"
+    )
+    db_session.add(table)
+    db_session.commit()
+
+    customer_token = create_access_token(
+        {"user_id": customer_user.user_id, "email": customer_user.email, "role": "customer"}
+    )
+    manager_token = create_access_token(
+        {
+            "user_id": manager_user.user_id,
+            "email": manager_user.email,
+            "role": "restaurant_manager",
+        }
+    )
+    return {
+        "manager_id": manager.manager_id,
+        "restaurant_id": restaurant.restaurant_id,
+        "table_id": table.table_id,
+        "headers": {"Authorization": f"Bearer {customer_token}"},
+        "manager_headers": {"Authorization": f"Bearer {manager_token}"},
+    }
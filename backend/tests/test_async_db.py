@@ -0,0 +1,146 @@
+import pytest
+
+from app.database import async_database_url, get_async_db
+from app.main import app
+from app.models import RestaurantModel, TableModel
+
+
+def test_async_database_url_swaps_driver():
+    assert (
+        async_database_url("mysql+pymysql://u:p@db:3306/booktable")
+        == "mysql+aiomysql://u:p@db:3306/booktable"
+    )
+    assert (
+        async_database_url("postgresql://u:p@db/booktable")
+        == "postgresql+asyncpg://u:p@db/booktable"
+    )
+    assert async_database_url("sqlite:///./test.db") == "sqlite+aiosqlite:///./test.db"
+
+
+def test_threaded_session_serves_ported_routes(client, seeded):
+    response = client.get(
+        f"/api/manager/restaurants/{seeded['restaurant_id']}/tables",
+        headers=seeded["manager_headers"],
+    )
+    assert response.status_code == 200
+    assert [t["table_number"] for t in response.json()["items"]] == ["T1"]
+
+
+@pytest.fixture
+def async_engine(client, db_session):
+    """Serve get_async_db routes from an aiosqlite engine, as DB_ASYNC=true does."""
+    pytest.importorskip("aiosqlite")
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    # NullPool closes each connection with its session, so nothing is left
+    # holding the SQLite file when the fixtures drop the tables
+    engine = create_async_engine(
+        async_database_url(str(db_session.bind.url)), poolclass=NullPool
+    )
+    AsyncSessionLocal = async_sessionmaker(
+        engine, autoflush=False, expire_on_commit=False
+    )
+
+    async def override_get_async_db():
+        async with AsyncSessionLocal() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    # Release the sync connection's read lock so the async writer can commit
+    db_session.rollback()
+    return engine
+
+
+def test_async_engine_serves_tables(client, db_session, seeded, async_engine):
+    url = f"/api/manager/restaurants/{seeded['restaurant_id']}/tables"
+    created = client.post(
+        url,
+        json={"tables": [{"capacity": 6, "table_number": "T2"}]},
+        headers=seeded["manager_headers"],
+    )
+    assert created.status_code == 201
+
+    listed = client.get(url, headers=seeded["manager_headers"])
+    assert [t["table_number"] for t in listed.json()["items"]] == ["T1", "T2"]
+    assert db_session.query(TableModel.Table).count() == 2
+
+
+def test_async_engine_serves_reviews(client, db_session, seeded, async_engine):
+    url = f"/api/restaurants/{seeded['restaurant_id']}/reviews"
+    created = client.post(
+        url, json={"rating": 4, "comment": "Good"}, headers=seeded["headers"]
+    )
+    assert created.status_code == 200
+    review_id = created.json()["review_id"]
+
+    updated = client.put(
+        f"/api/restaurants/reviews/{review_id}",
+        json={"rating": 2, "comment": "Worse"},
+        headers=seeded["headers"],
+    )
+    assert updated.status_code == 200
+
+    listed = client.get(url, headers=seeded["headers"])
+    assert [(r["rating"], r["comment"]) for r in listed.json()["items"]] == [(2, "Worse")]
+    restaurant = db_session.get(RestaurantModel.Restaurant, seeded["restaurant_id"])
+    assert (restaurant.review_count, restaurant.rating_sum) == (1, 2)
+    db_session.rollback()
+
+    deleted = client.delete(f"/api/restaurants/reviews/{review_id}", headers=seeded["headers"])
+    assert deleted.status_code == 200
+    assert client.get(url, headers=seeded["headers"]).json()["items"] == []
+
+
+def test_async_engine_serves_operating_hours_and_slots(client, seeded, async_engine):
+    base = f"/api/manager/restaurants/{seeded['restaurant_id']}"
+    headers = seeded["manager_headers"]
+    created = client.post(
+        f"{base}/hours",
+        json={
+            "operating_hours": [
+                {"day_of_week": "monday", "opening_time": "18:00", "closing_time": "21:00"}
+            ]
+        },
+        headers=headers,
+    )
+    assert created.status_code == 200
+    hours = client.get(f"{base}/hours", headers=headers).json()
+    assert [(h["day_of_week"], h["opening_time"]) for h in hours] == [("monday", "18:00:00")]
+
+    # 2030-03-18 is a Monday
+    generated = client.post(
+        f"{base}/slots/generate",
+        json={"start_date": "2030-03-18", "end_date": "2030-03-18", "interval_minutes": 60},
+        headers=headers,
+    )
+    assert generated.status_code == 201
+    assert generated.json() == {"slots": 2, "available_tables": 1}
+
+    slots = client.get(f"{base}/slots", headers=headers).json()["items"]
+    assert [s["slot_time"] for s in slots] == ["2030-03-18T18:00:00", "2030-03-18T19:00:00"]
+    moved = client.put(
+        f"{base}/slots/{slots[1]['slot_id']}",
+        json={"slot_time": "2030-03-18T19:30:00", "available_tables": 0},
+        headers=headers,
+    )
+    assert moved.status_code == 200
+    assert moved.json()["available_tables"] == 0
+
+
+def test_async_engine_serves_photos(client, seeded, async_engine):
+    url = f"/api/manager/restaurants/{seeded['restaurant_id']}/photos"
+    headers = seeded["manager_headers"]
+    first = client.post(url, json={"url": "https://img/1.jpg", "display_order": 2}, headers=headers)
+    second = client.post(url, json={"url": "https://img/2.jpg", "display_order": 1}, headers=headers)
+    assert (first.status_code, second.status_code) == (201, 201)
+
+    updated = client.put(
+        f"{url}/{first.json()['photo_id']}", json={"caption": "Patio"}, headers=headers
+    )
+    assert updated.json()["caption"] == "Patio"
+    deleted = client.delete(f"{url}/{second.json()['photo_id']}", headers=headers)
+    assert deleted.status_code == 204
+
+    listed = client.get(url, headers=headers).json()
+    assert [(p["url"], p["caption"]) for p in listed] == [("https://img/1.jpg", "Patio")]
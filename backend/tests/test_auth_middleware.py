@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+from app.auth import auth_middleware
+from app.auth.auth_middleware import VerifiedTokenCache
+from app.auth.jwt_utils import create_access_token
+
+
+def _tables(client, seeded, headers):
+    return client.get(
+        f"/api/manager/restaurants/{seeded['restaurant_id']}/tables", headers=headers
+    )
+
+
+def test_rejects_missing_and_invalid_tokens(client, seeded):
+    response = _tables(client, seeded, {})
+    assert response.status_code == 403
+    assert response.json() == {"detail": "Not authenticated"}
+
+    response = _tables(client, seeded, {"Authorization": "Bearer not-a-jwt"})
+    assert response.status_code == 401
+
+    expired = create_access_token(
+        {"user_id": 1, "role": "restaurant_manager"}, timedelta(minutes=-1)
+    )
+    response = _tables(client, seeded, {"Authorization": f"Bearer {expired}"})
+    assert response.status_code == 401
+
+
+def test_public_paths_skip_auth(client):
+    assert client.get("/openapi.json").status_code == 200
+    # /api/login is public but /api/login/x is not an exact match
+    assert client.get("/api/login/x").status_code == 403
+
+
+def test_verified_tokens_are_served_from_cache(client, seeded, monkeypatch):
+    calls = []
+    verify = auth_middleware.verify_token
+
+    def counting_verify(token):
+        calls.append(token)
+        return verify(token)
+
+    monkeypatch.setattr(auth_middleware, "verify_token", counting_verify)
+    for _ in range(3):
+        assert _tables(client, seeded, seeded["manager_headers"]).status_code == 200
+    assert len(calls) <= 1
+
+
+def test_cache_honors_exp_and_bounds_size():
+    clock = [1000.0]
+    cache = VerifiedTokenCache(max_entries=2, clock=lambda: clock[0])
+    cache.put("a", {"user_id": 1, "exp": 1010})
+    cache.put("b", {"user_id": 2, "exp": 2000})
+    assert cache.get("a")["user_id"] == 1
+
+    cache.put("c", {"user_id": 3})
+    assert cache.get("b") is None  # least recently used
+    assert len(cache) == 2
+
+    clock[0] = 1010
+    assert cache.get("a") is None
+    assert cache.get("c")["user_id"] == 3
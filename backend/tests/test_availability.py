@@ -0,0 +1,70 @@
+import pytest
+from datetime import datetime
+
+from app.models import TableModel
+from app.models.ReservationSlotModel import ReservationSlot
+
+
+@pytest.fixture
+def slots(db_session, seeded):
+    db_session.add(
+        TableModel.Table(
+            restaurant_id=seeded["restaurant_id"], capacity=2, table_number="T2"
+        )
+    )
+    for slot_time in [
+        datetime(2030, 3, 20, 18, 0),
+        datetime(2030, 3, 20, 19, 0),
+        datetime(2030, 3, 21, 19, 0),
+    ]:
+        db_session.add(
+            ReservationSlot(
+                restaurant_id=seeded["restaurant_id"],
+                slot_time=slot_time,
+                available_tables=5,
+            )
+        )
+    db_session.commit()
+
+
+def _matrix(client, seeded, party_size, start="2030-03-20", end="2030-03-22"):
+    return client.get(
+        f"/api/restaurants/{seeded['restaurant_id']}/availability/matrix",
+        params={"from": start, "to": end, "party_size": party_size},
+        headers=seeded["headers"],
+    )
+
+
+def test_matrix_counts_tables_that_fit_party(client, seeded, slots):
+    response = _matrix(client, seeded, party_size=2)
+    assert response.status_code == 200
+    body = response.json()
+    assert body["days"] == ["2030-03-20", "2030-03-21", "2030-03-22"]
+    assert body["times"] == ["18:00:00", "19:00:00"]
+    assert body["capacity"] == [[2, 2], [None, 2], [None, None]]
+
+    # Only the four-seat table fits a party of three
+    assert _matrix(client, seeded, party_size=3).json()["capacity"][0] == [1, 1]
+
+
+def test_matrix_reflects_bookings(client, seeded, slots):
+    booked = client.post(
+        "/api/reservations",
+        json={
+            "restaurant_id": seeded["restaurant_id"],
+            "table_id": seeded["table_id"],
+            "reservation_time": "2030-03-20T19:00:00",
+            "party_size": 3,
+        },
+        headers=seeded["headers"],
+    )
+    assert booked.status_code == 201
+
+    # The 19:00 turn also overlaps the 18:00 slot
+    assert _matrix(client, seeded, party_size=3).json()["capacity"][0] == [0, 0]
+    assert _matrix(client, seeded, party_size=2).json()["capacity"][0] == [1, 1]
+
+
+def test_matrix_rejects_bad_range(client, seeded):
+    assert _matrix(client, seeded, 2, "2030-03-22", "2030-03-20").status_code == 400
+    assert _matrix(client, seeded, 2, "2030-01-01", "2030-03-01").status_code == 400
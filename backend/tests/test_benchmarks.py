@@ -0,0 +1,109 @@
+import asyncio
+from datetime import date
+
+import httpx
+
+from app.database import Base
+from app.main import app
+from app.models.ReservationModel import Reservation
+from app.models.ReservationSlotModel import ReservationSlot
+from app.models.RestaurantModel import Restaurant
+from app.services import review_aggregates
+from benchmarks.booking_flow import Workload, percentile, run_workload, summarize
+from benchmarks.dataset import allocate, generate
+
+
+def _generate(db_session, seed=7):
+    return generate(
+        db_session.get_bind(),
+        restaurants=3,
+        tables_per_restaurant=2,
+        days=2,
+        reservations_per_restaurant=3,
+        customers=4,
+        seed=seed,
+        start_date=date(2030, 3, 20),
+    )
+
+
+def _rows(db_session):
+    return [
+        (r.restaurant_id, r.table_id, r.reservation_time, r.confirmation_code)
+        for r in db_session.query(Reservation).order_by(Reservation.reservation_id)
+    ]
+
+
+def test_dataset_is_deterministic_and_consistent(db_session):
+    dataset = _generate(db_session)
+    assert dataset.counts["reservations"] == 9
+    assert dataset.counts["reservation_slots"] == 3 * 2 * 10
+    first = _rows(db_session)
+
+    # Slot counters already account for the seeded bookings
+    booked = sum(
+        2 - slot.available_tables for slot in db_session.query(ReservationSlot)
+    )
+    assert booked == len(first)
+
+    db_session.close()
+    Base.metadata.drop_all(bind=db_session.get_bind())
+    Base.metadata.create_all(bind=db_session.get_bind())
+    _generate(db_session)
+    assert _rows(db_session) == first
+
+
+def test_workload_runs_every_route(client, db_session):
+    dataset = _generate(db_session)
+    workload = Workload(dataset, seed=1)
+
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+            return await run_workload(c, workload, requests=60, concurrency=1)
+
+    samples = asyncio.run(run())
+    summary = summarize(samples, wall_seconds=1.0)
+    assert summary["all"]["count"] == 60
+    assert summary["all"]["errors"] == 0
+    assert {"search", "detail", "availability", "book"} <= set(summary)
+    assert summary["all"]["p50_ms"] <= summary["all"]["p99_ms"]
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([3.0], 95) == 3.0
+
+
+def test_skewed_dataset_keeps_review_aggregates_consistent(db_session):
+    assert allocate(10, 4, skew=0) == [3, 3, 2, 2]
+    assert sum(allocate(1000, 50, skew=1.1)) == 1000
+    assert allocate(1000, 50, skew=1.1)[0] > allocate(1000, 50, skew=1.1)[-1] * 10
+
+    generate(
+        db_session.get_bind(),
+        restaurants=6,
+        tables_per_restaurant=2,
+        days=1,
+        reservations_per_restaurant=5,
+        customers=10,
+        history_days=30,
+        reviews_per_restaurant=20,
+        skew=1.0,
+        batch_size=7,
+    )
+    generated = {
+        r.restaurant_id: (r.review_count, r.rating_sum, r.rating_histogram, r.avg_rating)
+        for r in db_session.query(Restaurant)
+    }
+    assert sum(count for count, *_ in generated.values()) == 120
+    assert db_session.query(Reservation).count() == 30
+
+    review_aggregates.rebuild(db_session)
+    db_session.expire_all()
+    rebuilt = {
+        r.restaurant_id: (r.review_count, r.rating_sum, r.rating_histogram, r.avg_rating)
+        for r in db_session.query(Restaurant)
+    }
+    assert rebuilt == generated
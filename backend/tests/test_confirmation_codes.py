@@ -0,0 +1,86 @@
+from app.models.ReservationModel import Reservation
+from app.services import confirmation_codes
+
+
+def test_codes_are_unique_and_round_trip():
+    codes = {confirmation_codes.encode(n) for n in range(1, 5001)}
+    assert len(codes) == 5000
+    for n in (1, 2, 4999, 2**40 - 1):
+        code = confirmation_codes.encode(n)
+        assert len(code) == 10
+        assert confirmation_codes.decode(code) == n
+        assert confirmation_codes.decode(code.lower()) == n
+    # Another key gives unrelated codes
+    assert confirmation_codes.encode(1, key=b"other") != confirmation_codes.encode(1)
+
+
+def test_decode_rejects_typos():
+    code = confirmation_codes.encode(42)
+    swapped = code[1] + code[0] + code[2:] if code[0] != code[1] else code[::-1]
+    assert confirmation_codes.decode(swapped) is None
+    assert confirmation_codes.decode(code[:-1]) is None
+    assert confirmation_codes.decode("U" * 10) is None
+
+
+def test_lookup_by_code(client, db_session, seeded):
+    booked = client.post(
+        "/api/reservations",
+        json={
+            "restaurant_id": seeded["restaurant_id"],
+            "table_id": seeded["table_id"],
+            "reservation_time": "2030-03-20T19:00:00",
+            "party_size": 2,
+        },
+        headers=seeded["headers"],
+    )
+    assert booked.status_code == 201
+    code = booked.json()["confirmation_code"]
+    reservation = db_session.query(Reservation).one()
+    assert code == confirmation_codes.encode(reservation.reservation_id)
+
+    for headers in (seeded["headers"], seeded["manager_headers"]):
+        found = client.get(f"/api/reservations/by-code/{code.lower()}", headers=headers)
+        assert found.status_code == 200
+        assert found.json()["reservation_id"] == reservation.reservation_id
+        assert found.json()["restaurant_name"] == "Test Restaurant"
+
+    unknown = confirmation_codes.encode(reservation.reservation_id + 1)
+    response = client.get(f"/api/reservations/by-code/{unknown}", headers=seeded["headers"])
+    assert response.status_code == 404
+
+
+def test_lookup_finds_codes_that_fail_the_checksum(client, db_session, seeded):
+    booked = client.post(
+        "/api/reservations",
+        json={
+            "restaurant_id": seeded["restaurant_id"],
+            "table_id": seeded["table_id"],
+            "reservation_time": "2030-03-20T19:00:00",
+            "party_size": 2,
+        },
+        headers=seeded["headers"],
+    )
+    assert booked.status_code == 201
+    reservation = db_session.query(Reservation).one()
+    # A code from before ids were encoded, with letters normalize() would rewrite
+    legacy = "LOI7QZ2KXA"
+    assert confirmation_codes.decode(legacy) is None
+    reservation.confirmation_code = legacy
+    db_session.commit()
+
+    found = client.get(
+        f"/api/reservations/by-code/{legacy.lower()}", headers=seeded["headers"]
+    )
+    assert found.status_code == 200
+    assert found.json()["reservation_id"] == reservation.reservation_id
+
+    for bad in ("L0I7QZ2KXA", "short", "LOI7QZ2KX!"):
+        response = client.get(f"/api/reservations/by-code/{bad}", headers=seeded["headers"])
+        assert response.status_code == 404
+
+
+def test_candidates():
+    code = confirmation_codes.encode(7)
+    assert confirmation_codes.candidates(code.lower()) == [code]
+    assert confirmation_codes.candidates("loi7qz2kxa") == ["LOI7QZ2KXA"]
+    assert confirmation_codes.candidates("no-such") == []
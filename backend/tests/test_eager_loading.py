@@ -0,0 +1,84 @@
+from datetime import datetime, time
+
+from app.models import RestaurantModel, TableModel
+from app.models.CustomerReviewModel import Review
+from app.models.OperatingHoursModel import OperatingHours
+from app.models.PhotoModel import RestaurantPhoto
+from app.schemas.OperatingHoursSchema import DayOfWeek
+
+
+def _add_restaurants(db_session, seeded, count):
+    for i in range(count):
+        restaurant = RestaurantModel.Restaurant(
+            manager_id=seeded["manager_id"],
+            name=f"Extra {i}",
+            address_line1="1 Main St",
+            city="San Jose",
+            state="CA",
+            zip_code="95112",
+            phone_number="123-456-7890",
+            email=f"extra{i}@example.com",
+            cuisine_type=RestaurantModel.CuisineType.THAI,
+            cost_rating=1,
+            is_approved=True,
+        )
+        db_session.add(restaurant)
+        db_session.flush()
+        db_session.add_all(
+            [
+                RestaurantPhoto(restaurant_id=restaurant.restaurant_id, url="p.jpg"),
+                OperatingHours(
+                    restaurant_id=restaurant.restaurant_id,
+                    day_of_week=DayOfWeek.MONDAY,
+                    opening_time=time(9),
+                    closing_time=time(22),
+                ),
+                TableModel.Table(
+                    restaurant_id=restaurant.restaurant_id,
+                    capacity=2,
+                    table_number="A",
+                ),
+                Review(
+                    customer_id=1,
+                    restaurant_id=restaurant.restaurant_id,
+                    rating=4,
+                    created_at=datetime(2030, 1, 1),
+                ),
+            ]
+        )
+    db_session.commit()
+
+
+def _list_query_count(client, db_session, seeded, recorded_queries):
+    db_session.expunge_all()
+    response = client.get("/api/customer/restaurants", headers=seeded["headers"])
+    assert response.status_code == 200
+    return recorded_queries[-1].count, response.json()["items"]
+
+
+def test_list_query_count_does_not_grow_with_results(
+    client, db_session, seeded, recorded_queries
+):
+    _add_restaurants(db_session, seeded, 2)
+    small_count, items = _list_query_count(client, db_session, seeded, recorded_queries)
+    assert len(items) == 3
+
+    _add_restaurants(db_session, seeded, 8)
+    large_count, items = _list_query_count(client, db_session, seeded, recorded_queries)
+    assert len(items) == 11
+    assert items[-1]["photos"][0]["url"] == "p.jpg"
+    assert items[-1]["reviews"][0]["rating"] == 4
+
+    # One query for the page plus one per serialized collection
+    assert small_count == large_count == 5
+
+
+def test_detail_loads_collections_in_batches(client, db_session, seeded, recorded_queries):
+    _add_restaurants(db_session, seeded, 1)
+    db_session.expunge_all()
+    response = client.get(
+        f"/api/restaurants/{seeded['restaurant_id']}", headers=seeded["headers"]
+    )
+    assert response.status_code == 200
+    assert response.json()["tables"][0]["table_number"] == "T1"
+    assert recorded_queries[-1].count == 5
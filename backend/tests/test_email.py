@@ -1,10 +1,14 @@
+import smtplib
+
 import pytest
 from unittest.mock import patch, MagicMock
 from fastapi.testclient import TestClient
 from datetime import datetime
 from app.main import app
 from app.models import UserModel, RestaurantModel, ReservationModel
+from app.models.EmailOutboxModel import EmailOutbox, OutboxStatus
 from app.routes.email import send_email_notification
+from app.services import email_outbox
 
 client = TestClient(app)
 
@@ -110,4 +114,163 @@ def test_send_booking_confirmation_email_failure(mock_send_email, mock_db_sessio
     # Assertions
     assert response.status_code == 500
     assert response.json() == {"detail": "Failed to send email"}
-    mock_send_email.assert_called_once() 
\ No newline at end of file
+    mock_send_email.assert_called_once() 
+
+class FakeSMTP:
+    """Stand-in SMTP server that records what it was asked to do."""
+
+    instances = []
+
+    def __init__(self, host, port):
+        self.sent = []
+        self.logins = 0
+        self.fail_next = 0
+        FakeSMTP.instances.append(self)
+
+    def starttls(self):
+        pass
+
+    def login(self, username, password):
+        self.logins += 1
+
+    def send_message(self, msg):
+        if self.fail_next:
+            self.fail_next -= 1
+            raise smtplib.SMTPServerDisconnected("connection lost")
+        self.sent.append(msg)
+
+    def noop(self):
+        if self.fail_next:
+            raise smtplib.SMTPServerDisconnected("connection lost")
+        return 250, b"OK"
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def smtp_connection(monkeypatch):
+    monkeypatch.setenv("SMTP_USERNAME", "mailer")
+    FakeSMTP.instances = []
+    return email_outbox.SMTPConnection(smtp_factory=FakeSMTP)
+
+
+def test_booking_enqueues_confirmation_email(client, db_session, seeded):
+    response = client.post(
+        "/api/reservations",
+        json={
+            "restaurant_id": seeded["restaurant_id"],
+            "table_id": seeded["table_id"],
+            "reservation_time": "2030-03-20T19:00:00",
+            "party_size": 2,
+        },
+        headers=seeded["headers"],
+    )
+    assert response.status_code == 201
+
+    queued = db_session.query(EmailOutbox).all()
+    assert len(queued) == 1
+    assert queued[0].to_email == "customer@example.com"
+    assert response.json()["confirmation_code"] in queued[0].body
+    assert queued[0].status == OutboxStatus.PENDING
+
+
+def test_outbox_reuses_one_connection(db_session, smtp_connection):
+    for i in range(3):
+        email_outbox.enqueue_email(db_session, f"user{i}@example.com", "Hi", "<p>Hi</p>")
+    db_session.commit()
+
+    assert email_outbox.drain_once(db_session, smtp_connection) == 3
+
+    assert len(FakeSMTP.instances) == 1
+    assert FakeSMTP.instances[0].logins == 1
+    assert [m["To"] for m in FakeSMTP.instances[0].sent] == [
+        "user0@example.com",
+        "user1@example.com",
+        "user2@example.com",
+    ]
+    assert {m.status for m in db_session.query(EmailOutbox)} == {OutboxStatus.SENT}
+    assert email_outbox.drain_once(db_session, smtp_connection) == 0
+
+
+def test_outbox_retries_with_backoff_then_dead_letters(
+    db_session, smtp_connection, monkeypatch
+):
+    monkeypatch.setattr(email_outbox, "MAX_ATTEMPTS", 2)
+    message = email_outbox.enqueue_email(db_session, "a@example.com", "Hi", "<p>Hi</p>")
+    db_session.commit()
+
+    class AlwaysFails(FakeSMTP):
+        def send_message(self, msg):
+            raise smtplib.SMTPServerDisconnected("connection lost")
+
+    smtp_connection.smtp_factory = AlwaysFails
+    email_outbox.drain_once(db_session, smtp_connection)
+    assert message.status == OutboxStatus.PENDING
+    assert message.attempts == 1
+    assert message.next_attempt_at > datetime.utcnow()
+
+    # Not due yet
+    assert email_outbox.drain_once(db_session, smtp_connection) == 0
+
+    message.next_attempt_at = datetime.utcnow()
+    db_session.commit()
+    email_outbox.drain_once(db_session, smtp_connection)
+    assert message.status == OutboxStatus.DEAD
+    assert "connection lost" in message.last_error
+
+
+def test_outbox_replaces_a_dropped_connection_without_a_retry(
+    db_session, smtp_connection, monkeypatch
+):
+    first = email_outbox.enqueue_email(db_session, "a@example.com", "Hi", "<p>Hi</p>")
+    db_session.commit()
+    email_outbox.drain_once(db_session, smtp_connection)
+
+    # The server dropped the connection since the last batch; the send that
+    # finds out reconnects once instead of failing the message
+    FakeSMTP.instances[0].fail_next = 1
+    second = email_outbox.enqueue_email(db_session, "b@example.com", "Hi", "<p>Hi</p>")
+    db_session.commit()
+    email_outbox.drain_once(db_session, smtp_connection)
+    assert (second.status, second.attempts) == (OutboxStatus.SENT, 1)
+
+    # An idle connection is checked with NOOP before it is reused
+    monkeypatch.setattr(email_outbox, "SMTP_IDLE_SECONDS", 0)
+    FakeSMTP.instances[1].fail_next = 1
+    third = email_outbox.enqueue_email(db_session, "c@example.com", "Hi", "<p>Hi</p>")
+    db_session.commit()
+    email_outbox.drain_once(db_session, smtp_connection)
+    assert (third.status, third.attempts) == (OutboxStatus.SENT, 1)
+
+    assert [len(smtp.sent) for smtp in FakeSMTP.instances] == [1, 1, 1]
+    assert FakeSMTP.instances[1].fail_next == 1
+    assert first.status == OutboxStatus.SENT
+
+
+def test_outbox_sends_outside_the_claiming_transaction(db_session, smtp_connection):
+    for i in range(2):
+        email_outbox.enqueue_email(db_session, f"user{i}@example.com", "Hi", "<p>Hi</p>")
+    db_session.commit()
+
+    class WorkerDies(BaseException):
+        pass
+
+    class DiesAfterOne(FakeSMTP):
+        def send_message(self, msg):
+            # The claim committed, so no row locks are held while sending
+            assert not db_session.in_transaction()
+            if self.sent:
+                raise WorkerDies()
+            super().send_message(msg)
+
+    smtp_connection.smtp_factory = DiesAfterOne
+    with pytest.raises(WorkerDies):
+        email_outbox.drain_once(db_session, smtp_connection)
+
+    # Both rows stay claimed, so no other worker sends them meanwhile
+    db_session.rollback()
+    rows = db_session.query(EmailOutbox).order_by(EmailOutbox.outbox_id).all()
+    assert [(m.status, m.attempts) for m in rows] == [(OutboxStatus.PENDING, 1)] * 2
+    assert all(m.next_attempt_at > datetime.utcnow() for m in rows)
+    assert email_outbox.drain_once(db_session, smtp_connection) == 0
@@ -0,0 +1,189 @@
+import math
+import random
+from datetime import datetime
+
+import pytest
+from sqlalchemy import create_engine, literal, select
+
+from app.models.ReservationSlotModel import ReservationSlot
+from app.services import geo, geocoding
+
+
+def test_encode_matches_reference_geohash():
+    assert geo.encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    assert geo.encode(37.7749, -122.4194, 5) == "9q8yy"
+
+
+def _points_within(lat, lng, radius_km, count=500):
+    """Random points within the radius, by bearing and distance."""
+    rng = random.Random(7)
+    phi1, lambda1 = math.radians(lat), math.radians(lng)
+    for _ in range(count):
+        bearing = rng.uniform(0, 2 * math.pi)
+        angle = rng.uniform(0, radius_km) / geo.EARTH_RADIUS_KM
+        phi2 = math.asin(
+            math.sin(phi1) * math.cos(angle)
+            + math.cos(phi1) * math.sin(angle) * math.cos(bearing)
+        )
+        lambda2 = lambda1 + math.atan2(
+            math.sin(bearing) * math.sin(angle) * math.cos(phi1),
+            math.cos(angle) - math.sin(phi1) * math.sin(phi2),
+        )
+        yield math.degrees(phi2), (math.degrees(lambda2) + 540) % 360 - 180
+
+
+@pytest.mark.parametrize(
+    "lat, lng, radius_km",
+    [(37.7749, -122.4194, 2), (37.7749, -122.4194, 40), (64.1, -21.9, 10), (0.0, 179.99, 5)],
+)
+def test_covering_cells_contain_the_whole_circle(lat, lng, radius_km):
+    cells = geo.covering_cells(lat, lng, radius_km)
+    assert 1 <= len(cells) <= 9
+    for point in _points_within(lat, lng, radius_km):
+        assert geo.encode(*point).startswith(tuple(cells))
+
+
+@pytest.mark.parametrize(
+    "lat, lng, radius_km",
+    [(37.7749, -122.4194, 5), (-33.86, 151.2, 50), (0.0, 179.99, 20), (89.9, 0, 50)],
+)
+def test_box_filter_contains_the_whole_circle(lat, lng, radius_km):
+    inside = select(
+        *(
+            geo.box_filter(literal(p_lat), literal(p_lng), lat, lng, radius_km)
+            for p_lat, p_lng in _points_within(lat, lng, radius_km, count=200)
+        )
+    )
+    outside = geo.box_filter(literal(lat - 1), literal(lng), lat, lng, radius_km)
+    with create_engine("sqlite://").connect() as connection:
+        assert all(connection.execute(inside).one())
+        assert not connection.scalar(select(outside))
+
+
+def test_covering_cells_gives_up_on_huge_circles():
+    assert geo.covering_cells(89.9, 0, 50) == []
+    assert geo.covering_cells(0, 0, 6000) == []
+
+
+def test_offline_geocoder_is_deterministic_and_near_the_city():
+    address = {"address_line1": "1 Market St", "city": "San Francisco", "state": "CA"}
+    point = geocoding.OfflineGeocoder().geocode(address)
+    assert point == geocoding.OfflineGeocoder().geocode(dict(address))
+    assert geo.distance_km(*point, 37.7749, -122.4194) < 5
+    assert geocoding.OfflineGeocoder().geocode({"city": "Nowhere", "state": "ZZ"}) is None
+
+
+def test_nominatim_waits_a_second_between_requests(monkeypatch):
+    now, requests, sleeps = [100.0], [], []
+
+    class Response:
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return [{"lat": "37.7749", "lon": "-122.4194"}]
+
+    def fake_get(url, **kwargs):
+        requests.append(now[0])
+        return Response()
+
+    def fake_sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    monkeypatch.setattr(geocoding.httpx, "get", fake_get)
+    geocoder = geocoding.NominatimGeocoder(clock=lambda: now[0], sleep=fake_sleep)
+    address = {"city": "San Francisco", "state": "CA"}
+    geocoder.geocode(address)
+    now[0] += 0.25
+    geocoder.geocode(address)
+    now[0] += 3
+    geocoder.geocode(address)
+
+    assert sleeps == [0.75]
+    assert requests == [100.0, 101.0, 104.0]
+
+
+def _create(client, seeded, name, city, **fields):
+    response = client.post(
+        "/api/manager/restaurants",
+        json={
+            "name": name,
+            "address_line1": "1 Main St",
+            "city": city,
+            "state": "CA",
+            "zip_code": "94000",
+            "phone_number": "123-456-7890",
+            "email": "r@example.com",
+            "cuisine_type": "italian",
+            "cost_rating": 2,
+            **fields,
+        },
+        headers=seeded["manager_headers"],
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_create_and_update_geocode_the_address(client, seeded):
+    body = _create(client, seeded, "Located", "Oakland")
+    assert geo.distance_km(body["latitude"], body["longitude"], 37.8044, -122.2712) < 5
+
+    explicit = _create(client, seeded, "Pinned", "Oakland", latitude=37.8, longitude=-122.27)
+    assert (explicit["latitude"], explicit["longitude"]) == (37.8, -122.27)
+
+    response = client.put(
+        f"/api/manager/restaurants/{body['restaurant_id']}",
+        json={"city": "San Jose"},
+        headers=seeded["manager_headers"],
+    )
+    assert response.status_code == 200
+    moved = response.json()
+    assert geo.distance_km(moved["latitude"], moved["longitude"], 37.3382, -121.8863) < 5
+
+
+def test_without_a_geocoder_restaurants_stay_unlocated(client, seeded, monkeypatch):
+    monkeypatch.setattr(geocoding, "geocoder", geocoding.NoGeocoder())
+    body = _create(client, seeded, "Unlocated", "Oakland")
+    assert (body["latitude"], body["longitude"]) == (None, None)
+
+
+def test_search_near_prunes_by_bucket_and_sorts_by_distance(client, db_session, seeded):
+    # Union Square, the Ferry Building (about 1.5 km away) and Oakland (about 13 km)
+    ids = [
+        _create(client, seeded, name, "San Francisco", latitude=lat, longitude=lng)["restaurant_id"]
+        for name, lat, lng in [
+            ("Ferry", 37.7955, -122.3937),
+            ("Square", 37.7880, -122.4075),
+            ("Lake Merritt", 37.8024, -122.2588),
+        ]
+    ]
+    for restaurant_id in ids:
+        db_session.add(
+            ReservationSlot(
+                restaurant_id=restaurant_id,
+                slot_time=datetime(2030, 3, 20, 19, 0),
+                available_tables=1,
+            )
+        )
+    db_session.commit()
+
+    def near(point, radius):
+        response = client.get(
+            "/api/restaurants/search",
+            params={"reservation_date": "2030-03-20", "near": point, "radius": radius},
+            headers=seeded["headers"],
+        )
+        return [r["restaurant_id"] for r in response.json()] if response.status_code == 200 else []
+
+    assert near("37.7880,-122.4075", 3) == [ids[1], ids[0]]
+    assert near("37.7955,-122.3937", 20) == [ids[0], ids[1], ids[2]]
+    assert near("37.8024,-122.2588", 1) == [ids[2]]
+
+    response = client.get(
+        "/api/restaurants/search",
+        params={"reservation_date": "2030-03-20", "near": "north pole"},
+        headers=seeded["headers"],
+    )
+    assert response.status_code == 400
+
@@ -0,0 +1,148 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from app.database import get_db
+from app.main import app
+from app.models.EmailOutboxModel import EmailOutbox
+from app.models.IdempotencyKeyModel import IdempotencyKey
+from app.models.ReservationModel import Reservation
+from app.services import idempotency
+
+
+def _book(client, seeded, key, party_size=2):
+    return client.post(
+        "/api/reservations",
+        json={
+            "restaurant_id": seeded["restaurant_id"],
+            "table_id": seeded["table_id"],
+            "reservation_time": "2030-03-20T19:00:00",
+            "party_size": party_size,
+        },
+        headers={**seeded["headers"], "Idempotency-Key": key},
+    )
+
+
+def test_retry_replays_stored_response(client, db_session, seeded):
+    first = _book(client, seeded, "retry-1")
+    assert first.status_code == 201
+    assert "Idempotent-Replayed" not in first.headers
+
+    retry = _book(client, seeded, "retry-1")
+    assert retry.status_code == 201
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert retry.content == first.content
+
+    # Served from the database once the front cache is gone
+    idempotency.store.cache.clear()
+    assert _book(client, seeded, "retry-1").content == first.content
+
+    assert db_session.query(Reservation).count() == 1
+    assert db_session.query(EmailOutbox).count() == 1
+
+
+def test_concurrent_retry_waiting_on_the_table_lock_replays(client, db_session, seeded, monkeypatch):
+    # The second post with the key runs to completion between the first
+    # one's key check and its table lock, as when the first queues on the
+    # lock the second holds
+    replay = idempotency.store.replay
+    raced = {}
+
+    def replay_then_race(db, user_id, key, digest):
+        replayed = replay(db, user_id, key, digest)
+        if not raced:
+            raced["started"] = True
+            raced["winner"] = _book(client, seeded, "race")
+            # Make the loser find the key in the database
+            idempotency.store.cache.clear()
+        return replayed
+
+    monkeypatch.setattr(idempotency.store, "replay", replay_then_race)
+    loser = _book(client, seeded, "race")
+
+    assert raced["winner"].status_code == 201
+    assert "Idempotent-Replayed" not in raced["winner"].headers
+    assert loser.status_code == 201
+    assert loser.headers["Idempotent-Replayed"] == "true"
+    assert loser.content == raced["winner"].content
+    assert db_session.query(Reservation).count() == 1
+
+
+def test_concurrent_same_key_bookings_book_once(client, db_session, seeded, monkeypatch):
+    # Each request gets its own connection, as in production
+    engine = create_engine(str(db_session.bind.url), poolclass=NullPool)
+    RequestSession = sessionmaker(bind=engine, autoflush=False)
+
+    def override_get_db():
+        db = RequestSession()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+
+    # SQLite has no row locks; a mutex stands in for the table's FOR UPDATE
+    # and is held until the transaction ends
+    table_lock = threading.Lock()
+
+    @event.listens_for(RequestSession, "do_orm_execute")
+    def lock_table(state):
+        if state.is_select and state.statement._for_update_arg is not None:
+            table_lock.acquire()
+            state.session.info["table_lock"] = True
+
+    def release(session):
+        if session.info.pop("table_lock", False):
+            table_lock.release()
+
+    event.listen(RequestSession, "after_commit", release)
+    event.listen(RequestSession, "after_rollback", release)
+
+    # Both requests find the key unused before either takes the table
+    both_checked = threading.Barrier(2, timeout=10)
+    replay = idempotency.store.replay
+
+    def replay_after_both_checked(db, user_id, key, digest):
+        replayed = replay(db, user_id, key, digest)
+        if not db.info.get("key_checked"):
+            db.info["key_checked"] = True
+            both_checked.wait()
+        return replayed
+
+    monkeypatch.setattr(idempotency.store, "replay", replay_after_both_checked)
+    db_session.rollback()
+    with ThreadPoolExecutor(2) as pool:
+        responses = list(pool.map(lambda _: _book(client, seeded, "together"), range(2)))
+
+    assert sorted(r.status_code for r in responses) == [201, 201]
+    assert sorted(r.headers.get("Idempotent-Replayed", "") for r in responses) == ["", "true"]
+    assert responses[0].content == responses[1].content
+    assert db_session.query(Reservation).count() == 1
+    assert db_session.query(IdempotencyKey).count() == 1
+
+
+def test_key_reused_for_other_request_is_rejected(client, seeded):
+    assert _book(client, seeded, "k").status_code == 201
+    assert _book(client, seeded, "k", party_size=3).status_code == 422
+    assert _book(client, seeded, "x" * 65).status_code == 400
+
+
+def test_expired_keys_are_purged_and_reusable(client, db_session, seeded):
+    assert _book(client, seeded, "old").status_code == 201
+    db_session.query(IdempotencyKey).update(
+        {IdempotencyKey.expires_at: datetime.utcnow() - timedelta(seconds=1)}
+    )
+    db_session.commit()
+    idempotency.store.cache.clear()
+
+    # An expired key no longer replays; the table is now taken
+    assert _book(client, seeded, "old").status_code == 409
+    db_session.rollback()
+
+    assert idempotency.purge_expired(db_session) == 1
+    assert db_session.query(IdempotencyKey).count() == 0
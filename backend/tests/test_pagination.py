@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+from app.models import ReservationModel, TableModel
+
+
+def test_tables_are_paged_with_cursor(client, db_session, seeded):
+    for i in range(2, 8):
+        db_session.add(
+            TableModel.Table(
+                restaurant_id=seeded["restaurant_id"], capacity=2, table_number=f"T{i}"
+            )
+        )
+    db_session.commit()
+    url = f"/api/manager/restaurants/{seeded['restaurant_id']}/tables"
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(url, params=params, headers=seeded["manager_headers"])
+        assert response.status_code == 200
+        body = response.json()
+        assert len(body["items"]) <= 3
+        seen += [t["table_number"] for t in body["items"]]
+        cursor = body["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [f"T{i}" for i in range(1, 8)]
+
+
+def test_reservations_paged_by_time_then_id(client, db_session, seeded):
+    start = datetime(2030, 3, 20, 18, 0)
+    # Two reservations share each start time, so the id breaks ties
+    for i in range(6):
+        db_session.add(
+            ReservationModel.Reservation(
+                customer_id=1,
+                restaurant_id=seeded["restaurant_id"],
+                table_id=seeded["table_id"],
+                reservation_time=start + timedelta(hours=i // 2),
+                party_size=2,
+                confirmation_code=f"CODE{i}",
+            )
+        )
+    db_session.commit()
+    url = f"/api/manager/restaurants/{seeded['restaurant_id']}/reservations"
+
+    first = client.get(url, params={"limit": 4}, headers=seeded["manager_headers"])
+    second = client.get(
+        url,
+        params={"limit": 4, "cursor": first.json()["next_cursor"]},
+        headers=seeded["manager_headers"],
+    )
+    codes = [r["confirmation_code"] for r in first.json()["items"]]
+    codes += [r["confirmation_code"] for r in second.json()["items"]]
+    assert codes == [f"CODE{i}" for i in range(6)]
+    assert second.json()["next_cursor"] is None
+    assert first.json()["items"][0]["restaurant_name"] == "Test Restaurant"
+
+
+def test_invalid_cursor_is_rejected(client, seeded):
+    response = client.get(
+        f"/api/manager/restaurants/{seeded['restaurant_id']}/tables",
+        params={"cursor": "not-a-cursor"},
+        headers=seeded["manager_headers"],
+    )
+    assert response.status_code == 400
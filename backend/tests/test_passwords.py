@@ -0,0 +1,76 @@
+import threading
+
+import pytest
+from fastapi import HTTPException
+from passlib.context import CryptContext
+
+from app.auth.passwords import PasswordHasher
+from app.models.UserModel import User, UserRole
+from app.routes import user as user_routes
+
+
+class BlockingContext:
+    def __init__(self):
+        self.release = threading.Event()
+
+    def hash(self, password):
+        self.release.wait(5)
+        return "hashed"
+
+
+def test_saturated_pool_fails_fast():
+    context = BlockingContext()
+    hasher = PasswordHasher(context, workers=1, queue_limit=1)
+    running = hasher._submit(context.hash, "a")
+    queued = hasher._submit(context.hash, "b")
+
+    with pytest.raises(HTTPException) as excinfo:
+        hasher.hash_sync("c")
+    assert excinfo.value.status_code == 503
+
+    context.release.set()
+    assert running.result() == queued.result() == "hashed"
+    # Slots are returned once calls finish
+    assert hasher.hash_sync("d") == "hashed"
+
+
+def test_bulk_hashing_leaves_the_login_pool_alone():
+    context = BlockingContext()
+    hasher = PasswordHasher(context, workers=1, queue_limit=0)
+    login = hasher._submit(context.hash, "a")
+    with pytest.raises(HTTPException):
+        hasher.hash_sync("b")
+
+    # An import runs on its own workers while every login slot is taken
+    context.hash = lambda password: f"imported-{password}"
+    assert hasher.hash_many(["c", "d"]) == ["imported-c", "imported-d"]
+
+    context.release.set()
+    assert login.result() == "hashed"
+
+
+def test_login_rehashes_outdated_cost(client, db_session, monkeypatch):
+    old = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+    current = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=5)
+    monkeypatch.setattr(user_routes, "password_hasher", PasswordHasher(current, 1, 1))
+
+    user = User(
+        email="old@example.com",
+        password_hash=old.hash("secret"),
+        first_name="Olga",
+        last_name="Old",
+        role=UserRole.CUSTOMER,
+    )
+    db_session.add(user)
+    db_session.commit()
+
+    wrong = client.post("/api/login", data={"username": user.email, "password": "nope"})
+    assert wrong.status_code == 400
+
+    response = client.post(
+        "/api/login", data={"username": user.email, "password": "secret"}
+    )
+    assert response.status_code == 200
+    db_session.refresh(user)
+    assert user.password_hash.startswith("$2b$05$")
+    assert current.verify("secret", user.password_hash)
@@ -0,0 +1,80 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import exc
+
+from app.auth.jwt_utils import create_access_token
+from app.services import pool_metrics
+from app.services.pool_metrics import PoolStats, TimedQueuePool
+
+
+def _pool(**kwargs):
+    return TimedQueuePool(
+        lambda: sqlite3.connect(":memory:", check_same_thread=False),
+        pool_size=1,
+        max_overflow=kwargs.pop("max_overflow", 0),
+        timeout=kwargs.pop("timeout", 0.05),
+        **kwargs,
+    )
+
+
+def test_stats_bucket_waits():
+    stats = PoolStats()
+    stats.observe(0.4)
+    stats.observe(1.0)
+    stats.observe(30)
+    stats.observe(9000, timed_out=True)
+    histogram = stats.histogram()
+    assert histogram["1"] == 2
+    assert histogram["50"] == 1
+    assert histogram["+Inf"] == 1
+    assert (stats.checkouts, stats.timeouts) == (3, 1)
+
+
+def test_snapshot_tracks_checkouts_overflow_and_timeouts():
+    pool = _pool(max_overflow=1)
+    first = pool.connect()
+    second = pool.connect()
+    snap = pool_metrics.snapshot(pool)
+    assert snap["checked_out"] == 2
+    assert snap["overflow"] == 1
+
+    with pytest.raises(exc.TimeoutError):
+        pool.connect()
+    snap = pool_metrics.snapshot(pool)
+    assert snap["checkouts"] == 2
+    assert snap["timeouts"] == 1
+    assert sum(snap["wait_ms"]["histogram"].values()) == 3
+
+    first.close()
+    second.close()
+    assert pool_metrics.snapshot(pool)["checked_out"] == 0
+
+
+def test_idle_pre_ping_replaces_dead_connection():
+    pool = _pool()
+    pool_metrics.install_idle_pre_ping(pool, idle_seconds=0)
+    conn = pool.connect()
+    stale = conn.dbapi_connection
+    conn.close()
+    stale.close()  # simulate the server dropping an idle connection
+
+    conn = pool.connect()
+    assert conn.dbapi_connection is not stale
+    conn.cursor().execute("SELECT 1")
+    conn.close()
+
+
+def test_pool_metrics_endpoint_is_admin_only(client, seeded):
+    admin_token = create_access_token(
+        {"user_id": 999, "email": "admin@example.com", "role": "admin"}
+    )
+    response = client.get(
+        "/api/admin/metrics/db-pool",
+        headers={"Authorization": f"Bearer {admin_token}"},
+    )
+    assert response.status_code == 200
+    assert {"checked_out", "overflow", "wait_ms"} <= response.json()["sync"].keys()
+
+    response = client.get("/api/admin/metrics/db-pool", headers=seeded["headers"])
+    assert response.status_code == 403
@@ -0,0 +1,143 @@
+"""
+EXPLAIN QUERY PLAN checks for the reservation routes.
+
+Each test records the statements a route runs through the recorded_queries
+fixture and asks SQLite how it would execute them. A plan step that scans
+one of the watched tables means a route lost its index, which is cheap on a
+test database and a full table scan in production.
+"""
+from datetime import datetime
+
+import pytest
+
+from app.models.ReservationSlotModel import ReservationSlot
+from app.services import confirmation_codes
+
+WATCHED_TABLES = {"reservations", "reservation_slots"}
+
+
+def planned_statements(recorded_queries):
+    """The single SELECT, UPDATE and DELETE statements the requests ran."""
+    return [
+        (statement, parameters)
+        for stats in recorded_queries
+        for statement, parameters, executemany in stats.executed
+        if not executemany
+        and statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE"))
+    ]
+
+
+def full_scans(db_session, statements):
+    """Plan steps that read a watched table without an index search."""
+    connection = db_session.connection().connection.driver_connection
+    scans = []
+    for statement, parameters in statements:
+        plan = connection.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        for row in plan.fetchall():
+            detail = row[-1]
+            words = detail.split()
+            if words[:1] == ["SCAN"] and words[1] in WATCHED_TABLES:
+                scans.append(f"{detail}\n  in: {statement}")
+    return scans
+
+
+@pytest.fixture
+def booking(client, db_session, seeded):
+    db_session.add(
+        ReservationSlot(
+            restaurant_id=seeded["restaurant_id"],
+            slot_time=datetime(2030, 3, 20, 19, 0),
+            available_tables=3,
+        )
+    )
+    db_session.commit()
+    response = client.post(
+        "/api/reservations",
+        json={
+            "restaurant_id": seeded["restaurant_id"],
+            "table_id": seeded["table_id"],
+            "reservation_time": "2030-03-20T19:00:00",
+            "party_size": 2,
+        },
+        headers=seeded["headers"],
+    )
+    assert response.status_code == 201
+    return response.json()
+
+
+def _routes(seeded, booking):
+    restaurant_id = seeded["restaurant_id"]
+    reservation_id = booking["reservation_id"]
+    customer, manager = seeded["headers"], seeded["manager_headers"]
+    return [
+        ("get", "/api/reservations", customer, None),
+        ("get", f"/api/reservations/{reservation_id}", customer, None),
+        ("get", f"/api/reservations/by-code/{booking['confirmation_code']}", customer, None),
+        ("get", f"/api/restaurants/{restaurant_id}/availability", customer, None),
+        (
+            "get",
+            f"/api/restaurants/{restaurant_id}/availability/matrix"
+            "?from=2030-03-20&to=2030-03-21&party_size=2",
+            customer,
+            None,
+        ),
+        (
+            "get",
+            f"/api/restaurants/{restaurant_id}/tables/available"
+            "?reservation_time=2030-03-20T21:00:00&party_size=2",
+            customer,
+            None,
+        ),
+        ("get", f"/api/manager/restaurants/{restaurant_id}/reservations", manager, None),
+        (
+            "get",
+            f"/api/manager/restaurants/{restaurant_id}/reservations/{reservation_id}",
+            manager,
+            None,
+        ),
+        (
+            "put",
+            f"/api/reservations/{reservation_id}",
+            customer,
+            {"party_size": 3},
+        ),
+        ("delete", f"/api/reservations/{reservation_id}", customer, None),
+    ]
+
+
+def test_reservation_routes_use_indexes(
+    client, db_session, seeded, booking, recorded_queries
+):
+    for method, path, headers, body in _routes(seeded, booking):
+        recorded_queries.clear()
+        kwargs = {"headers": headers}
+        if body is not None:
+            kwargs["json"] = body
+        response = getattr(client, method)(path, **kwargs)
+        statements = planned_statements(recorded_queries)
+        assert response.status_code < 300, (path, response.text)
+        assert statements, path
+        assert full_scans(db_session, statements) == [], path
+
+
+def test_booking_uses_indexes(client, db_session, seeded, recorded_queries):
+    response = client.post(
+        "/api/reservations",
+        json={
+            "restaurant_id": seeded["restaurant_id"],
+            "table_id": seeded["table_id"],
+            "reservation_time": "2030-03-21T19:00:00",
+            "party_size": 2,
+        },
+        headers=seeded["headers"],
+    )
+    assert response.status_code == 201
+    assert confirmation_codes.decode(response.json()["confirmation_code"])
+    statements = planned_statements(recorded_queries)
+    assert statements
+    assert full_scans(db_session, statements) == []
+
+
+def test_detects_full_scan(db_session, seeded):
+    statement = "SELECT * FROM reservations WHERE party_size = ?"
+    assert full_scans(db_session, [(statement, (2,))])
@@ -0,0 +1,53 @@
+import logging
+
+import pytest
+
+from app.services import query_stats
+from app.services.query_stats import QueryBudgetExceeded, QueryStats
+
+
+def _tables(client, seeded):
+    return client.get(
+        f"/api/manager/restaurants/{seeded['restaurant_id']}/tables",
+        headers=seeded["manager_headers"],
+    )
+
+
+def test_server_timing_reports_queries(client, seeded):
+    response = _tables(client, seeded)
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    assert timing.startswith("db;dur=")
+    queries = int(timing.split('desc="')[1].split(" ")[0])
+    assert queries >= 2
+
+
+def test_budget_raises(client, seeded, monkeypatch):
+    monkeypatch.setattr(query_stats, "QUERY_BUDGET", 1)
+    with pytest.raises(QueryBudgetExceeded):
+        _tables(client, seeded)
+
+
+def test_repeated_statements_are_logged(client, seeded, monkeypatch, caplog):
+    monkeypatch.setattr(query_stats, "QUERY_DUPLICATE_THRESHOLD", 1)
+    with caplog.at_level(logging.WARNING, logger="app.services.query_stats"):
+        _tables(client, seeded)
+    assert '"event": "request_queries"' in caplog.text
+    assert '"duplicates": [{"statement": "SELECT' in caplog.text
+
+
+def test_duplicates_and_budget():
+    stats = QueryStats(budget=3)
+    for statement in ["SELECT a", "SELECT b", "SELECT b", "SELECT b"]:
+        stats.start(statement)
+    assert stats.over_budget
+    assert stats.duplicates(threshold=3) == [{"statement": "SELECT b", "count": 3}]
+
+
+def test_recorded_queries_keep_each_requests_statements(client, seeded, recorded_queries):
+    response = _tables(client, seeded)
+    (stats,) = recorded_queries
+    assert f'desc="{stats.count} queries"' in response.headers["server-timing"]
+    assert len(stats.executed) == stats.count
+    statement, parameters, executemany = stats.executed[-1]
+    assert statement.startswith("SELECT") and not executemany
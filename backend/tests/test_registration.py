@@ -0,0 +1,131 @@
+import pytest
+from passlib.context import CryptContext
+
+from app.auth.jwt_utils import create_access_token
+from app.auth.passwords import PasswordHasher
+from app.models.AdminModel import Admin
+from app.models.CustomerModel import Customer
+from app.models.RestaurantManagerModel import RestaurantManager
+from app.models.UserModel import User
+from app.routes import user as user_routes
+from app.schemas.UserSchema import MAX_BULK_USERS
+
+
+@pytest.fixture(autouse=True)
+def cheap_hashes(monkeypatch):
+    context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+    monkeypatch.setattr(user_routes, "password_hasher", PasswordHasher(context, 2, 8))
+
+
+def _admin_headers():
+    token = create_access_token({"user_id": 0, "email": "admin@example.com", "role": "admin"})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def _user(email, role="customer"):
+    return {
+        "email": email,
+        "password": "password123",
+        "first_name": "New",
+        "last_name": "User",
+        "role": role,
+    }
+
+
+def test_register_creates_user_and_role_row_together(client, db_session):
+    response = client.post("/api/register", json=_user("new@example.com", "admin"))
+    assert response.status_code == 200
+    user_id = response.json()["user_id"]
+    assert db_session.query(Admin).filter_by(user_id=user_id).count() == 1
+
+    again = client.post("/api/register", json=_user("new@example.com"))
+    assert again.status_code == 400
+    assert db_session.query(User).count() == 1
+
+
+def test_bulk_register_batches_and_skips_existing(client, db_session, seeded, monkeypatch):
+    monkeypatch.setattr(user_routes, "BULK_INSERT_BATCH_SIZE", 2)
+    admin = _admin_headers()
+    users = [
+        _user("a@example.com"),
+        _user("b@example.com", "restaurant_manager"),
+        _user("customer@example.com"),  # already seeded
+        _user("c@example.com"),
+        _user("d@example.com", "admin"),
+    ]
+
+    response = client.post("/api/admin/users/bulk", json={"users": users}, headers=admin)
+    assert response.status_code == 201
+    assert response.json() == {"created": 4, "skipped": ["customer@example.com"]}
+
+    created = {u.email: u for u in db_session.query(User).all()}
+    assert len(created) == 6
+    for email, model in [
+        ("a@example.com", Customer),
+        ("c@example.com", Customer),
+        ("b@example.com", RestaurantManager),
+        ("d@example.com", Admin),
+    ]:
+        role_rows = db_session.query(model).filter_by(user_id=created[email].user_id)
+        assert role_rows.count() == 1
+
+    login = client.post(
+        "/api/login", data={"username": "c@example.com", "password": "password123"}
+    )
+    assert login.status_code == 200
+
+
+def test_bulk_register_requires_admin_and_unique_emails(client, seeded):
+    users = {"users": [_user("a@example.com"), _user("a@example.com")]}
+    response = client.post("/api/admin/users/bulk", json=users, headers=seeded["headers"])
+    assert response.status_code == 403
+    admin = _admin_headers()
+    assert client.post("/api/admin/users/bulk", json=users, headers=admin).status_code == 400
+
+
+def test_bulk_register_caps_the_batch(client, db_session, seeded):
+    users = [_user(f"u{i}@example.com") for i in range(MAX_BULK_USERS + 1)]
+    response = client.post(
+        "/api/admin/users/bulk", json={"users": users}, headers=_admin_headers()
+    )
+    assert response.status_code == 422
+    assert db_session.query(User).count() == 2
+
+
+def test_bulk_register_imports_hashes_in_several_batches(client, db_session, seeded):
+    context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+    imported_hash = context.hash("imported-secret")
+    users = [
+        {**_user(f"i{i}@example.com"), "password": None, "password_hash": imported_hash}
+        for i in range(2 * user_routes.BULK_INSERT_BATCH_SIZE + 5)
+    ]
+    users.append(_user("plain@example.com", "restaurant_manager"))
+
+    response = client.post(
+        "/api/admin/users/bulk", json={"users": users}, headers=_admin_headers()
+    )
+    assert response.status_code == 201
+    assert response.json() == {"created": len(users), "skipped": []}
+    # Plus the seeded manager and customer
+    assert db_session.query(User).count() == len(users) + 2
+    assert db_session.query(RestaurantManager).count() == 2
+
+    for email, password in [
+        ("i2004@example.com", "imported-secret"),
+        ("plain@example.com", "password123"),
+    ]:
+        login = client.post("/api/login", data={"username": email, "password": password})
+        assert login.status_code == 200
+
+
+def test_bulk_register_validates_passwords(client, seeded):
+    admin = _admin_headers()
+    both = {**_user("a@example.com"), "password_hash": "$2b$04$" + "a" * 53}
+    neither = {**_user("b@example.com"), "password": None}
+    for user in (both, neither):
+        response = client.post("/api/admin/users/bulk", json={"users": [user]}, headers=admin)
+        assert response.status_code == 422
+
+    unknown = {**_user("c@example.com"), "password": None, "password_hash": "md5:abc"}
+    response = client.post("/api/admin/users/bulk", json={"users": [unknown]}, headers=admin)
+    assert response.status_code == 400
@@ -0,0 +1,110 @@
+from datetime import time
+
+from app.models.OperatingHoursModel import OperatingHours
+from app.schemas.OperatingHoursSchema import DayOfWeek
+from app.services import restaurant_cache
+from app.services.restaurant_cache import MemoryBackend, RedisBackend, ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """The slice of the redis-py client the cache uses."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def scan_iter(self, match):
+        prefix = match.rstrip("*")
+        return [key for key in self.data if key.startswith(prefix)]
+
+
+def test_memory_backend_evicts_lru_and_expires():
+    clock = FakeClock()
+    backend = MemoryBackend(max_entries=2, clock=clock)
+    backend.set("a", b"1", ttl=10)
+    backend.set("b", b"2", ttl=10)
+    assert backend.get("a") == b"1"  # a is now most recently used
+    backend.set("c", b"3", ttl=10)
+    assert backend.get("b") is None
+    assert backend.get("a") == b"1"
+
+    clock.now = 10
+    assert backend.get("a") is None
+    assert backend.get("c") is None
+
+
+def test_response_cache_counts_and_invalidates_on_redis_backend():
+    cache = ResponseCache(RedisBackend(FakeRedis()), namespace="detail", ttl=30)
+    assert cache.get(1) is None
+    cache.set(1, b"{}")
+    assert cache.get(1) == b"{}"
+    cache.invalidate(1)
+    assert cache.get(1) is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["invalidations"]) == (1, 2, 1)
+    assert stats["backend"] == "RedisBackend"
+
+
+def _detail(client, seeded):
+    return client.get(
+        f"/api/restaurants/{seeded['restaurant_id']}", headers=seeded["headers"]
+    )
+
+
+def test_detail_is_cached_until_a_write_invalidates_it(client, seeded):
+    first = _detail(client, seeded)
+    assert first.status_code == 200
+    assert _detail(client, seeded).content == first.content
+    stats = restaurant_cache.detail_cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    photo = client.post(
+        f"/api/manager/restaurants/{seeded['restaurant_id']}/photos",
+        json={"url": "front.jpg"},
+        headers=seeded["manager_headers"],
+    )
+    assert photo.status_code == 201
+    assert [p["url"] for p in _detail(client, seeded).json()["photos"]] == ["front.jpg"]
+
+    review = client.post(
+        f"/api/restaurants/{seeded['restaurant_id']}/reviews",
+        json={"rating": 4},
+        headers=seeded["headers"],
+    )
+    assert review.status_code == 200
+    body = _detail(client, seeded).json()
+    assert body["review_count"] == 1
+    assert body["rating_histogram"]["4"] == 1
+    assert restaurant_cache.detail_cache.stats()["misses"] == 3
+
+
+def test_detail_serializes_nested_rows(client, db_session, seeded):
+    db_session.add(
+        OperatingHours(
+            restaurant_id=seeded["restaurant_id"],
+            day_of_week=DayOfWeek.MONDAY,
+            opening_time=time(11, 0),
+            closing_time=time(22, 0),
+        )
+    )
+    db_session.commit()
+    response = _detail(client, seeded)
+    assert response.status_code == 200
+    assert response.json()["operating_hours"][0]["opening_time"] == "11:00:00"
@@ -0,0 +1,99 @@
+import pytest
+from datetime import datetime
+
+from app.models import RestaurantModel, TableModel
+from app.models.ReservationSlotModel import ReservationSlot
+
+
+@pytest.fixture
+def second_restaurant(db_session, seeded):
+    restaurant = RestaurantModel.Restaurant(
+        manager_id=seeded["manager_id"],
+        name="Second Restaurant",
+        address_line1="9 Side St",
+        city="Oakland",
+        state="CA",
+        zip_code="94607",
+        phone_number="123-456-7890",
+        email="second@example.com",
+        cuisine_type=RestaurantModel.CuisineType.THAI,
+        cost_rating=1,
+        is_approved=True,
+    )
+    db_session.add(restaurant)
+    db_session.flush()
+    db_session.add(
+        TableModel.Table(
+            restaurant_id=restaurant.restaurant_id, capacity=2, table_number="A"
+        )
+    )
+    db_session.commit()
+    return restaurant.restaurant_id
+
+
+def _add_slots(db_session, restaurant_id, *times):
+    for slot_time in times:
+        db_session.add(
+            ReservationSlot(
+                restaurant_id=restaurant_id, slot_time=slot_time, available_tables=3
+            )
+        )
+    db_session.commit()
+
+
+def test_search_by_date_uses_whole_day(client, db_session, seeded):
+    _add_slots(db_session, seeded["restaurant_id"], datetime(2030, 3, 20, 23, 30))
+
+    response = client.get(
+        "/api/restaurants/search",
+        params={"reservation_date": "2030-03-20", "party_size": 2},
+        headers=seeded["headers"],
+    )
+    assert response.status_code == 200
+    assert [r["restaurant_id"] for r in response.json()] == [seeded["restaurant_id"]]
+
+    response = client.get(
+        "/api/restaurants/search",
+        params={"reservation_date": "2030-03-21"},
+        headers=seeded["headers"],
+    )
+    assert response.status_code == 404
+
+
+def test_search_times_returns_nearest_bookable_slots(
+    client, db_session, seeded, second_restaurant
+):
+    _add_slots(
+        db_session,
+        seeded["restaurant_id"],
+        datetime(2030, 3, 20, 18, 15),
+        datetime(2030, 3, 20, 18, 45),
+        datetime(2030, 3, 20, 19, 15),
+        datetime(2030, 3, 20, 20, 0),  # outside the window
+    )
+    _add_slots(db_session, second_restaurant, datetime(2030, 3, 20, 19, 0))
+
+    params = {
+        "reservation_date": "2030-03-20",
+        "reservation_time": "19:00:00",
+        "party_size": 2,
+        "times_per_restaurant": 2,
+    }
+    response = client.get(
+        "/api/restaurants/search/times", params=params, headers=seeded["headers"]
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert [r["restaurant_id"] for r in body] == [
+        second_restaurant,
+        seeded["restaurant_id"],
+    ]
+    assert body[0]["slot_times"] == ["2030-03-20T19:00:00"]
+    assert body[1]["slot_times"] == ["2030-03-20T18:45:00", "2030-03-20T19:15:00"]
+
+    # The second restaurant only has a two-seat table
+    params["party_size"] = 3
+    response = client.get(
+        "/api/restaurants/search/times", params=params, headers=seeded["headers"]
+    )
+    assert [r["restaurant_id"] for r in response.json()] == [seeded["restaurant_id"]]
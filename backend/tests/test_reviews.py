@@ -0,0 +1,84 @@
+from app.models.CustomerModel import Customer
+from app.models.CustomerReviewModel import Review
+from app.models.RestaurantModel import Restaurant
+from app.models.UserModel import User, UserRole
+from app.services import review_aggregates
+
+
+def _restaurant(db_session, seeded):
+    db_session.expire_all()
+    return db_session.get(Restaurant, seeded["restaurant_id"])
+
+
+def _other_review(db_session, seeded, rating):
+    user = User(
+        email="other@example.com",
+        password_hash="x",
+        first_name="Ora",
+        last_name="Other",
+        role=UserRole.CUSTOMER,
+    )
+    db_session.add(user)
+    db_session.flush()
+    customer = Customer(user_id=user.user_id)
+    db_session.add(customer)
+    db_session.flush()
+    review = Review(
+        customer_id=customer.customer_id,
+        restaurant_id=seeded["restaurant_id"],
+        rating=rating,
+    )
+    db_session.add(review)
+    db_session.commit()
+    return review
+
+
+def test_review_writes_maintain_aggregates(client, db_session, seeded):
+    db_session.execute(review_aggregates.adjust(seeded["restaurant_id"], added=2))
+    _other_review(db_session, seeded, rating=2)
+
+    created = client.post(
+        f"/api/restaurants/{seeded['restaurant_id']}/reviews",
+        json={"rating": 5, "comment": "Great"},
+        headers=seeded["headers"],
+    )
+    assert created.status_code == 200
+    restaurant = _restaurant(db_session, seeded)
+    assert (restaurant.review_count, restaurant.rating_sum) == (2, 7)
+    assert restaurant.avg_rating == 3.5
+    assert restaurant.rating_histogram == {1: 0, 2: 1, 3: 0, 4: 0, 5: 1}
+
+    review_id = created.json()["review_id"]
+    updated = client.put(
+        f"/api/restaurants/reviews/{review_id}",
+        json={"rating": 4},
+        headers=seeded["headers"],
+    )
+    assert updated.status_code == 200
+    restaurant = _restaurant(db_session, seeded)
+    assert restaurant.avg_rating == 3.0
+    assert restaurant.rating_histogram == {1: 0, 2: 1, 3: 0, 4: 1, 5: 0}
+
+    deleted = client.delete(
+        f"/api/restaurants/reviews/{review_id}", headers=seeded["headers"]
+    )
+    assert deleted.status_code == 200
+    restaurant = _restaurant(db_session, seeded)
+    assert (restaurant.review_count, restaurant.rating_sum) == (1, 2)
+    assert restaurant.avg_rating == 2.0
+    assert restaurant.rating_histogram == {1: 0, 2: 1, 3: 0, 4: 0, 5: 0}
+
+
+def test_rebuild_repairs_drifted_aggregates(db_session, seeded):
+    _other_review(db_session, seeded, rating=3)
+    restaurant = _restaurant(db_session, seeded)
+    restaurant.review_count = 40
+    restaurant.rating_5_count = 40
+    restaurant.avg_rating = 5.0
+    db_session.commit()
+
+    assert review_aggregates.rebuild(db_session) == 1
+    restaurant = _restaurant(db_session, seeded)
+    assert (restaurant.review_count, restaurant.rating_sum) == (1, 3)
+    assert restaurant.avg_rating == 3.0
+    assert restaurant.rating_histogram == {1: 0, 2: 0, 3: 1, 4: 0, 5: 0}
@@ -0,0 +1,141 @@
+from datetime import datetime
+
+import pytest
+
+from app.models import RestaurantModel
+from app.models.ReservationSlotModel import ReservationSlot
+from app.services import geo
+
+CuisineType = RestaurantModel.CuisineType
+
+
+@pytest.fixture
+def restaurants(db_session, seeded):
+    """Four bookable restaurants next to the seeded one, which has no slots."""
+    ids = {}
+    for name, cuisine, cost_rating, avg_rating, city in [
+        ("Trattoria", CuisineType.ITALIAN, 3, 4.6, "San Jose"),
+        ("Pizzeria", CuisineType.ITALIAN, 1, 3.2, "San Jose"),
+        ("Bangkok", CuisineType.THAI, 2, 4.1, "San Jose"),
+        ("Unrated", CuisineType.THAI, 1, 0.0, "Oakland"),
+    ]:
+        restaurant = RestaurantModel.Restaurant(
+            manager_id=seeded["manager_id"],
+            name=name,
+            address_line1="1 Main St",
+            city=city,
+            state="CA",
+            zip_code="95112",
+            phone_number="123-456-7890",
+            email="r@example.com",
+            cuisine_type=cuisine,
+            cost_rating=cost_rating,
+            avg_rating=avg_rating,
+            is_approved=True,
+        )
+        db_session.add(restaurant)
+        db_session.flush()
+        db_session.add(
+            ReservationSlot(
+                restaurant_id=restaurant.restaurant_id,
+                slot_time=datetime(2030, 3, 20, 19, 0),
+                available_tables=1,
+            )
+        )
+        ids[name] = restaurant.restaurant_id
+    db_session.commit()
+    return ids
+
+
+def _get(client, seeded, path, **params):
+    return client.get(
+        path,
+        params={"reservation_date": "2030-03-20", **params},
+        headers=seeded["headers"],
+    )
+
+
+def _search(client, seeded, **params):
+    response = _get(client, seeded, "/api/restaurants/search", **params)
+    if response.status_code == 404:
+        return set()
+    assert response.status_code == 200
+    return {r["restaurant_id"] for r in response.json()}
+
+
+def test_search_filters_by_cuisine_rating_and_cost(client, seeded, restaurants):
+    assert _search(client, seeded, cuisine_type="italian") == {
+        restaurants["Trattoria"],
+        restaurants["Pizzeria"],
+    }
+    assert _search(client, seeded, min_rating=4) == {
+        restaurants["Trattoria"],
+        restaurants["Bangkok"],
+    }
+    assert _search(client, seeded, max_cost_rating=2, cuisine_type="thai") == {
+        restaurants["Bangkok"],
+        restaurants["Unrated"],
+    }
+    assert _search(client, seeded, cuisine_type="french") == set()
+    assert _get(client, seeded, "/api/restaurants/search", min_rating=6).status_code == 422
+
+
+def test_facets_count_each_facet_without_its_own_filter(client, seeded, restaurants):
+    response = _get(client, seeded, "/api/restaurants/search/facets")
+    assert response.status_code == 200
+    assert response.json() == {
+        "total": 4,
+        "cuisine_type": {"italian": 2, "thai": 2},
+        "cost_rating": {"1": 2, "2": 1, "3": 1},
+        "rating": {"0": 1, "3": 1, "4": 2},
+    }
+
+    response = _get(
+        client, seeded, "/api/restaurants/search/facets",
+        cuisine_type="italian", min_rating=3.5,
+    )
+    assert response.json() == {
+        "total": 1,
+        # min_rating applied: the Pizzeria is out
+        "cuisine_type": {"italian": 1, "thai": 1},
+        # both filters applied
+        "cost_rating": {"3": 1},
+        # only the cuisine applied
+        "rating": {"3": 1, "4": 1},
+    }
+
+    # The other search criteria narrow the candidates for every facet
+    response = _get(client, seeded, "/api/restaurants/search/facets", location="oakland")
+    assert response.json()["cuisine_type"] == {"thai": 1}
+
+
+def test_facets_take_one_query(client, seeded, restaurants):
+    response = _get(
+        client, seeded, "/api/restaurants/search/facets",
+        max_cost_rating=2, min_rating=1,
+    )
+    assert response.status_code == 200
+    assert response.headers["server-timing"].endswith('desc="1 queries"')
+
+
+def test_facets_near_take_one_query(client, db_session, seeded, restaurants):
+    # Downtown San Jose for the three San Jose restaurants, Oakland is ~55 km off
+    for name, lat, lng in [
+        ("Trattoria", 37.3382, -121.8863),
+        ("Pizzeria", 37.3352, -121.8811),
+        ("Bangkok", 37.3496, -121.8950),
+        ("Unrated", 37.8044, -122.2712),
+    ]:
+        restaurant = db_session.get(RestaurantModel.Restaurant, restaurants[name])
+        restaurant.latitude, restaurant.longitude = lat, lng
+        restaurant.geohash = geo.encode(lat, lng)
+    db_session.commit()
+
+    response = _get(
+        client, seeded, "/api/restaurants/search/facets",
+        near="37.3382,-121.8863", radius=5,
+    )
+    assert response.status_code == 200
+    assert response.headers["server-timing"].endswith('desc="1 queries"')
+    assert response.json()["total"] == 3
+    assert response.json()["cuisine_type"] == {"italian": 2, "thai": 1}
@@ -0,0 +1,221 @@
+import threading
+from datetime import datetime
+
+import pytest
+from sqlalchemy.dialects import mysql, postgresql
+
+from app.models import RestaurantModel
+from app.models.ReservationSlotModel import ReservationSlot
+from app.services import search_index
+
+
+def _add_restaurant(db_session, manager_id, name, city, cuisine, description=None):
+    restaurant = RestaurantModel.Restaurant(
+        manager_id=manager_id,
+        name=name,
+        description=description,
+        address_line1="1 Main St",
+        city=city,
+        state="CA",
+        zip_code="94000",
+        phone_number="123-456-7890",
+        email="r@example.com",
+        cuisine_type=cuisine,
+        cost_rating=2,
+        is_approved=True,
+    )
+    db_session.add(restaurant)
+    db_session.flush()
+    db_session.add(
+        ReservationSlot(
+            restaurant_id=restaurant.restaurant_id,
+            slot_time=datetime(2030, 3, 20, 19, 0),
+            available_tables=1,
+        )
+    )
+    db_session.commit()
+    return restaurant.restaurant_id
+
+
+@pytest.fixture
+def restaurants(db_session, seeded):
+    CuisineType = RestaurantModel.CuisineType
+    return {
+        "noodle": _add_restaurant(
+            db_session, seeded["manager_id"], "Noodle Bar", "Oakland", CuisineType.THAI,
+            "Hand-pulled noodles and broth",
+        ),
+        "pasta": _add_restaurant(
+            db_session, seeded["manager_id"], "Pasta House", "San Francisco",
+            CuisineType.ITALIAN, "Fresh noodles daily",
+        ),
+    }
+
+
+def _search(client, seeded, **params):
+    response = client.get(
+        "/api/restaurants/search",
+        params={"reservation_date": "2030-03-20", **params},
+        headers=seeded["headers"],
+    )
+    if response.status_code == 404:
+        return []
+    assert response.status_code == 200
+    return [r["restaurant_id"] for r in response.json()]
+
+
+def test_tokenize():
+    assert search_index.tokenize("Joe's Diner, 10001-NY") == ["joe", "s", "diner", "10001", "ny"]
+    assert search_index.tokenize(None) == []
+
+
+def test_inverted_index_prefixes_and_ranks():
+    index = search_index.InvertedIndex()
+    index.add(1, {"name": "Brooklyn Bistro", "city": "New York"})
+    index.add(2, {"name": "Harbor Grill", "description": "Best in Brooklyn"})
+    index.add(3, {"name": "Harbor Fish", "city": "Boston"})
+
+    scores = index.search(["bro"])
+    # A name hit outranks a description hit
+    assert sorted(scores, key=scores.get, reverse=True) == [1, 2]
+    assert set(index.search(["harb", "bro"])) == {2}
+    assert index.search(["harb", "seattle"]) == {}
+
+    index.remove(2)
+    assert set(index.search(["harbor"])) == {3}
+    index.add(3, {"name": "Harbor Oysters"})
+    assert index.search(["fish"]) == {}
+    assert set(index.search(["oyst"])) == {3}
+
+
+def test_search_by_keyword_prefix_and_cuisine(client, seeded, restaurants):
+    assert _search(client, seeded, q="nood") == [restaurants["noodle"], restaurants["pasta"]]
+    assert _search(client, seeded, q="noodles ital") == [restaurants["pasta"]]
+    assert _search(client, seeded, q="thai") == [restaurants["noodle"]]
+    assert _search(client, seeded, q="sushi") == []
+
+
+def test_search_by_location_matches_address_tokens(client, seeded, restaurants):
+    assert _search(client, seeded, location="san fran") == [restaurants["pasta"]]
+    assert _search(client, seeded, location="Oak") == [restaurants["noodle"]]
+    # Location only looks at the address, not the name or description
+    assert _search(client, seeded, location="noodle") == []
+
+
+def test_index_follows_restaurant_writes(client, db_session, seeded, restaurants):
+    assert _search(client, seeded, q="noodle") == [restaurants["noodle"], restaurants["pasta"]]
+
+    response = client.put(
+        f"/api/manager/restaurants/{restaurants['pasta']}",
+        json={"description": "Wood-fired pizza", "cuisine_type": "american"},
+        headers=seeded["manager_headers"],
+    )
+    assert response.status_code == 200
+    assert _search(client, seeded, q="noodle") == [restaurants["noodle"]]
+    assert _search(client, seeded, q="pizz") == [restaurants["pasta"]]
+    assert _search(client, seeded, q="american") == [restaurants["pasta"]]
+
+    response = client.post(
+        "/api/manager/restaurants",
+        json={
+            "name": "Noodle Cart",
+            "address_line1": "2 Pier",
+            "city": "Oakland",
+            "state": "CA",
+            "zip_code": "94607",
+            "phone_number": "123-456-7890",
+            "email": "cart@example.com",
+            "cuisine_type": "chinese",
+            "cost_rating": 1,
+        },
+        headers=seeded["manager_headers"],
+    )
+    assert response.status_code == 200
+    cart_id = response.json()["restaurant_id"]
+    assert set(search_index.index.search(db_session, ["noodle"], "text")) == {
+        restaurants["noodle"],
+        cart_id,
+    }
+
+    response = client.delete(
+        f"/api/manager/restaurants/{cart_id}", headers=seeded["manager_headers"]
+    )
+    assert response.status_code == 204
+    assert set(search_index.index.search(db_session, ["noodle"], "text")) == {
+        restaurants["noodle"]
+    }
+
+
+@pytest.mark.parametrize(
+    "dialect, expected",
+    [
+        (mysql.dialect(), "MATCH (restaurants.name, restaurants.description"),
+        (postgresql.dialect(), "@@ to_tsquery("),
+    ],
+)
+def test_native_match_compiles(dialect, expected):
+    match = search_index._native_match(dialect.name, ["ital", "brook"], "text")
+    sql = str(match.clause.compile(dialect=dialect))
+    assert expected in sql
+    assert "restaurants.cuisine_type IN" in sql
+
+
+def test_mysql_looks_up_unindexed_words_by_state_and_zip():
+    # InnoDB leaves "ca" (too short) and "la" (a stopword) out of FULLTEXT
+    match = search_index._native_match("mysql", ["san", "jose", "ca", "la"], "location")
+    sql = str(
+        match.clause.compile(dialect=mysql.dialect(), compile_kwargs={"literal_binds": True})
+    )
+    assert "AGAINST ('+san* +jose*' IN BOOLEAN MODE)" in sql
+    assert "restaurants.state = 'CA'" in sql
+    assert "restaurants.zip_code LIKE concat('ca', '%%')" in sql
+    assert "restaurants.state = 'LA'" in sql
+    assert "'+ca*'" not in sql
+
+    only_short = search_index._native_match("mysql", ["ca"], "location")
+    assert only_short.rank is None
+    assert "MATCH" not in str(only_short.clause.compile(dialect=mysql.dialect()))
+
+
+def test_stale_index_is_rebuilt_in_the_background(db_session, seeded, restaurants):
+    now = [0.0]
+    memory = search_index.MemorySearchIndex(reload_seconds=10, clock=lambda: now[0])
+    assert set(memory.search(db_session, ["noodle"], "text")) == set(restaurants.values())
+
+    # Written by "another process": nothing calls refresh() for it
+    shack = _add_restaurant(
+        db_session, seeded["manager_id"], "Noodle Shack", "Oakland",
+        RestaurantModel.CuisineType.THAI,
+    )
+    started, release = threading.Event(), threading.Event()
+    build = memory._build
+
+    def slow_build(db):
+        started.set()
+        release.wait(5)
+        return build(db)
+
+    memory._build = slow_build
+    now[0] = 10.0
+    # The stale index still answers while the rebuild waits
+    assert set(memory.search(db_session, ["noodle"], "text")) == set(restaurants.values())
+    assert started.wait(5)
+    reloader = memory._reloader
+    # A write reported mid-rebuild survives the swap
+    memory.remove(restaurants["pasta"])
+    release.set()
+    reloader.join(5)
+
+    assert set(memory.search(db_session, ["noodle"], "text")) == {
+        restaurants["noodle"],
+        shack,
+    }
+
+
+def test_memory_match_caps_the_candidate_ids(db_session, restaurants, monkeypatch):
+    monkeypatch.setattr(search_index, "MAX_CANDIDATES", 1)
+    match = search_index.match(db_session, "noodle")
+    # "Noodle Bar" outranks "Pasta House" by matching in the name
+    assert list(match.scores) == [restaurants["noodle"]]
+    found = db_session.query(RestaurantModel.Restaurant.restaurant_id).filter(match.clause)
+    assert [row.restaurant_id for row in found] == [restaurants["noodle"]]
@@ -0,0 +1,134 @@
+from datetime import datetime
+
+import pytest
+
+from app.models import TableModel
+from app.models.ReservationSlotModel import ReservationSlot
+from app.services import slot_counter
+
+SEVEN_PM = datetime(2030, 3, 20, 19, 0)
+NINE_PM = datetime(2030, 3, 20, 21, 0)
+
+
+@pytest.fixture
+def slots(db_session, seeded):
+    db_session.add(
+        TableModel.Table(
+            restaurant_id=seeded["restaurant_id"], capacity=4, table_number="T2"
+        )
+    )
+    for slot_time, tables in [(SEVEN_PM, 1), (NINE_PM, 2)]:
+        db_session.add(
+            ReservationSlot(
+                restaurant_id=seeded["restaurant_id"],
+                slot_time=slot_time,
+                available_tables=tables,
+            )
+        )
+    db_session.commit()
+    return db_session.query(TableModel.Table).filter_by(table_number="T2").one()
+
+
+def _available(db_session, slot_time):
+    db_session.expire_all()
+    return (
+        db_session.query(ReservationSlot.available_tables)
+        .filter(ReservationSlot.slot_time == slot_time)
+        .scalar()
+    )
+
+
+def _book(client, seeded, table_id, when):
+    return client.post(
+        "/api/reservations",
+        json={
+            "restaurant_id": seeded["restaurant_id"],
+            "table_id": table_id,
+            "reservation_time": when.isoformat(),
+            "party_size": 2,
+        },
+        headers=seeded["headers"],
+    )
+
+
+def test_take_stops_at_zero(db_session, seeded, slots):
+    restaurant_id = seeded["restaurant_id"]
+    assert slot_counter.take(db_session, restaurant_id, SEVEN_PM)
+    assert not slot_counter.take(db_session, restaurant_id, SEVEN_PM)
+    # No slot at this time at all
+    assert not slot_counter.take(db_session, restaurant_id, datetime(2030, 3, 20, 12))
+    assert _available(db_session, SEVEN_PM) == 0
+
+
+def test_give_back_stops_at_the_active_table_count(db_session, seeded, slots):
+    restaurant_id = seeded["restaurant_id"]
+    # Two active tables and both already free at 9pm
+    assert not slot_counter.give_back(db_session, restaurant_id, NINE_PM)
+    assert _available(db_session, NINE_PM) == 2
+
+    assert slot_counter.give_back(db_session, restaurant_id, SEVEN_PM)
+    assert not slot_counter.give_back(db_session, restaurant_id, SEVEN_PM)
+    assert _available(db_session, SEVEN_PM) == 2
+
+    slots.is_active = False
+    db_session.commit()
+    assert not slot_counter.give_back(db_session, restaurant_id, SEVEN_PM)
+    assert not slot_counter.give_back(db_session, restaurant_id, datetime(2030, 3, 20, 12))
+
+
+def test_booking_takes_and_cancel_returns_table(client, db_session, seeded, slots):
+    booked = _book(client, seeded, seeded["table_id"], SEVEN_PM)
+    assert booked.status_code == 201
+    assert _available(db_session, SEVEN_PM) == 0
+
+    # The second table is free, but the slot has no tables left
+    assert _book(client, seeded, slots.table_id, SEVEN_PM).status_code == 409
+
+    reservation_id = booked.json()["reservation_id"]
+    path = f"/api/reservations/{reservation_id}"
+    assert client.delete(path, headers=seeded["headers"]).status_code == 204
+    assert _available(db_session, SEVEN_PM) == 1
+    # Cancelling twice does not hand the table back twice
+    assert client.delete(path, headers=seeded["headers"]).status_code == 204
+    assert _available(db_session, SEVEN_PM) == 1
+
+
+def test_rebooking_moves_table_between_slots(client, db_session, seeded, slots):
+    booked = _book(client, seeded, seeded["table_id"], NINE_PM)
+    path = f"/api/reservations/{booked.json()['reservation_id']}"
+    assert _available(db_session, NINE_PM) == 1
+
+    moved = client.put(
+        path, json={"reservation_time": SEVEN_PM.isoformat()}, headers=seeded["headers"]
+    )
+    assert moved.status_code == 200
+    assert _available(db_session, SEVEN_PM) == 0
+    assert _available(db_session, NINE_PM) == 2
+
+    # Changing only the party size leaves the counters alone
+    resized = client.put(path, json={"party_size": 3}, headers=seeded["headers"])
+    assert resized.status_code == 200
+    assert _available(db_session, SEVEN_PM) == 0
+
+
+def test_rebooking_into_and_out_of_a_time_without_a_slot(client, db_session, seeded, slots):
+    booked = _book(client, seeded, seeded["table_id"], SEVEN_PM)
+    path = f"/api/reservations/{booked.json()['reservation_id']}"
+    assert _available(db_session, SEVEN_PM) == 0
+
+    # 8pm has no slot row; it is bookable, so it is also rebookable
+    eight_pm = datetime(2030, 3, 20, 20, 0)
+    assert _book(client, seeded, slots.table_id, eight_pm).status_code == 201
+    moved = client.put(
+        path, json={"reservation_time": eight_pm.isoformat()}, headers=seeded["headers"]
+    )
+    assert moved.status_code == 200
+    assert _available(db_session, SEVEN_PM) == 1
+
+    # Moving back out of 8pm claims the 9pm slot and returns nothing at 8pm
+    moved = client.put(
+        path, json={"reservation_time": NINE_PM.isoformat()}, headers=seeded["headers"]
+    )
+    assert moved.status_code == 200
+    assert _available(db_session, NINE_PM) == 1
+    assert _available(db_session, eight_pm) is None
@@ -0,0 +1,178 @@
+from datetime import datetime, time
+
+import pytest
+
+from app.auth.jwt_utils import create_access_token
+from app.models import CustomerModel, RestaurantManagerModel, TableModel, UserModel
+from app.models.OperatingHoursModel import OperatingHours
+from app.models.ReservationModel import Reservation, ReservationStatus
+from app.models.ReservationSlotModel import ReservationSlot
+from app.schemas.OperatingHoursSchema import DayOfWeek
+
+
+@pytest.fixture
+def hours(db_session, seeded):
+    restaurant_id = seeded["restaurant_id"]
+    db_session.add_all(
+        [
+            # 2030-03-18 is a Monday; lunch and dinner services
+            OperatingHours(
+                restaurant_id=restaurant_id,
+                day_of_week=DayOfWeek.MONDAY,
+                opening_time=time(11, 0),
+                closing_time=time(14, 0),
+            ),
+            OperatingHours(
+                restaurant_id=restaurant_id,
+                day_of_week=DayOfWeek.MONDAY,
+                opening_time=time(18, 0),
+                closing_time=time(21, 0),
+            ),
+            OperatingHours(
+                restaurant_id=restaurant_id,
+                day_of_week=DayOfWeek.TUESDAY,
+                opening_time=time(18, 0),
+                closing_time=time(20, 0),
+            ),
+            TableModel.Table(restaurant_id=restaurant_id, capacity=2, table_number="T2"),
+            TableModel.Table(
+                restaurant_id=restaurant_id, capacity=6, table_number="T3", is_active=False
+            ),
+        ]
+    )
+    db_session.commit()
+
+
+def _generate(client, seeded, **body):
+    body = {"start_date": "2030-03-18", "end_date": "2030-03-24", **body}
+    return client.post(
+        f"/api/manager/restaurants/{seeded['restaurant_id']}/slots/generate",
+        json=body,
+        headers=seeded["manager_headers"],
+    )
+
+
+def test_generates_slots_within_hours_leaving_a_turn(client, db_session, seeded, hours):
+    response = _generate(client, seeded, interval_minutes=30, turn_minutes=90)
+    assert response.status_code == 201
+    assert response.json() == {"slots": 10, "available_tables": 2}
+
+    slots = db_session.query(ReservationSlot).order_by(ReservationSlot.slot_time).all()
+    assert [s.slot_time.strftime("%d %H:%M") for s in slots] == [
+        "18 11:00", "18 11:30", "18 12:00", "18 12:30",
+        "18 18:00", "18 18:30", "18 19:00", "18 19:30",
+        "19 18:00", "19 18:30",
+    ]
+    assert all(s.available_tables == 2 for s in slots)
+
+
+def test_regenerating_keeps_or_overwrites_existing_slots(client, db_session, seeded, hours):
+    assert _generate(client, seeded, interval_minutes=60).json()["slots"] == 5
+    slot = db_session.query(ReservationSlot).order_by(ReservationSlot.slot_time).first()
+    slot.available_tables = 0
+    db_session.commit()
+
+    assert _generate(client, seeded, interval_minutes=30).json()["slots"] == 10
+    assert db_session.query(ReservationSlot).count() == 10
+    db_session.refresh(slot)
+    assert slot.available_tables == 0
+
+    assert _generate(client, seeded, overwrite=True).status_code == 201
+    db_session.refresh(slot)
+    assert slot.available_tables == 2
+    assert db_session.query(ReservationSlot).count() == 10
+
+
+def test_overwrite_leaves_confirmed_bookings_out(client, db_session, seeded, hours):
+    assert _generate(client, seeded, interval_minutes=60).status_code == 201
+    customer = db_session.query(CustomerModel.Customer).first()
+    for code, status in [("BOOKED0001", ReservationStatus.CONFIRMED),
+                         ("BOOKED0002", ReservationStatus.CANCELLED)]:
+        db_session.add(
+            Reservation(
+                customer_id=customer.customer_id,
+                restaurant_id=seeded["restaurant_id"],
+                table_id=seeded["table_id"],
+                reservation_time=datetime(2030, 3, 18, 18, 0),
+                party_size=2,
+                status=status,
+                confirmation_code=code,
+            )
+        )
+    db_session.commit()
+
+    assert _generate(client, seeded, interval_minutes=60, overwrite=True).status_code == 201
+    slots = {
+        s.slot_time: s.available_tables for s in db_session.query(ReservationSlot)
+    }
+    assert slots[datetime(2030, 3, 18, 18, 0)] == 1
+    assert slots[datetime(2030, 3, 18, 19, 0)] == 2
+
+
+def test_hours_past_midnight_wrap_into_the_next_day(client, db_session, seeded):
+    db_session.add(
+        OperatingHours(
+            restaurant_id=seeded["restaurant_id"],
+            day_of_week=DayOfWeek.FRIDAY,
+            opening_time=time(22, 0),
+            closing_time=time(2, 0),
+        )
+    )
+    db_session.commit()
+
+    response = _generate(client, seeded, interval_minutes=60, turn_minutes=60)
+    assert response.status_code == 201
+    slots = db_session.query(ReservationSlot).order_by(ReservationSlot.slot_time).all()
+    # 2030-03-22 is a Friday
+    assert [s.slot_time.strftime("%d %H:%M") for s in slots] == [
+        "22 22:00", "22 23:00", "23 00:00", "23 01:00",
+    ]
+
+
+def test_only_the_restaurants_manager_may_generate(client, db_session, seeded, hours):
+    other = UserModel.User(
+        email="other-manager@example.com",
+        password_hash="x",
+        first_name="Otto",
+        last_name="Other",
+        role=UserModel.UserRole.RESTAURANT_MANAGER,
+    )
+    db_session.add(other)
+    db_session.flush()
+    db_session.add(RestaurantManagerModel.RestaurantManager(user_id=other.user_id))
+    db_session.commit()
+    token = create_access_token(
+        {"user_id": other.user_id, "email": other.email, "role": "restaurant_manager"}
+    )
+
+    response = client.post(
+        f"/api/manager/restaurants/{seeded['restaurant_id']}/slots/generate",
+        json={"start_date": "2030-03-18", "end_date": "2030-03-24"},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 404
+    assert db_session.query(ReservationSlot).count() == 0
+
+
+def test_duplicate_slot_is_rejected_by_unique_index(client, seeded, hours):
+    url = f"/api/manager/restaurants/{seeded['restaurant_id']}/slots"
+    body = {"slot_time": "2030-03-19T18:00:00", "available_tables": 2}
+    first = client.post(url, json=body, headers=seeded["manager_headers"])
+    assert first.status_code == 200
+    again = client.post(url, json=body, headers=seeded["manager_headers"])
+    assert again.status_code == 400
+
+    other = client.post(
+        url,
+        json={**body, "slot_time": "2030-03-19T18:30:00"},
+        headers=seeded["manager_headers"],
+    )
+    moved = client.put(
+        f"{url}/{other.json()['slot_id']}", json=body, headers=seeded["manager_headers"]
+    )
+    assert moved.status_code == 400
+
+
+def test_rejects_bad_ranges(client, seeded, hours):
+    assert _generate(client, seeded, end_date="2030-03-01").status_code == 400
+    assert _generate(client, seeded, end_date="2030-12-31").status_code == 400
@@ -0,0 +1,91 @@
+import pytest
+from datetime import datetime, timedelta
+
+from app.models import TableModel
+from app.services.table_inventory import TURN_TIME, TableInventory
+
+SEVEN_PM = datetime(2030, 3, 20, 19, 0)
+
+
+def test_inventory_detects_overlapping_turns():
+    inventory = TableInventory([(1, 4), (2, 2)])
+    inventory.book(1, SEVEN_PM, reservation_id=10)
+
+    assert not inventory.is_free(1, SEVEN_PM)
+    assert not inventory.is_free(1, SEVEN_PM + TURN_TIME - timedelta(minutes=1))
+    assert not inventory.is_free(1, SEVEN_PM - TURN_TIME + timedelta(minutes=1))
+    assert inventory.is_free(1, SEVEN_PM + TURN_TIME)
+    assert inventory.is_free(1, SEVEN_PM - TURN_TIME)
+    assert inventory.is_free(2, SEVEN_PM)
+
+
+def test_inventory_excludes_reservation_being_moved():
+    inventory = TableInventory([(1, 4)])
+    inventory.book(1, SEVEN_PM, reservation_id=10)
+
+    assert inventory.is_free(1, SEVEN_PM + timedelta(minutes=30), exclude_reservation_id=10)
+    assert not inventory.is_free(1, SEVEN_PM + timedelta(minutes=30), exclude_reservation_id=11)
+
+
+def test_inventory_release_frees_table():
+    inventory = TableInventory([(1, 4)])
+    inventory.book(1, SEVEN_PM, reservation_id=10)
+    inventory.release(1, SEVEN_PM, reservation_id=10)
+
+    assert inventory.is_free(1, SEVEN_PM)
+
+
+def test_tables_for_party_best_fit_first():
+    inventory = TableInventory([(1, 8), (2, 4), (3, 2), (4, 4)])
+    inventory.book(2, SEVEN_PM, reservation_id=10)
+
+    assert inventory.tables_for_party(3, SEVEN_PM) == [4, 1]
+    assert inventory.tables_for_party(2, SEVEN_PM + TURN_TIME) == [3, 2, 4, 1]
+    assert inventory.tables_for_party(9, SEVEN_PM) == []
+
+
+def _book(client, seeded, when):
+    return client.post(
+        "/api/reservations",
+        json={
+            "restaurant_id": seeded["restaurant_id"],
+            "table_id": seeded["table_id"],
+            "reservation_time": when.isoformat(),
+            "party_size": 2,
+        },
+        headers=seeded["headers"],
+    )
+
+
+def test_booking_holds_table_only_for_its_turn(client, seeded, db_session):
+    first = _book(client, seeded, SEVEN_PM)
+    assert first.status_code == 201
+
+    # Same table, overlapping turn -> rejected
+    assert _book(client, seeded, SEVEN_PM + timedelta(minutes=30)).status_code == 409
+
+    # Same table, later turn -> accepted, and the table stays in service
+    assert _book(client, seeded, SEVEN_PM + TURN_TIME).status_code == 201
+    table = db_session.get(TableModel.Table, seeded["table_id"])
+    assert table.is_active is True
+
+    # Cancelling frees the turn again
+    reservation_id = first.json()["reservation_id"]
+    cancel = client.delete(
+        f"/api/reservations/{reservation_id}", headers=seeded["headers"]
+    )
+    assert cancel.status_code == 204
+    assert _book(client, seeded, SEVEN_PM + timedelta(minutes=30)).status_code == 409
+    assert _book(client, seeded, SEVEN_PM - timedelta(minutes=30)).status_code == 201
+
+
+def test_available_tables_endpoint(client, seeded):
+    url = f"/api/restaurants/{seeded['restaurant_id']}/tables/available"
+    params = {"reservation_time": SEVEN_PM.isoformat(), "party_size": 2}
+
+    response = client.get(url, params=params, headers=seeded["headers"])
+    assert [t["table_id"] for t in response.json()] == [seeded["table_id"]]
+
+    _book(client, seeded, SEVEN_PM)
+    response = client.get(url, params=params, headers=seeded["headers"])
+    assert response.json() == []
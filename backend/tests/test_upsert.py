@@ -0,0 +1,25 @@
+import pytest
+from sqlalchemy.dialects import mysql, postgresql
+
+from app.models.ReservationSlotModel import ReservationSlot
+from app.services.upsert import upsert
+
+ROWS = [{"restaurant_id": 1, "slot_time": None, "available_tables": 2}]
+
+
+def test_upsert_compiles_per_dialect():
+    update = upsert(
+        "postgresql", ReservationSlot, ROWS, ("restaurant_id", "slot_time"), ("available_tables",)
+    )
+    sql = str(update.compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (restaurant_id, slot_time) DO UPDATE" in sql
+    assert "available_tables = excluded.available_tables" in sql
+
+    ignore = upsert("mysql", ReservationSlot, ROWS, ("restaurant_id", "slot_time"))
+    sql = str(ignore.compile(dialect=mysql.dialect()))
+    assert "ON DUPLICATE KEY UPDATE restaurant_id = reservation_slots.restaurant_id" in sql
+
+
+def test_upsert_rejects_unknown_dialect():
+    with pytest.raises(NotImplementedError):
+        upsert("oracle", ReservationSlot, ROWS, ("restaurant_id", "slot_time"))
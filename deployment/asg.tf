@@ -22,6 +22,9 @@
  resource "aws_autoscaling_group" "example" {
    vpc_zone_identifier = [aws_subnet.public.id]
    desired_capacity   = 2
+   # Each instance opens up to DB_POOL_SIZE + DB_MAX_OVERFLOW connections;
+   # keep max_size * that under the database's max_connections. Check
+   # GET /api/admin/metrics/db-pool for checkout waits before resizing.
    max_size           = 5
    min_size           = 1
  
@@ -1,30 +1,27 @@
 // src/pages/AdminDashboard.jsx
-import React, { useEffect, useState, useCallback } from "react";
+import React, { useEffect, useMemo } from "react";
 import { useNavigate } from "react-router-dom";
 import Header from "../components/Header";
 import RestaurantList from "../components/RestaurantList";
-import { getAllAdminRestaurants } from "../api/auth";
+import { getAdminRestaurantsPage } from "../api/auth";
+import usePagedList from "../usePagedList";
 
 export default function AdminDashboard() {
   const navigate = useNavigate();
-  const [pending, setPending] = useState([]);
-  const [approved, setApproved] = useState([]);
-  const [error, setError] = useState(null);
-
-  const fetchRestaurants = useCallback(async () => {
-    try {
-      const all = await getAllAdminRestaurants();
-      setPending(all.filter(r => !r.is_approved));
-      setApproved(all.filter(r => r.is_approved));
-    } catch (e) {
-      console.error("Failed to fetch restaurants:", e);
-      setError("Could not load restaurants.");
-    }
-  }, []);
+  const {
+    items: restaurants,
+    loading,
+    error,
+    hasMore,
+    loadMore,
+    reload,
+  } = usePagedList(getAdminRestaurantsPage);
+  const pending = useMemo(() => restaurants.filter(r => !r.is_approved), [restaurants]);
+  const approved = useMemo(() => restaurants.filter(r => r.is_approved), [restaurants]);
 
   useEffect(() => {
-    fetchRestaurants();
-  }, [fetchRestaurants]);
+    if (error) console.error("Failed to fetch restaurants:", error);
+  }, [error]);
 
   if (error) {
     return (
@@ -34,7 +31,7 @@ export default function AdminDashboard() {
           <div className="admin-dashboard-overlay">
             <div className="admin-dashboard-content">
               <h1 className="textCenter">Admin Dashboard</h1>
-              <p className="error">{error}</p>
+              <p className="error">Could not load restaurants.</p>
             </div>
           </div>
         </div>
@@ -55,7 +52,7 @@ export default function AdminDashboard() {
               <RestaurantList
                 restaurants={pending}
                 isNavigationFromAdmin
-                refreshData={fetchRestaurants}
+                refreshData={reload}
               />
             </section>
 
@@ -65,10 +62,20 @@ export default function AdminDashboard() {
                 restaurants={approved}
                 isNavigationFromAdmin
                 isRemoveRestaurant
-                refreshData={fetchRestaurants}
+                refreshData={reload}
               />
             </section>
 
+            {hasMore && (
+              <button
+                className="load-more-button"
+                onClick={loadMore}
+                disabled={loading}
+              >
+                {loading ? "Loading..." : "Load more restaurants"}
+              </button>
+            )}
+
             <div className="textCenter">
               <button
                 className="analytics-button"
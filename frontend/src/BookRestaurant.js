@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from "react";
 import { useNavigate, useParams, useSearchParams } from "react-router-dom";
-import { bookReservation, getAllRestaurantsForCustomers } from "./api/auth";
+import { bookReservation, getRestaurantDetailForManager } from "./api/auth";
 
 /**
  * Ensures time format has seconds
@@ -43,17 +43,14 @@ const BookRestaurant = () => {
     const fetchRestaurant = async () => {
       try {
         setIsLoading(true);
-        const data = await getAllRestaurantsForCustomers();
-        const foundRestaurant = data.find(r => r.restaurant_id === parseInt(id));
-        
-        if (!foundRestaurant) {
-          setError("Restaurant not found");
-        } else {
-          setRestaurant(foundRestaurant);
-        }
+        setRestaurant(await getRestaurantDetailForManager({ id }));
       } catch (error) {
         console.error("Failed to fetch restaurant:", error);
-        setError("Failed to load restaurant data");
+        setError(
+          error.response?.status === 404
+            ? "Restaurant not found"
+            : "Failed to load restaurant data"
+        );
       } finally {
         setIsLoading(false);
       }
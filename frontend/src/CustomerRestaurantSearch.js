@@ -2,7 +2,8 @@
 import React, { useEffect, useState, useMemo, useCallback } from "react";
 import { Link, useNavigate } from "react-router-dom";
 import Header from "../components/Header";
-import { getAllRestaurantsForCustomers } from "../api/auth";
+import { getRestaurantsPageForCustomers } from "../api/auth";
+import usePagedList from "../usePagedList";
 
 const TIME_OPTIONS = Array.from({ length: 48 }, (_, i) => {
   const hour = Math.floor(i / 2);
@@ -21,6 +22,18 @@ function getNearbyTimes(timeStr) {
   });
 }
 
+function matchesSearch(r, { time, location }) {
+  const matchesLocation =
+    !location ||
+    r.city.toLowerCase().includes(location.toLowerCase()) ||
+    r.state.toLowerCase().includes(location.toLowerCase()) ||
+    (r.zip_code && r.zip_code.includes(location));
+  const available =
+    r.availability?.some((slot) => getNearbyTimes(time).includes(slot)) &&
+    r.tables?.some((t) => t.is_active);
+  return matchesLocation && available;
+}
+
 export default function CustomerRestaurantSearch() {
   const navigate = useNavigate();
 
@@ -30,24 +43,30 @@ export default function CustomerRestaurantSearch() {
     people: "",
     location: "",
   });
-  const [restaurants, setRestaurants] = useState([]);
-  const [results, setResults] = useState([]);
-  const [hasSearched, setHasSearched] = useState(false);
-  const [error, setError] = useState(null);
+  // Filters of the last search; pages loaded later are filtered the same way
+  const [searched, setSearched] = useState(null);
+  const hasSearched = searched !== null;
+
+  // One page on mount; "Load more" fetches the next
+  const {
+    items: restaurants,
+    loading,
+    error,
+    hasMore,
+    loadMore,
+  } = usePagedList(getRestaurantsPageForCustomers);
 
-  // Fetch once on mount
   useEffect(() => {
-    (async () => {
-      try {
-        const data = await getAllRestaurantsForCustomers();
-        setRestaurants(data);
-        setResults(data);
-      } catch (e) {
-        console.error(e);
-        setError("Failed to load restaurants.");
-      }
-    })();
-  }, []);
+    if (error) console.error(error);
+  }, [error]);
+
+  const results = useMemo(
+    () =>
+      searched
+        ? restaurants.filter((r) => matchesSearch(r, searched))
+        : restaurants,
+    [restaurants, searched]
+  );
 
   const handleChange = useCallback((e) => {
     const { name, value } = e.target;
@@ -73,21 +92,8 @@ export default function CustomerRestaurantSearch() {
       return;
     }
 
-    const filtered = restaurants.filter((r) => {
-      const matchesLocation =
-        !location ||
-        r.city.toLowerCase().includes(location.toLowerCase()) ||
-        r.state.toLowerCase().includes(location.toLowerCase()) ||
-        (r.zip_code && r.zip_code.includes(location));
-      const available =
-        r.availability?.some((slot) => getNearbyTimes(time).includes(slot)) &&
-        r.tables?.some((t) => t.is_active);
-      return matchesLocation && available;
-    });
-
-    setResults(filtered);
-    setHasSearched(true);
-  }, [filters, restaurants]);
+    setSearched({ time, location });
+  }, [filters]);
 
   const handleBooking = useCallback(
     (r, slot) => {
@@ -105,7 +111,7 @@ export default function CustomerRestaurantSearch() {
       <>
         <Header />
         <div className="customer-bg">
-          <p className="error">{error}</p>
+          <p className="error">Failed to load restaurants.</p>
         </div>
       </>
     );
@@ -130,6 +136,16 @@ export default function CustomerRestaurantSearch() {
             time={filters.time}
             onBook={handleBooking}
           />
+
+          {hasMore && (
+            <button
+              className="load-more-button"
+              onClick={loadMore}
+              disabled={loading}
+            >
+              {loading ? "Loading..." : "Load more restaurants"}
+            </button>
+          )}
         </div>
       </div>
     </>
@@ -1,30 +1,26 @@
-import React, { useEffect, useState } from "react";
+import React, { useCallback, useEffect } from "react";
 import { useSearchParams } from "react-router-dom";
 import Header from "./Header";
-import { getAllReviewsForRestaurant } from "./api/auth";
+import { getReviewsPageForRestaurant } from "./api/auth";
+import usePagedList from "./usePagedList";
 
 const ReadReview = () => {
   const [searchParams] = useSearchParams();
   const restaurantId = searchParams.get("restaurant_id");
-  const [reviews, setReviews] = useState([]);
-  const [loading, setLoading] = useState(true);
 
-  useEffect(() => {
-    const fetchReviews = async () => {
-      try {
-        const res = await getAllReviewsForRestaurant({ restaurantId });
-        setReviews(res);
-      } catch (error) {
-        console.error("Failed to fetch reviews:", error);
-      } finally {
-        setLoading(false);
-      }
-    };
+  const fetchPage = useCallback(
+    (cursor) =>
+      restaurantId
+        ? getReviewsPageForRestaurant({ restaurantId, cursor })
+        : Promise.resolve({ items: [], next_cursor: null }),
+    [restaurantId]
+  );
+  const { items: reviews, loading, error, hasMore, loadMore } =
+    usePagedList(fetchPage);
 
-    if (restaurantId) {
-      fetchReviews();
-    }
-  }, [restaurantId]);
+  useEffect(() => {
+    if (error) console.error("Failed to fetch reviews:", error);
+  }, [error]);
 
   return (
     <>
@@ -32,7 +28,7 @@ const ReadReview = () => {
       <div className="read-reviews-bg">
         <div className="read-reviews-container">
           <h2>📖 Customer Reviews</h2>
-          {loading ? (
+          {loading && reviews.length === 0 ? (
             <p>Loading reviews...</p>
           ) : reviews.length === 0 ? (
             <p>No reviews found for this restaurant.</p>
@@ -51,6 +47,15 @@ const ReadReview = () => {
               </div>
             ))
           )}
+          {hasMore && (
+            <button
+              className="load-more-button"
+              onClick={loadMore}
+              disabled={loading}
+            >
+              {loading ? "Loading..." : "Load more reviews"}
+            </button>
+          )}
         </div>
       </div>
     </>
@@ -1,5 +1,16 @@
 import API from "../api";
 
+export const PAGE_SIZE = 50;
+
+// List endpoints return { items, next_cursor }; pass next_cursor back to get
+// the following page, until it comes back null.
+const getPage = async (url, cursor) => {
+  const response = await API.get(url, {
+    params: cursor ? { cursor, limit: PAGE_SIZE } : { limit: PAGE_SIZE },
+  });
+  return response.data;
+};
+
 export const loginUser = async (formData) => {
   try {
     const response = await API.post("/login", formData);
@@ -20,10 +31,9 @@ export const registerUser = async (data) => {
   }
 };
 
-export const getAllAdminRestaurants = async (data) => {
+export const getAdminRestaurantsPage = async (cursor) => {
   try {
-    const response = await API.get("/admin/restaurants");
-    return response.data;
+    return await getPage("/admin/restaurants", cursor);
   } catch (error) {
     console.error("Registration failed:", error);
     throw error;
@@ -176,20 +186,18 @@ export const addReview = async (data) => {
   }
 };
 
-export const getAllRestaurantsForCustomers = async () => {
+export const getRestaurantsPageForCustomers = async (cursor) => {
   try {
-    const response = await API.get("/customer/restaurants");
-    return response.data;
+    return await getPage("/customer/restaurants", cursor);
   } catch (error) {
     console.error("Booking retrieval for customer failed:", error);
     throw error;
   }
 };
 
-export const getAllReviewsForRestaurant = async (data) => {
+export const getReviewsPageForRestaurant = async (data) => {
   try {
-    const response = await API.get(`/restaurants/${data.restaurantId}/reviews`);
-    return response.data;
+    return await getPage(`/restaurants/${data.restaurantId}/reviews`, data.cursor);
   } catch (error) {
     console.error("Review get restarurant failed:", error);
     throw error;
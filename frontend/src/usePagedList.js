@@ -0,0 +1,43 @@
+import { useCallback, useEffect, useState } from "react";
+
+/**
+ * Holds the pages of a cursor-paginated list loaded so far.
+ * @param {function} fetchPage - (cursor) => Promise<{ items, next_cursor }>;
+ *   keep it stable with useCallback, since a new function starts over
+ * @returns {object} - items, loading, error, hasMore, loadMore() and reload()
+ */
+export default function usePagedList(fetchPage) {
+  const [items, setItems] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loading, setLoading] = useState(true);
+  const [error, setError] = useState(null);
+
+  const load = useCallback(
+    async (cursor) => {
+      setLoading(true);
+      try {
+        const page = await fetchPage(cursor);
+        setItems((prev) => (cursor ? [...prev, ...page.items] : page.items));
+        setNextCursor(page.next_cursor);
+        setError(null);
+      } catch (e) {
+        setError(e);
+      } finally {
+        setLoading(false);
+      }
+    },
+    [fetchPage]
+  );
+
+  useEffect(() => {
+    load(null);
+  }, [load]);
+
+  const loadMore = useCallback(() => {
+    if (nextCursor) load(nextCursor);
+  }, [load, nextCursor]);
+
+  const reload = useCallback(() => load(null), [load]);
+
+  return { items, loading, error, hasMore: Boolean(nextCursor), loadMore, reload };
+}